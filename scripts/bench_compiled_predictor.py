@@ -0,0 +1,88 @@
+import argparse
+import json
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from incident_intelligence.data.loader import load_dataset
+from incident_intelligence.modeling.artifacts import load_artifact
+from incident_intelligence.modeling.compiled import check_parity, compile_pipeline
+
+
+def median_ms(fn, X: pd.DataFrame, repeats: int) -> float:
+    fn(X)  # warm-up
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn(X)
+        times.append(time.perf_counter() - start)
+    return float(np.median(times) * 1000)
+
+
+def main():
+    p = argparse.ArgumentParser(
+        description="predict_proba latency of saved tree pipelines vs their compiled flat-array form."
+    )
+    p.add_argument(
+        "--models",
+        type=str,
+        nargs="+",
+        default=["artifacts/models/Random_Forest_pipeline.joblib", "artifacts/models/Gradient_Boosting_pipeline.joblib"],
+    )
+    p.add_argument("--data", type=str, default="data/processed/incident_root_cause_val.csv")
+    p.add_argument("--label-col", type=str, default="root_cause_label")
+    p.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 32, 4096])
+    p.add_argument("--repeats", type=int, default=50, help="Timed calls per batch size (fewer for large batches)")
+    p.add_argument("--seed", type=int, default=42)
+    p.add_argument("--out", type=str, default="artifacts/bench/compiled_predictor.json")
+    args = p.parse_args()
+
+    df = load_dataset(args.data)
+    X = df.drop(columns=[args.label_col], errors="ignore")
+    rng = np.random.default_rng(args.seed)
+
+    rows = []
+    for model_path in args.models:
+        pipeline = load_artifact(model_path)
+        start = time.perf_counter()
+        compiled = compile_pipeline(pipeline)
+        compile_sec = time.perf_counter() - start
+        parity = check_parity(compiled, pipeline, X)
+        print(
+            f"[OK] {Path(model_path).stem}: {compiled.n_trees} trees, depth<={compiled.max_depth}, "
+            f"compiled in {compile_sec:.2f}s, parity max|diff|={parity['max_abs_diff']:.2g} "
+            f"label mismatches={parity['label_mismatches']}"
+        )
+        if not parity["ok"]:
+            raise SystemExit(f"Parity check failed for {model_path}: {parity}")
+
+        for n in args.batch_sizes:
+            # sample with replacement so batch sizes above the file's row count still work
+            batch = X.iloc[rng.integers(0, len(X), size=n)]
+            repeats = max(3, min(args.repeats, 200_000 // n))
+            sk_ms = median_ms(pipeline.predict_proba, batch, repeats)
+            cp_ms = median_ms(compiled.predict_proba, batch, repeats)
+            rows.append(
+                {
+                    "model": Path(model_path).stem,
+                    "n_trees": compiled.n_trees,
+                    "batch_size": n,
+                    "sklearn_ms": round(sk_ms, 3),
+                    "compiled_ms": round(cp_ms, 3),
+                    "speedup": round(sk_ms / cp_ms, 2),
+                    "parity_max_abs_diff": parity["max_abs_diff"],
+                }
+            )
+            print(f"     batch={n:>5}: sklearn={sk_ms:8.3f}ms  compiled={cp_ms:8.3f}ms  x{sk_ms / cp_ms:.1f}")
+
+    out = Path(args.out)
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_text(json.dumps({"data": args.data, "results": rows}, indent=2))
+    pd.DataFrame(rows).to_csv(out.with_suffix(".csv"), index=False)
+    print(f"Wrote {out} and {out.with_suffix('.csv')}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+import argparse
+import asyncio
+import json
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import httpx
+import numpy as np
+import pandas as pd
+
+from incident_intelligence.data.schema import FEATURE_COLUMNS
+
+
+def start_server(args, port: int, batching: bool) -> subprocess.Popen:
+    cmd = [
+        sys.executable, "-m", "incident_intelligence.cli.serve",
+        "--model", args.model,
+        "--port", str(port),
+        "--log-level", "warning",
+        "--max-batch-size", str(args.max_batch_size),
+        "--max-wait-ms", str(args.max_wait_ms),
+    ]
+    if not batching:
+        cmd.append("--no-batching")
+    proc = subprocess.Popen(cmd)
+    deadline = time.monotonic() + 120
+    while time.monotonic() < deadline:
+        if proc.poll() is not None:
+            raise SystemExit(f"Server exited with code {proc.returncode}")
+        try:
+            if httpx.get(f"http://127.0.0.1:{port}/health", timeout=1).status_code == 200:
+                return proc
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    proc.kill()
+    raise SystemExit("Server did not become healthy within 120s")
+
+
+def encode_request(port: int, body: dict) -> bytes:
+    payload = json.dumps(body).encode()
+    head = (
+        f"POST /predict HTTP/1.1\r\nHost: 127.0.0.1:{port}\r\n"
+        f"Content-Type: application/json\r\nContent-Length: {len(payload)}\r\n\r\n"
+    )
+    return head.encode() + payload
+
+
+async def read_response(reader: asyncio.StreamReader) -> int:
+    head = await reader.readuntil(b"\r\n\r\n")
+    lines = head.decode("latin-1").split("\r\n")
+    length = next(int(line.split(":", 1)[1]) for line in lines if line.lower().startswith("content-length:"))
+    await reader.readexactly(length)
+    return int(lines[0].split()[1])
+
+
+async def run_load(port: int, requests: list, n_requests: int, concurrency: int) -> dict:
+    """
+    Closed-loop load over keep-alive connections with pre-encoded requests.
+    A bare asyncio client (rather than an HTTP library) keeps the client's
+    own CPU cost small, which matters when it shares cores with the server.
+    """
+    latencies = []
+    errors = 0
+    next_i = 0
+
+    async def worker() -> None:
+        nonlocal next_i, errors
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        try:
+            while next_i < n_requests:
+                request = requests[next_i % len(requests)]
+                next_i += 1
+                start = time.perf_counter()
+                writer.write(request)
+                status = await read_response(reader)
+                if status == 200:
+                    latencies.append(time.perf_counter() - start)
+                else:
+                    errors += 1
+        finally:
+            writer.close()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    wall = time.perf_counter() - start
+
+    ms = np.asarray(latencies) * 1000
+    return {
+        "requests": n_requests,
+        "errors": errors,
+        "wall_sec": round(wall, 3),
+        "throughput_rps": round(len(latencies) / wall, 1),
+        "p50_ms": round(float(np.percentile(ms, 50)), 2),
+        "p99_ms": round(float(np.percentile(ms, 99)), 2),
+    }
+
+
+def main():
+    p = argparse.ArgumentParser(
+        description="p50/p99 latency and throughput of concurrent /predict calls with micro-batching on vs off."
+    )
+    p.add_argument("--model", type=str, default="artifacts/models/best_model.joblib")
+    p.add_argument("--data", type=str, default="data/processed/incident_root_cause_val.csv")
+    p.add_argument("--requests", type=int, default=3000)
+    p.add_argument("--concurrency", type=int, default=64, help="In-flight requests (alert-storm burst size)")
+    p.add_argument("--max-batch-size", type=int, default=64)
+    p.add_argument("--max-wait-ms", type=float, default=2.0)
+    p.add_argument("--port", type=int, default=8765)
+    p.add_argument("--out", type=str, default="artifacts/bench/microbatching.json")
+    args = p.parse_args()
+
+    payloads = pd.read_csv(args.data, usecols=FEATURE_COLUMNS).to_dict(orient="records")
+    requests = [encode_request(args.port, body) for body in payloads]
+
+    rows = []
+    for batching in (False, True):
+        proc = start_server(args, args.port, batching)
+        try:
+            asyncio.run(run_load(args.port, requests, min(200, args.requests), args.concurrency))  # warm-up
+            result = {"batching": batching, **asyncio.run(run_load(args.port, requests, args.requests, args.concurrency))}
+            if batching:
+                metrics = httpx.get(f"http://127.0.0.1:{args.port}/metrics").text
+                values = dict(line.rsplit(" ", 1) for line in metrics.splitlines() if line.startswith("incident_batch_size_"))
+                result["mean_batch_size"] = round(float(values["incident_batch_size_sum"]) / float(values["incident_batch_size_count"]), 1)
+        finally:
+            proc.terminate()
+            proc.wait(timeout=30)
+        rows.append(result)
+        print(
+            f"[OK] batching={'on ' if batching else 'off'}: {result['throughput_rps']:.0f} req/s  "
+            f"p50={result['p50_ms']:.1f}ms  p99={result['p99_ms']:.1f}ms  errors={result['errors']}"
+            + (f"  mean batch={result['mean_batch_size']}" if batching else "")
+        )
+
+    out = Path(args.out)
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_text(json.dumps({"model": args.model, "concurrency": args.concurrency, "results": rows}, indent=2))
+    print(f"Wrote {out}")
+
+
+if __name__ == "__main__":
+    main()
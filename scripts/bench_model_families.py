@@ -0,0 +1,101 @@
+import argparse
+import json
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from incident_intelligence.data.generator import DEFAULT_ROOT_CAUSE_PROBS, generate_dataset
+from incident_intelligence.data.mixtures import load_compiled_class_config
+from incident_intelligence.modeling.baseline import FAMILIES, get_models_to_run, make_pipeline, resolve_families
+
+# Families whose fit is superlinear in rows (exact GB splits, O(n^2) SVC with
+# Platt-scaling CV); skipped above --max-slow-rows so a 1M-row run finishes.
+SLOW_FAMILIES = ("gb", "svm")
+
+
+def single_row_latency_ms(pipe, X: pd.DataFrame, n_calls: int) -> float:
+    """Median wall time of predict_proba on one row (the online-inference case)."""
+    times = []
+    for i in range(n_calls):
+        row = X.iloc[[i % len(X)]]
+        start = time.perf_counter()
+        pipe.predict_proba(row)
+        times.append(time.perf_counter() - start)
+    return float(np.median(times) * 1000)
+
+
+def bench_family(key: str, X_train, y_train, X_val, y_val, args) -> dict:
+    from sklearn.metrics import f1_score
+
+    info = get_models_to_run(args.seed, [key])[0]
+    pipe = make_pipeline(info["estimator"])
+
+    start = time.perf_counter()
+    pipe.fit(X_train, y_train)
+    fit_sec = time.perf_counter() - start
+
+    start = time.perf_counter()
+    proba = pipe.predict_proba(X_val)
+    batch_sec = time.perf_counter() - start
+    y_pred = pipe.classes_[proba.argmax(axis=1)]
+
+    return {
+        "family": key,
+        "model_name": info["name"],
+        "fit_sec": round(fit_sec, 3),
+        "predict_us_per_row": round(batch_sec / len(X_val) * 1e6, 3),
+        "predict_single_ms": round(single_row_latency_ms(pipe, X_val, args.single_calls), 3),
+        "val_f1_macro": round(float(f1_score(y_val, y_pred, average="macro")), 4),
+    }
+
+
+def main():
+    p = argparse.ArgumentParser(
+        description="Fit time, predict latency and val F1 per model family at several training-set sizes."
+    )
+    p.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    p.add_argument("--families", type=str, nargs="+", default=["all"], help=f"Keys from {FAMILIES} or a preset")
+    p.add_argument("--val-rows", type=int, default=20_000)
+    p.add_argument("--max-slow-rows", type=int, default=100_000, help=f"Skip {SLOW_FAMILIES} above this many rows")
+    p.add_argument("--single-calls", type=int, default=200, help="Single-row predict_proba calls to time")
+    p.add_argument("--seed", type=int, default=42)
+    p.add_argument("--out", type=str, default="artifacts/bench/model_families.json")
+    args = p.parse_args()
+
+    families = resolve_families(args.families)
+    class_config = load_compiled_class_config()
+    label_col = "root_cause_label"
+
+    # One validation set for every size, generated with a different seed than the training rows.
+    val_df = generate_dataset(args.val_rows, DEFAULT_ROOT_CAUSE_PROBS, class_config, seed=args.seed + 1)
+    X_val, y_val = val_df.drop(columns=[label_col]), val_df[label_col]
+
+    rows = []
+    for n in args.sizes:
+        train_df = generate_dataset(n, DEFAULT_ROOT_CAUSE_PROBS, class_config, seed=args.seed)
+        X_train, y_train = train_df.drop(columns=[label_col]), train_df[label_col]
+
+        for key in families:
+            if key in SLOW_FAMILIES and n > args.max_slow_rows:
+                rows.append({"n_rows": n, "family": key, "skipped": f"n_rows > --max-slow-rows ({args.max_slow_rows})"})
+                print(f"[SKIP] n={n} {key}")
+                continue
+            result = {"n_rows": n, **bench_family(key, X_train, y_train, X_val, y_val, args)}
+            rows.append(result)
+            print(
+                f"[OK] n={n} {key}: fit={result['fit_sec']:.2f}s  "
+                f"predict={result['predict_us_per_row']:.2f}us/row  single={result['predict_single_ms']:.2f}ms  "
+                f"val_f1_macro={result['val_f1_macro']:.4f}"
+            )
+
+    out = Path(args.out)
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_text(json.dumps({"val_rows": args.val_rows, "results": rows}, indent=2))
+    pd.DataFrame(rows).to_csv(out.with_suffix(".csv"), index=False)
+    print(f"Wrote {out} and {out.with_suffix('.csv')}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+import argparse
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+DEFAULT_BUDGET = Path(__file__).resolve().parents[1] / "config" / "import_time_budget.json"
+
+# Prints the top-level packages loaded by the import, so forbidden heavy
+# dependencies are caught even when the timing budget is not exceeded.
+PROBE = "import {module}; import sys; print(','.join(sorted({{m.split('.')[0] for m in sys.modules}})))"
+
+
+def measure(module: str) -> tuple[float, set[str]]:
+    """Cumulative import time (ms) of `module` from `python -X importtime`, plus loaded packages."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", PROBE.format(module=module)],
+        capture_output=True,
+        text=True,
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"Import failed for {module}:\n{proc.stderr[-2000:]}")
+
+    cumulative_us = None
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        _, cumulative, name = (part.strip() for part in line[len("import time:"):].split("|"))
+        if name == module:
+            cumulative_us = int(cumulative)
+    if cumulative_us is None:
+        raise RuntimeError(f"No importtime line for {module}")
+
+    loaded = set(proc.stdout.strip().split(","))
+    return cumulative_us / 1000.0, loaded
+
+
+def main():
+    p = argparse.ArgumentParser(description="Fail when CLI/modeling import time regresses past the stored budget.")
+    p.add_argument("--budget", type=str, default=str(DEFAULT_BUDGET))
+    p.add_argument("--runs", type=int, default=None, help="Runs per module (best is kept)")
+    p.add_argument(
+        "--update",
+        action="store_true",
+        help="Rewrite max_ms as measured * --headroom instead of checking",
+    )
+    p.add_argument("--headroom", type=float, default=3.0)
+    args = p.parse_args()
+
+    budget_path = Path(args.budget)
+    budget = json.loads(budget_path.read_text())
+    runs = args.runs or budget.get("runs", 5)
+
+    failures = []
+    print(f"{'module':45s} {'best_ms':>9s} {'max_ms':>8s}  status")
+    for module, spec in budget["modules"].items():
+        samples = [measure(module) for _ in range(runs)]
+        best_ms = min(ms for ms, _ in samples)
+        loaded = set().union(*(pkgs for _, pkgs in samples))
+        forbidden = sorted(loaded & set(spec.get("forbid", [])))
+
+        if args.update:
+            spec["max_ms"] = max(int(round(best_ms * args.headroom, -1)), 10)
+
+        status = "ok"
+        if forbidden:
+            status = f"FAIL imports {forbidden}"
+        elif best_ms > spec["max_ms"]:
+            status = "FAIL over budget"
+        if status != "ok":
+            failures.append(module)
+        print(f"{module:45s} {best_ms:9.1f} {spec['max_ms']:8d}  {status}")
+
+    if args.update:
+        budget_path.write_text(json.dumps(budget, indent=2) + "\n")
+        print(f"Updated budget: {budget_path}")
+        return
+
+    if failures:
+        print(f"\nImport-time budget exceeded for {len(failures)} module(s).")
+        sys.exit(1)
+    print("\nAll modules within import-time budget.")
+
+
+if __name__ == "__main__":
+    main()
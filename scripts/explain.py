@@ -1,6 +1,6 @@
 import argparse
-import pandas as pd
 
+from incident_intelligence.data.loader import load_df
 from incident_intelligence.modeling.explain import ExplainConfig, explain_models, find_models
 
 
@@ -15,7 +15,7 @@ def main():
     p.add_argument("--explain-n", type=int, default=200)
     args = p.parse_args()
 
-    df = pd.read_csv(args.data) if args.data.endswith(".csv") else pd.read_parquet(args.data)
+    df = load_df(args.data, label_col=args.label_col)
 
     cfg = ExplainConfig(
         label_col=args.label_col,
@@ -1,10 +1,12 @@
 import argparse
-from pathlib import Path
 
-from sklearn.model_selection import train_test_split
-
-from incident_intelligence.settings import SETTINGS, load_class_config
-from incident_intelligence.data.generator import validate_configs, generate_dataset
+from incident_intelligence.settings import get_settings
+from incident_intelligence.data.generator import (
+    ENGINES,
+    generate_dataset,
+    stratified_splits,
+)
+from incident_intelligence.data.mixtures import load_compiled_class_config
 
 ROOT_CAUSE_PROBS = {
     "bad_deployment": 0.2,
@@ -16,51 +18,12 @@ ROOT_CAUSE_PROBS = {
 }
 
 
-def stratified_splits(df, label_col: str, seed: int, train_size: float, val_size: float):
-    """
-    Splits df into train/val/eval with stratification on label_col.
-
-    train_size: fraction of total in train
-    val_size: fraction of total in val
-    eval_size is computed as (1 - train_size - val_size)
-    """
-    if train_size <= 0 or train_size >= 1:
-        raise ValueError("train_size must be between 0 and 1")
-
-    if val_size <= 0 or val_size >= 1:
-        raise ValueError("val_size must be between 0 and 1")
-
-    eval_size = 1.0 - train_size - val_size
-    if eval_size <= 0:
-        raise ValueError("train_size + val_size must be < 1.0")
-
-    train_df, temp_df = train_test_split(
-        df,
-        test_size=(1.0 - train_size),
-        stratify=df[label_col],
-        random_state=seed,
-    )
-
-    # Split the remaining temp into val and eval:
-    # val fraction within temp = val_size / (val_size + eval_size)
-    val_share_of_temp = val_size / (val_size + eval_size)
-
-    val_df, eval_df = train_test_split(
-        temp_df,
-        test_size=(1.0 - val_share_of_temp),
-        stratify=temp_df[label_col],
-        random_state=seed,
-    )
-
-    return train_df, val_df, eval_df
-
-
 def main():
     p = argparse.ArgumentParser()
     p.add_argument("--n-samples", type=int, default=4000)
     p.add_argument("--seed", type=int, default=42)
 
-    # Where to write files (relative to SETTINGS.data_dir)
+    # Where to write files (relative to the settings data_dir)
     p.add_argument("--raw-out", type=str, default="raw/incidents_raw.csv")
     p.add_argument("--processed-dir", type=str, default="processed")
 
@@ -69,16 +32,18 @@ def main():
     p.add_argument("--val-size", type=float, default=0.15)
 
     p.add_argument("--label-col", type=str, default="root_cause_label")
+    p.add_argument("--engine", type=str, choices=ENGINES, default="vectorized")
+    p.add_argument("--workers", type=int, default=1)
     args = p.parse_args()
 
-    class_config = load_class_config()
-    validate_configs(class_config)
+    class_config = load_compiled_class_config()
 
     # 1) Generate full unsplit dataset
-    df = generate_dataset(args.n_samples, ROOT_CAUSE_PROBS, class_config, seed=args.seed)
+    df = generate_dataset(args.n_samples, ROOT_CAUSE_PROBS, class_config, seed=args.seed, engine=args.engine, workers=args.workers)
 
     # 2) Save raw
-    raw_path = SETTINGS.data_dir / args.raw_out
+    settings = get_settings()
+    raw_path = settings.data_dir / args.raw_out
     raw_path.parent.mkdir(parents=True, exist_ok=True)
     df.to_csv(raw_path, index=False)
 
@@ -92,7 +57,7 @@ def main():
     )
 
     # 4) Save processed splits
-    processed_dir = SETTINGS.data_dir / args.processed_dir
+    processed_dir = settings.data_dir / args.processed_dir
     processed_dir.mkdir(parents=True, exist_ok=True)
 
     train_path = processed_dir / "incident_root_cause_train.csv"
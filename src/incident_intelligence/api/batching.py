@@ -0,0 +1,159 @@
+from __future__ import annotations
+
+import asyncio
+import bisect
+import threading
+import time
+from concurrent.futures import Executor
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+
+# Request coalescing for the inference service: concurrent single-incident
+# requests are queued and scored together in one predict_proba call, so the
+# per-call Python / sklearn overhead is paid once per batch instead of once
+# per request.
+
+BATCH_SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256, 512)
+QUEUE_WAIT_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.002, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0)
+
+
+class Histogram:
+    """Cumulative-bucket histogram rendered in the Prometheus text format."""
+
+    def __init__(self, name: str, help_text: str, buckets: Sequence[float]):
+        self.name = name
+        self.help_text = help_text
+        self.buckets = tuple(buckets)
+        self._counts = [0] * (len(self.buckets) + 1)  # last slot: +Inf
+        self._sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        with self._lock:
+            self._counts[bisect.bisect_left(self.buckets, value)] += 1
+            self._sum += value
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            counts, total = list(self._counts), self._sum
+        cumulative, running = {}, 0
+        for bound, n in zip([*self.buckets, float("inf")], counts):
+            running += n
+            cumulative[bound] = running
+        return {"buckets": cumulative, "count": running, "sum": total}
+
+    def render(self) -> str:
+        snap = self.snapshot()
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        for bound, n in snap["buckets"].items():
+            le = "+Inf" if bound == float("inf") else f"{bound:g}"
+            lines.append(f'{self.name}_bucket{{le="{le}"}} {n}')
+        lines.append(f"{self.name}_sum {snap['sum']:.6f}")
+        lines.append(f"{self.name}_count {snap['count']}")
+        return "\n".join(lines)
+
+
+class MicroBatcher:
+    """
+    Coalesces submit() calls into batches for score_fn (run on executor).
+    A batch is flushed when it reaches max_batch_size or max_wait_ms after its
+    first item arrived. Requests that queue up while a batch is being scored
+    form the next batch, so batch size follows the load: ~1 when idle, up to
+    max_batch_size under a burst. The wait itself is adaptive: after a batch of
+    one (no concurrency) the next batch is flushed as soon as the queue is
+    empty, so an idle service does not add max_wait_ms to every request.
+    """
+
+    def __init__(
+        self,
+        score_fn: Callable[[List[Any]], List[Any]],
+        executor: Optional[Executor] = None,
+        *,
+        max_batch_size: int = 64,
+        max_wait_ms: float = 2.0,
+    ):
+        if max_batch_size < 1:
+            raise ValueError(f"max_batch_size must be >= 1, got {max_batch_size}")
+        self.score_fn = score_fn
+        self.executor = executor
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self.batch_size = Histogram(
+            "incident_batch_size", "Incidents per coalesced predict_proba call", BATCH_SIZE_BUCKETS
+        )
+        self.queue_wait = Histogram(
+            "incident_queue_wait_seconds", "Time a request waited in the batching queue", QUEUE_WAIT_BUCKETS
+        )
+        self._queue: Optional[asyncio.Queue[Tuple[Any, asyncio.Future, float]]] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._last_batch_size = 0
+
+    async def start(self) -> None:
+        self._queue = asyncio.Queue()
+        self._worker = asyncio.create_task(self._run(), name="micro-batcher")
+
+    async def stop(self) -> None:
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+        while self._queue is not None and not self._queue.empty():
+            _, fut, _ = self._queue.get_nowait()
+            if not fut.done():
+                fut.set_exception(RuntimeError("Batcher stopped"))
+
+    async def submit(self, item: Any) -> Any:
+        if self._queue is None or self._worker is None:
+            raise RuntimeError("MicroBatcher.start() has not been awaited")
+        fut = asyncio.get_running_loop().create_future()
+        await self._queue.put((item, fut, time.perf_counter()))
+        return await fut
+
+    async def _collect(self) -> List[Tuple[Any, asyncio.Future, float]]:
+        assert self._queue is not None
+        batch = [await self._queue.get()]
+        deadline = batch[0][2] + (self.max_wait if self._last_batch_size > 1 else 0.0)
+        while len(batch) < self.max_batch_size:
+            if not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+                continue
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), timeout=remaining))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = await self._collect()
+            # Callers that gave up (client disconnect) are not scored.
+            batch = [entry for entry in batch if not entry[1].cancelled()]
+            if not batch:
+                continue
+            now = time.perf_counter()
+            for _, _, enqueued in batch:
+                self.queue_wait.observe(now - enqueued)
+            self.batch_size.observe(len(batch))
+            self._last_batch_size = len(batch)
+
+            items = [item for item, _, _ in batch]
+            try:
+                results = await loop.run_in_executor(self.executor, self.score_fn, items)
+            except Exception as e:
+                for _, fut, _ in batch:
+                    if not fut.done():
+                        fut.set_exception(e)
+                continue
+            for (_, fut, _), result in zip(batch, results):
+                if not fut.done():
+                    fut.set_result(result)
+
+    def render_metrics(self) -> str:
+        return self.batch_size.render() + "\n" + self.queue_wait.render() + "\n"
@@ -0,0 +1,248 @@
+from __future__ import annotations
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.responses import PlainTextResponse
+from pydantic import BaseModel, ConfigDict, Field, NonNegativeInt, create_model
+
+from incident_intelligence.api.batching import MicroBatcher
+from incident_intelligence.api.model_manager import ModelManager
+from incident_intelligence.data.schema import FEATURE_COLUMNS, FEATURE_SCHEMA
+from incident_intelligence.modeling.artifacts import artifact_version, load_artifact, read_manifest
+from incident_intelligence.modeling.predictions import predict_once
+
+
+# Long-running inference service: the model artifact is loaded once at
+# startup and scoring (pandas + predict_proba, CPU-bound) runs on a small
+# thread pool so the event loop keeps accepting requests. Concurrent /predict
+# calls are coalesced into one predict_proba call by a MicroBatcher, and a
+# ModelManager hot-swaps the model when the artifact file is replaced.
+
+
+@dataclass(frozen=True)
+class ServeConfig:
+    model_path: str = "artifacts/models/best_model.joblib"
+    scoring_threads: int = 1
+    max_batch_rows: int = 10_000
+    batching: bool = True
+    max_batch_size: int = 64  # /predict requests per coalesced predict_proba call
+    max_wait_ms: float = 2.0  # how long the first request of a batch waits for company
+    reload_interval_s: float = 2.0  # how often model_path is checked for a new artifact; 0 = never
+    # Incidents every new model must score before it is swapped in (CSV/Parquet).
+    # None = canary_rows synthetic incidents from the generator.
+    canary_path: Optional[str] = None
+    canary_rows: int = 256
+
+
+# Request body of one incident, generated from FEATURE_SCHEMA so it cannot
+# drift from the training columns: counts are non-negative ints, metrics are
+# finite floats, and unknown fields are rejected.
+Incident = create_model(
+    "Incident",
+    __config__=ConfigDict(extra="forbid", allow_inf_nan=False),
+    **{name: (NonNegativeInt if kind == "count" else float, ...) for name, kind in FEATURE_SCHEMA.items()},
+)
+
+
+class BatchRequest(BaseModel):
+    incidents: List[Incident] = Field(min_length=1)  # type: ignore[valid-type]
+
+
+class Prediction(BaseModel):
+    label: str
+    probabilities: Optional[Dict[str, float]] = None
+    model_version: str
+
+
+class BatchResponse(BaseModel):
+    n: int
+    model_version: str
+    predictions: List[Prediction]
+
+
+@dataclass(frozen=True)
+class LoadedModel:
+    model: Any  # sklearn Pipeline or modeling.compiled.CompiledForest
+    path: Path
+    version: str  # manifest hash prefix (see artifact_version)
+    classes: List[str]
+    features: List[str]  # feature_names_in_: request frames are built in this (fit) order
+    manifest: Optional[Dict[str, Any]]
+
+
+def load_serving_model(path: str | Path) -> LoadedModel:
+    """
+    Loads the artifact (memory-mapped) and checks it was trained on exactly
+    the nine schema features; a mismatch fails startup instead of every request.
+    The model may have been fit with the columns in any order: requests are
+    scored in its feature_names_in_ order.
+    """
+    path = Path(path)
+    version = artifact_version(path)
+    model = load_artifact(path)
+    manifest = read_manifest(path)
+
+    names = getattr(model, "feature_names_in_", None)
+    if names is None:
+        raise ValueError(f"{path}: model has no feature_names_in_; it must be fit on a DataFrame")
+    if sorted(map(str, names)) != sorted(FEATURE_COLUMNS):
+        raise ValueError(f"{path}: model features {list(names)} != schema features {FEATURE_COLUMNS}")
+    if manifest and manifest.get("feature_schema") not in (None, FEATURE_SCHEMA):
+        raise ValueError(f"{path}: saved with feature schema {manifest['feature_schema']}, expected {FEATURE_SCHEMA}")
+    if not hasattr(model, "classes_"):
+        raise ValueError(f"{path}: {type(model).__name__} has no classes_")
+
+    return LoadedModel(
+        model=model,
+        path=path,
+        version=version,
+        classes=[str(c) for c in model.classes_],
+        features=[str(name) for name in names],
+        manifest=manifest,
+    )
+
+
+def load_canary(cfg: ServeConfig) -> pd.DataFrame:
+    if cfg.canary_path:
+        from incident_intelligence.data.loader import load_dataset
+
+        return load_dataset(cfg.canary_path)[FEATURE_COLUMNS].head(cfg.canary_rows).reset_index(drop=True)
+
+    from incident_intelligence.data.generator import DEFAULT_ROOT_CAUSE_PROBS, generate_dataset
+    from incident_intelligence.data.mixtures import load_compiled_class_config
+
+    df = generate_dataset(cfg.canary_rows, DEFAULT_ROOT_CAUSE_PROBS, load_compiled_class_config(), seed=0)
+    return df[FEATURE_COLUMNS]
+
+
+def check_canary(candidate: LoadedModel, current: Optional[LoadedModel], X: pd.DataFrame) -> None:
+    """
+    Raises ValueError unless the candidate scores every canary row with finite
+    probabilities that sum to 1 (when it has predict_proba) and keeps the
+    serving label set.
+    """
+    preds = predict_once(candidate.model, X[candidate.features])
+    if len(preds) != len(X):
+        raise ValueError(f"{candidate.path}: {len(preds)} predictions for {len(X)} canary rows")
+    if hasattr(candidate.model, "predict_proba") and preds.proba_error is not None:
+        raise ValueError(f"{candidate.path}: predict_proba failed on the canary batch: {preds.proba_error}")
+    if preds.proba is not None:
+        proba = np.asarray(preds.proba, dtype=np.float64)
+        if not np.isfinite(proba).all() or np.abs(proba.sum(axis=1) - 1.0).max() > 1e-3:
+            raise ValueError(f"{candidate.path}: canary probabilities are not finite / do not sum to 1")
+    if current is not None and candidate.classes != current.classes:
+        raise ValueError(f"{candidate.path}: classes {candidate.classes} != serving classes {current.classes}")
+
+
+def incidents_frame(incidents: Sequence[BaseModel], columns: Sequence[str] = FEATURE_COLUMNS) -> pd.DataFrame:
+    rows = [[getattr(inc, name) for name in columns] for inc in incidents]
+    return pd.DataFrame(np.asarray(rows, dtype=np.float64), columns=list(columns))
+
+
+def score(loaded: LoadedModel, X: pd.DataFrame) -> List[Prediction]:
+    """Label + per-class probabilities per row (one predict_proba pass, see predict_once)."""
+    preds = predict_once(loaded.model, X)
+    labels = [loaded.classes[c] for c in preds.codes]
+    if preds.proba is None:
+        return [Prediction(label=label, model_version=loaded.version) for label in labels]
+    proba = np.round(preds.proba.astype(np.float64), 6).tolist()
+    return [
+        Prediction(label=label, probabilities=dict(zip(loaded.classes, row)), model_version=loaded.version)
+        for label, row in zip(labels, proba)
+    ]
+
+
+def score_incidents(loaded: LoadedModel, incidents: Sequence[BaseModel]) -> List[Prediction]:
+    return score(loaded, incidents_frame(incidents, loaded.features))
+
+
+def create_app(cfg: ServeConfig = ServeConfig()) -> FastAPI:
+    @asynccontextmanager
+    async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+        canary = load_canary(cfg)
+        manager = ModelManager(
+            cfg.model_path,
+            load_serving_model,
+            lambda candidate, current: check_canary(candidate, current, canary),
+            poll_interval_s=cfg.reload_interval_s,
+        )
+        manager.load_initial()
+        app.state.manager = manager
+        app.state.executor = ThreadPoolExecutor(max_workers=cfg.scoring_threads, thread_name_prefix="score")
+        app.state.batcher = None
+        if cfg.batching:
+            app.state.batcher = MicroBatcher(
+                lambda incidents: score_incidents(manager.current, incidents),
+                app.state.executor,
+                max_batch_size=cfg.max_batch_size,
+                max_wait_ms=cfg.max_wait_ms,
+            )
+            await app.state.batcher.start()
+        await manager.start()
+        print(f"[OK] serving {manager.path} ({type(manager.current.model).__name__}, version {manager.current.version})")
+        try:
+            yield
+        finally:
+            await manager.stop()
+            if app.state.batcher is not None:
+                await app.state.batcher.stop()
+            app.state.executor.shutdown(wait=True)
+
+    app = FastAPI(title="Incident root-cause inference", lifespan=lifespan)
+
+    async def run_scoring(request: Request, incidents: Sequence[BaseModel]) -> List[Prediction]:
+        state = request.app.state
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(state.executor, lambda: score_incidents(state.manager.current, incidents))
+
+    @app.get("/health")
+    async def health(request: Request) -> Dict[str, Any]:
+        manager: ModelManager = request.app.state.manager
+        loaded: LoadedModel = manager.current
+        return {
+            "status": "ok",
+            **manager.status(),
+            "model_class": type(loaded.model).__name__,
+            "classes": loaded.classes,
+            "features": FEATURE_COLUMNS,
+        }
+
+    @app.post("/reload")
+    async def reload(request: Request) -> Dict[str, Any]:
+        """Checks model_path now instead of waiting for the next poll."""
+        manager: ModelManager = request.app.state.manager
+        swapped = await manager.check()
+        return {"swapped": swapped, **manager.status()}
+
+    @app.get("/metrics", response_class=PlainTextResponse)
+    async def metrics(request: Request) -> str:
+        """Batch size and queue wait histograms (Prometheus text format); empty without batching."""
+        batcher = request.app.state.batcher
+        return batcher.render_metrics() if batcher is not None else ""
+
+    @app.post("/predict", response_model=Prediction)
+    async def predict(incident: Incident, request: Request) -> Prediction:  # type: ignore[valid-type]
+        batcher = request.app.state.batcher
+        if batcher is not None:
+            return await batcher.submit(incident)
+        return (await run_scoring(request, [incident]))[0]
+
+    @app.post("/predict/batch", response_model=BatchResponse)
+    async def predict_batch(body: BatchRequest, request: Request) -> BatchResponse:
+        if len(body.incidents) > cfg.max_batch_rows:
+            raise HTTPException(
+                status_code=413,
+                detail=f"Batch of {len(body.incidents)} incidents exceeds max_batch_rows={cfg.max_batch_rows}",
+            )
+        predictions = await run_scoring(request, body.incidents)
+        return BatchResponse(n=len(predictions), model_version=predictions[0].model_version, predictions=predictions)
+
+    return app
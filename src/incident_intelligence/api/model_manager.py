@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple
+
+
+# Zero-downtime model updates for the inference service. The artifact path
+# (e.g. best_model.joblib, which incident-train replaces atomically) is polled;
+# a changed file is loaded, warmed and validated in the background and only
+# then becomes `current`. Swapping is a single reference assignment: requests
+# that already picked up the old model finish on it.
+
+
+def _stamp(path: Path) -> Optional[Tuple[int, int, int]]:
+    try:
+        st = path.stat()
+    except FileNotFoundError:
+        return None
+    return st.st_size, st.st_mtime_ns, st.st_ino
+
+
+class ModelManager:
+    """
+    Holds the active model and hot-swaps it when the file at path changes.
+      load_fn(path)              -> a loaded model (raises if it is unusable)
+      canary_fn(candidate, current) runs the candidate on a canary batch and
+                                 raises if its output is not acceptable
+    A candidate that fails either step is rejected and the current model
+    keeps serving; the same file is not retried until it changes again.
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        load_fn: Callable[[Path], Any],
+        canary_fn: Callable[[Any, Optional[Any]], None],
+        *,
+        poll_interval_s: float = 2.0,
+    ):
+        self.path = Path(path)
+        self.load_fn = load_fn
+        self.canary_fn = canary_fn
+        self.poll_interval_s = poll_interval_s
+        self._current: Any = None
+        self._stamp: Optional[Tuple[int, int, int]] = None
+        self._rejected_stamp: Optional[Tuple[int, int, int]] = None
+        self._lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+        self.n_swaps = 0
+        self.loaded_at: Optional[str] = None
+        self.last_error: Optional[str] = None
+
+    @property
+    def current(self) -> Any:
+        if self._current is None:
+            raise RuntimeError("ModelManager has no model; call load_initial() first")
+        return self._current
+
+    def _load_candidate(self) -> Tuple[Any, Optional[Tuple[int, int, int]]]:
+        stamp = _stamp(self.path)
+        candidate = self.load_fn(self.path)
+        # Also warms the model: the first predict_proba pays one-off costs.
+        self.canary_fn(candidate, self._current)
+        return candidate, stamp
+
+    def load_initial(self) -> Any:
+        """Loads and validates the model at startup; failures propagate (the service must not start)."""
+        self._current, self._stamp = self._load_candidate()
+        self.loaded_at = time.strftime("%Y-%m-%dT%H:%M:%S%z")
+        return self._current
+
+    async def check(self) -> bool:
+        """Swaps in the file at path if it changed and passes validation; True if swapped."""
+        async with self._lock:
+            stamp = _stamp(self.path)
+            if stamp is None or stamp == self._stamp or stamp == self._rejected_stamp:
+                return False
+            loop = asyncio.get_running_loop()
+            try:
+                # default executor, so loading never occupies the scoring threads
+                candidate, loaded_stamp = await loop.run_in_executor(None, self._load_candidate)
+            except Exception as e:
+                self._rejected_stamp = stamp
+                self.last_error = f"{type(e).__name__}: {e}"
+                print(f"[WARN] rejected new model at {self.path}: {self.last_error}")
+                return False
+
+            self._current, self._stamp = candidate, loaded_stamp
+            self._rejected_stamp = None
+            self.last_error = None
+            self.n_swaps += 1
+            self.loaded_at = time.strftime("%Y-%m-%dT%H:%M:%S%z")
+            print(f"[OK] swapped in {self.path} (version {getattr(candidate, 'version', '?')})")
+            return True
+
+    async def _watch(self) -> None:
+        while True:
+            await asyncio.sleep(self.poll_interval_s)
+            try:
+                await self.check()
+            except Exception as e:  # keep watching whatever happens
+                self.last_error = f"{type(e).__name__}: {e}"
+
+    async def start(self) -> None:
+        if self.poll_interval_s > 0:
+            self._task = asyncio.create_task(self._watch(), name="model-watcher")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "model_path": str(self.path),
+            "model_version": getattr(self._current, "version", None),
+            "loaded_at": self.loaded_at,
+            "n_swaps": self.n_swaps,
+            "poll_interval_s": self.poll_interval_s,
+            "last_error": self.last_error,
+        }
@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+import argparse
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description="Compact a saved forest pipeline (pruning, shared subtrees, float32 thresholds, quantized leaves)."
+    )
+    parser.add_argument(
+        "--model",
+        type=str,
+        default="artifacts/models/Random_Forest_pipeline.joblib",
+        help="Saved RandomForest / ExtraTrees pipeline .joblib",
+    )
+    parser.add_argument(
+        "--val",
+        type=str,
+        default="data/processed/incident_root_cause_val.csv",
+        help="Labeled CSV/Parquet used for the accuracy / F1 check",
+    )
+    parser.add_argument(
+        "--label-col",
+        type=str,
+        default="root_cause_label",
+        help="Target label column name",
+    )
+    parser.add_argument(
+        "--out",
+        type=str,
+        default=None,
+        help="Compacted artifact path (default: artifacts/compiled/<model stem>.compact.joblib)",
+    )
+    parser.add_argument(
+        "--report-out",
+        type=str,
+        default="artifacts/metrics/compaction.json",
+        help="Where to write the size / latency / accuracy report",
+    )
+    parser.add_argument(
+        "--min-leaf-samples",
+        type=int,
+        default=5,
+        help="Prune splits whose smaller child saw fewer training samples (1 = no pruning)",
+    )
+    parser.add_argument(
+        "--leaf-bits",
+        type=int,
+        choices=[0, 8, 16],
+        default=8,
+        help="Quantize leaf class distributions to this many bits (0 = keep float64)",
+    )
+    parser.add_argument(
+        "--float64-thresholds",
+        action="store_true",
+        help="Keep float64 split thresholds",
+    )
+    parser.add_argument(
+        "--no-merge",
+        action="store_true",
+        help="Do not share identical subtrees",
+    )
+    parser.add_argument(
+        "--max-accuracy-drop",
+        type=float,
+        default=0.005,
+        help="Refuse to compact if val accuracy drops by more than this",
+    )
+    parser.add_argument(
+        "--max-f1-drop",
+        type=float,
+        default=0.01,
+        help="Refuse to compact if val macro-F1 drops by more than this",
+    )
+    return parser
+
+
+def main() -> None:
+    parser = build_parser()
+    args = parser.parse_args()
+
+    # Imported after argument parsing so --help and usage errors stay fast.
+    from incident_intelligence.data.loader import load_dataset
+    from incident_intelligence.modeling.compaction import CompactionConfig, compact_artifact
+
+    cfg = CompactionConfig(
+        min_leaf_samples=args.min_leaf_samples,
+        leaf_bits=args.leaf_bits,
+        float32_thresholds=not args.float64_thresholds,
+        merge_subtrees=not args.no_merge,
+        max_accuracy_drop=args.max_accuracy_drop,
+        max_f1_drop=args.max_f1_drop,
+    )
+
+    df = load_dataset(args.val, label_col=args.label_col)
+    X_val, y_val = df.drop(columns=[args.label_col]), df[args.label_col]
+    report = compact_artifact(args.model, X_val, y_val, cfg, out_path=args.out, report_out=args.report_out)
+
+    val = report["val"]
+    print(
+        f"Nodes: {report['nodes']['before']} -> {report['nodes']['after']}  "
+        f"val accuracy {val['before']['accuracy']:.4f} -> {val['after']['accuracy']:.4f}  "
+        f"macro-F1 {val['before']['f1_macro']:.4f} -> {val['after']['f1_macro']:.4f}"
+    )
+    if not report["accepted"]:
+        raise SystemExit(
+            f"[FAIL] Compaction refused: accuracy drop {val['accuracy_drop']:.4f} "
+            f"(max {cfg.max_accuracy_drop}), macro-F1 drop {val['f1_macro_drop']:.4f} (max {cfg.max_f1_drop}). "
+            f"Report: {args.report_out}"
+        )
+
+    size, load, single = report["size_bytes"], report["load_sec"], report["predict_single_ms"]
+    print(
+        f"Size: {size['before'] / 1e6:.2f} MB -> {size['after'] / 1e6:.2f} MB  "
+        f"load: {load['before'] * 1000:.1f} ms -> {load['after'] * 1000:.1f} ms  "
+        f"single-row predict: {single['sklearn']:.2f} ms -> {single['compacted']:.2f} ms"
+    )
+    print(f"Compacted model saved to: {report['out']}")
+    print(f"Report saved to: {args.report_out}")
+
+
+if __name__ == "__main__":
+    main()
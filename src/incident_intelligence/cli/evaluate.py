@@ -2,11 +2,6 @@ from __future__ import annotations
 
 import argparse
 
-from incident_intelligence.modeling.evaluate import (
-    EvalConfig,
-    run_evaluation,
-)
-
 
 def build_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(
@@ -48,6 +43,29 @@ def build_parser() -> argparse.ArgumentParser:
         default="artifacts/metrics/evaluation_summary.csv",
         help="Path to save evaluation summary CSV",
     )
+    parser.add_argument(
+        "--prediction-cache-dir",
+        type=str,
+        default="artifacts/cache/predictions",
+        help="Where per-(model, dataset) predictions are stored and reused (shared with explain)",
+    )
+    parser.add_argument(
+        "--no-prediction-cache",
+        action="store_true",
+        help="Always re-run the models instead of reusing stored predictions",
+    )
+    parser.add_argument(
+        "--chunk-rows",
+        type=int,
+        default=None,
+        help="Stream the eval set in chunks of this many rows (constant memory; ROC-AUC is histogram-approximated)",
+    )
+    parser.add_argument(
+        "--auc-bins",
+        type=int,
+        default=1000,
+        help="Score-histogram bins per class for streamed ROC-AUC",
+    )
     return parser
 
 
@@ -55,10 +73,19 @@ def main() -> None:
     parser = build_parser()
     args = parser.parse_args()
 
+    # Imported after argument parsing so --help and usage errors stay fast.
+    from incident_intelligence.modeling.evaluate import (
+        EvalConfig,
+        run_evaluation,
+    )
+
     cfg = EvalConfig(
         label_col=args.label_col,
         metrics_out=args.metrics_out,
         summary_csv_out=args.summary_csv_out,
+        prediction_cache_dir=None if args.no_prediction_cache else args.prediction_cache_dir,
+        chunk_rows=args.chunk_rows,
+        auc_bins=args.auc_bins,
     )
 
     results = run_evaluation(
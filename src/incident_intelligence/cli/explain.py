@@ -2,11 +2,6 @@ from __future__ import annotations
 
 import argparse
 
-from incident_intelligence.modeling.explain import (
-    ExplainConfig,
-    run_explainability,
-)
-
 
 def build_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(
@@ -87,6 +82,18 @@ def build_parser() -> argparse.ArgumentParser:
         default=20,
     )
 
+    parser.add_argument(
+        "--prediction-cache-dir",
+        type=str,
+        default="artifacts/cache/predictions",
+        help="Predictions stored by evaluate (reused for the permutation baseline)",
+    )
+
+    parser.add_argument(
+        "--no-prediction-cache",
+        action="store_true",
+    )
+
     return parser
 
 
@@ -94,6 +101,12 @@ def main() -> None:
     parser = build_parser()
     args = parser.parse_args()
 
+    # Imported after argument parsing so --help and usage errors stay fast.
+    from incident_intelligence.modeling.explain import (
+        ExplainConfig,
+        run_explainability,
+    )
+
     cfg = ExplainConfig(
         label_col=args.label_col,
         out_dir=args.out_dir,
@@ -104,6 +117,7 @@ def main() -> None:
         perm_repeats=args.perm_repeats,
         random_state=args.random_state,
         top_k=args.top_k,
+        prediction_cache_dir=None if args.no_prediction_cache else args.prediction_cache_dir,
     )
 
     results = run_explainability(
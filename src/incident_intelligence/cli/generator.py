@@ -1,6 +1,12 @@
 import argparse
 
-from incident_intelligence.data.generator import GeneratorConfig, generate_and_save_datasets
+from incident_intelligence.data.generator import (
+    DEFAULT_SHARD_ROWS,
+    ENGINES,
+    OUTPUT_FORMATS,
+    GeneratorConfig,
+    generate_and_save_datasets,
+)
 
 
 def build_parser() -> argparse.ArgumentParser:
@@ -14,6 +20,44 @@ def build_parser() -> argparse.ArgumentParser:
     parser.add_argument("--train-size", type=float, default=0.70)
     parser.add_argument("--val-size", type=float, default=0.15)
     parser.add_argument("--label-col", type=str, default="root_cause_label")
+    parser.add_argument(
+        "--engine",
+        type=str,
+        choices=ENGINES,
+        default="vectorized",
+        help="vectorized: columnar NumPy engine; legacy: original per-row loop",
+    )
+    parser.add_argument(
+        "--chunk-rows",
+        type=int,
+        default=None,
+        help="Generate in chunks of this many rows and stream raw/splits to Parquet",
+    )
+    parser.add_argument(
+        "--shard-rows",
+        type=int,
+        default=DEFAULT_SHARD_ROWS,
+        help="Rows per independently seeded shard (in-memory mode)",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Processes generating shards in parallel; output does not depend on this",
+    )
+    parser.add_argument(
+        "--config-cache-dir",
+        type=str,
+        default=None,
+        help="Directory for the compiled class_config .npz cache",
+    )
+    parser.add_argument(
+        "--output-format",
+        type=str,
+        choices=OUTPUT_FORMATS,
+        default=None,
+        help="csv (default), parquet (default with --chunk-rows) or columnar (memory-mappable .cols)",
+    )
     return parser
 
 
@@ -29,6 +73,12 @@ def main() -> None:
         train_size=args.train_size,
         val_size=args.val_size,
         label_col=args.label_col,
+        engine=args.engine,
+        chunk_rows=args.chunk_rows,
+        shard_rows=args.shard_rows,
+        workers=args.workers,
+        config_cache_dir=args.config_cache_dir,
+        output_format=args.output_format,
     )
 
     result = generate_and_save_datasets(cfg)
@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+import argparse
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description="Update the incremental model in place with new labeled incident batches (partial_fit)."
+    )
+    parser.add_argument(
+        "--data",
+        type=str,
+        nargs="+",
+        default=["-"],
+        help="CSV/Parquet/.cols files with new labeled incidents, or '-' for CSV on stdin",
+    )
+    parser.add_argument(
+        "--label-col",
+        type=str,
+        default="root_cause_label",
+        help="Target label column name",
+    )
+    parser.add_argument(
+        "--model",
+        type=str,
+        choices=["sgd", "nb"],
+        default="sgd",
+        help="sgd: averaged SGDClassifier(log_loss) on standardized features; nb: GaussianNB",
+    )
+    parser.add_argument(
+        "--model-out",
+        type=str,
+        default="artifacts/models/incremental_pipeline.joblib",
+        help="Persisted pipeline to update (created on the first run)",
+    )
+    parser.add_argument(
+        "--checkpoint-dir",
+        type=str,
+        default="artifacts/checkpoints/incremental",
+        help="Directory for rolling copies of the model after each save",
+    )
+    parser.add_argument(
+        "--no-checkpoints",
+        action="store_true",
+        help="Only update --model-out",
+    )
+    parser.add_argument(
+        "--keep-checkpoints",
+        type=int,
+        default=5,
+        help="Number of checkpoints to keep",
+    )
+    parser.add_argument(
+        "--checkpoint-every",
+        type=int,
+        default=None,
+        help="Also save after every N batches (long stdin streams)",
+    )
+    parser.add_argument(
+        "--chunk-rows",
+        type=int,
+        default=10_000,
+        help="Rows per partial_fit batch",
+    )
+    parser.add_argument(
+        "--classes",
+        type=str,
+        nargs="+",
+        default=None,
+        help="All labels the model may see (first run only; default: root causes in config/class_config.json)",
+    )
+    parser.add_argument(
+        "--alpha",
+        type=float,
+        default=1e-4,
+        help="SGD regularization strength",
+    )
+    parser.add_argument(
+        "--random-state",
+        type=int,
+        default=42,
+    )
+    return parser
+
+
+def main() -> None:
+    parser = build_parser()
+    args = parser.parse_args()
+
+    # Imported after argument parsing so --help and usage errors stay fast.
+    from incident_intelligence.modeling.incremental import (
+        IncrementalConfig,
+        run_incremental,
+    )
+
+    cfg = IncrementalConfig(
+        label_col=args.label_col,
+        model=args.model,
+        model_out=args.model_out,
+        checkpoint_dir=None if args.no_checkpoints else args.checkpoint_dir,
+        keep_checkpoints=args.keep_checkpoints,
+        chunk_rows=args.chunk_rows,
+        classes=tuple(args.classes) if args.classes else None,
+        alpha=args.alpha,
+        random_state=args.random_state,
+    )
+
+    state = run_incremental(args.data, cfg, checkpoint_every=args.checkpoint_every)
+
+    acc = state.get("prequential_accuracy")
+    print(
+        f"Incremental model: {state['n_rows_seen']} rows over {state['n_updates']} update(s)"
+        + (f", prequential accuracy={acc:.4f}" if acc is not None else "")
+    )
+
+
+if __name__ == "__main__":
+    main()
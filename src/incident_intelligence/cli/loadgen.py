@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+
+from incident_intelligence.data.loadgen import ARRIVALS, FORMATS, LoadGenConfig, run_loadgen
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description="Emit synthetic incidents continuously at a target rate (throughput benchmarking)."
+    )
+    parser.add_argument("--rate", type=float, default=1000.0, help="Target incidents/s (0 = unthrottled)")
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds to run (<= 0 = no limit)")
+    parser.add_argument("--max-events", type=int, default=None)
+    parser.add_argument("--arrivals", type=str, choices=ARRIVALS, default="poisson")
+    parser.add_argument("--burst-size", type=float, default=50.0, help="Mean incidents per burst (bursty)")
+    parser.add_argument("--format", type=str, choices=FORMATS, default="jsonl")
+    parser.add_argument(
+        "--out",
+        type=str,
+        default="-",
+        help="'-' for stdout, a file or named pipe path, unix:/path/to.sock or tcp://host:port",
+    )
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--no-label", action="store_true", help="Omit the label column")
+    parser.add_argument("--label-col", type=str, default="root_cause_label")
+    return parser
+
+
+def main() -> None:
+    parser = build_parser()
+    args = parser.parse_args()
+
+    cfg = LoadGenConfig(
+        rate=args.rate,
+        duration=args.duration if args.duration > 0 else None,
+        max_events=args.max_events,
+        arrivals=args.arrivals,
+        burst_size=args.burst_size,
+        fmt=args.format,
+        out=args.out,
+        batch_size=args.batch_size,
+        seed=args.seed,
+        include_label=not args.no_label,
+        label_col=args.label_col,
+    )
+
+    stats = run_loadgen(cfg)
+
+    # stdout may be the data stream, so the report goes to stderr.
+    print(json.dumps(stats), file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
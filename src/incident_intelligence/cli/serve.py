@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+import argparse
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description="Serve a saved model over HTTP (/predict, /predict/batch, /health)."
+    )
+    parser.add_argument(
+        "--model",
+        type=str,
+        default="artifacts/models/best_model.joblib",
+        help="Saved pipeline (or compiled / compacted forest) .joblib; a replaced file is hot-swapped",
+    )
+    parser.add_argument("--host", type=str, default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument(
+        "--scoring-threads",
+        type=int,
+        default=1,
+        help="Threads running predict_proba off the event loop",
+    )
+    parser.add_argument(
+        "--max-batch-rows",
+        type=int,
+        default=10_000,
+        help="Largest /predict/batch request accepted (413 above)",
+    )
+    parser.add_argument(
+        "--no-batching",
+        action="store_true",
+        help="Score every /predict request on its own instead of coalescing concurrent ones",
+    )
+    parser.add_argument(
+        "--max-batch-size",
+        type=int,
+        default=64,
+        help="Most /predict requests scored in one predict_proba call",
+    )
+    parser.add_argument(
+        "--max-wait-ms",
+        type=float,
+        default=2.0,
+        help="How long a batch waits for more requests after its first one",
+    )
+    parser.add_argument(
+        "--reload-interval",
+        type=float,
+        default=2.0,
+        help="Seconds between checks of --model for a new artifact (0 = never hot-swap)",
+    )
+    parser.add_argument(
+        "--canary",
+        type=str,
+        default=None,
+        help="CSV/Parquet incidents a new model must score before it is swapped in (default: synthetic)",
+    )
+    parser.add_argument("--log-level", type=str, default="info")
+    return parser
+
+
+def main() -> None:
+    parser = build_parser()
+    args = parser.parse_args()
+
+    # Imported after argument parsing so --help and usage errors stay fast.
+    import uvicorn
+
+    from incident_intelligence.api.inference_api import ServeConfig, create_app
+
+    cfg = ServeConfig(
+        model_path=args.model,
+        scoring_threads=args.scoring_threads,
+        max_batch_rows=args.max_batch_rows,
+        batching=not args.no_batching,
+        max_batch_size=args.max_batch_size,
+        max_wait_ms=args.max_wait_ms,
+        reload_interval_s=args.reload_interval,
+        canary_path=args.canary,
+    )
+    uvicorn.run(create_app(cfg), host=args.host, port=args.port, log_level=args.log_level)
+
+
+if __name__ == "__main__":
+    main()
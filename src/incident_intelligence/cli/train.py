@@ -2,11 +2,6 @@ from __future__ import annotations
 
 import argparse
 
-from incident_intelligence.modeling.train import (
-    TrainValidateConfig,
-    run_training,
-)
-
 
 def build_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(
@@ -54,6 +49,119 @@ def build_parser() -> argparse.ArgumentParser:
         default="artifacts/models/best_model.joblib",
         help="Path to save the selected best model",
     )
+    parser.add_argument(
+        "--artifact-format",
+        type=str,
+        choices=["mmap", "compressed"],
+        default="mmap",
+        help="mmap: uncompressed, memory-mapped loads; compressed: zlib for cold storage",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        type=str,
+        default="artifacts/cache",
+        help="Content-addressed cache of fitted pipelines and CV trials",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Always search and fit, ignoring and not updating --cache-dir",
+    )
+    parser.add_argument(
+        "--runs-dir",
+        type=str,
+        default="artifacts/runs",
+        help="Each run journals finished CV scores and families to a new directory here",
+    )
+    parser.add_argument(
+        "--no-journal",
+        action="store_true",
+        help="Don't journal this run (it can't be resumed)",
+    )
+    parser.add_argument(
+        "--keep-runs",
+        type=int,
+        default=10,
+        help="Run journals kept in --runs-dir, this one included; older ones are deleted (0 = keep all)",
+    )
+    parser.add_argument(
+        "--resume",
+        type=str,
+        default=None,
+        metavar="RUN_DIR",
+        help="Resume an interrupted run from its journal with the original data and settings "
+        "(other options except --n-jobs are ignored)",
+    )
+    parser.add_argument(
+        "--families",
+        type=str,
+        nargs="+",
+        default=["default"],
+        help="Model families to train: logreg rf gb svm hgb rbf_approx, or a preset "
+        "(default: logreg rf gb svm; fast: logreg rf hgb rbf_approx; all)",
+    )
+    parser.add_argument(
+        "--scheduler",
+        type=str,
+        choices=["shared", "sequential"],
+        default="shared",
+        help="shared: all families' CV fits on one worker pool, longest first; sequential: one GridSearchCV per family",
+    )
+    parser.add_argument(
+        "--search",
+        type=str,
+        choices=["grid", "halving", "budget", "coreset"],
+        default="grid",
+        help="grid: full grid on all rows; halving: successive halving on growing row subsets; "
+        "budget: halving that stops a family once --budget-sec is spent; "
+        "coreset: full grid on a --coreset-size subsample, winner refit on all rows",
+    )
+    parser.add_argument(
+        "--coreset-size",
+        type=int,
+        default=10_000,
+        help="Training rows the coreset search runs on (--search coreset)",
+    )
+    parser.add_argument(
+        "--coreset-method",
+        type=str,
+        choices=["stratified", "kmeans"],
+        default="stratified",
+        help="stratified: class-stratified sample; kmeans: stratified by class and k-means cluster",
+    )
+    parser.add_argument(
+        "--no-coreset-check",
+        action="store_true",
+        help="Skip the second search on a disjoint sample that measures ranking agreement",
+    )
+    parser.add_argument(
+        "--halving-factor",
+        type=int,
+        default=3,
+        help="Row growth / candidate reduction per halving iteration",
+    )
+    parser.add_argument(
+        "--budget-sec",
+        type=float,
+        default=None,
+        help="Per-family search budget in seconds of fit time (--search budget)",
+    )
+    parser.add_argument(
+        "--no-warm-start-paths",
+        action="store_true",
+        help="Fit every grid point from scratch instead of sharing RF/GB/HGB paths across grid points",
+    )
+    parser.add_argument(
+        "--approximate-paths",
+        action="store_true",
+        help="Also warm-start LogisticRegression along its C grid (faster; CV scores may differ slightly)",
+    )
+    parser.add_argument(
+        "--n-jobs",
+        type=int,
+        default=-1,
+        help="Worker processes for model search (-1 = all cores)",
+    )
     return parser
 
 
@@ -61,20 +169,70 @@ def main() -> None:
     parser = build_parser()
     args = parser.parse_args()
 
+    # Imported after argument parsing so --help and usage errors stay fast.
+    from incident_intelligence.modeling.baseline import BaselineTrainConfig, resolve_families
+    from incident_intelligence.modeling.train import (
+        TrainValidateConfig,
+        new_run_dir,
+        prune_runs,
+        resume_training,
+        run_training,
+    )
+
+    if args.resume:
+        result = resume_training(args.resume, n_jobs=args.n_jobs)
+        _print_best(result)
+        return
+
+    if args.keep_runs < 0:
+        parser.error("--keep-runs must be >= 0")
+    run_dir = None if args.no_journal else new_run_dir(args.runs_dir)
+    if run_dir is not None and args.keep_runs > 0:
+        for old_run in prune_runs(args.runs_dir, args.keep_runs, exclude=run_dir):
+            print(f"[OK] removed old run journal {old_run}")
+
     cfg = TrainValidateConfig(
         label_col=args.label_col,
         models_out_dir=args.models_out_dir,
         metrics_out_json=args.metrics_out_json,
         leaderboard_out_csv=args.leaderboard_out_csv,
         best_model_out=args.best_model_out,
+        cache_dir=None if args.no_cache else args.cache_dir,
+        artifact_format=args.artifact_format,
+        run_dir=str(run_dir) if run_dir is not None else None,
+    )
+
+    try:
+        families = resolve_families(args.families)
+    except ValueError as e:
+        parser.error(str(e))
+
+    base_cfg = BaselineTrainConfig(
+        label_col=args.label_col,
+        n_jobs=args.n_jobs,
+        scheduler=args.scheduler,
+        search=args.search,
+        halving_factor=args.halving_factor,
+        budget_sec=args.budget_sec,
+        coreset_size=args.coreset_size,
+        coreset_method=args.coreset_method,
+        coreset_check=not args.no_coreset_check,
+        warm_start_paths=not args.no_warm_start_paths,
+        approximate_paths=args.approximate_paths,
+        families=families,
     )
 
     result = run_training(
         train_path=args.train,
         val_path=args.val,
         cfg=cfg,
+        base_cfg=base_cfg,
     )
 
+    _print_best(result)
+
+
+def _print_best(result) -> None:
     best = result["best_model"]
     print(
         f"Training complete. Best model: {best['model_name']} "
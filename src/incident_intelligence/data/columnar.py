@@ -0,0 +1,213 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from incident_intelligence.data.schema import COUNT_FEATURES, FLOAT_FEATURES
+
+
+# A columnar dataset is a directory "<name>.cols/" holding one raw little-endian
+# "<column>.bin" per column plus "schema.json". Columns are read back with
+# np.memmap, so loading is O(1) and pages are shared through the OS cache.
+COLUMNAR_SUFFIX = ".cols"
+SCHEMA_FILE = "schema.json"
+FORMAT_VERSION = 1
+
+# Storage dtypes for the known incident columns; anything else is inferred.
+COLUMN_DTYPES: Dict[str, str] = {
+    **{name: "float32" for name in FLOAT_FEATURES},
+    **{name: "uint16" for name in COUNT_FEATURES},
+}
+CATEGORY_CODE_DTYPE = "int16"
+# Code stored for missing values (None / NaN) in categorical columns; it is
+# pd.Categorical's own NA code, so it reads back as NaN.
+CATEGORY_NA_CODE = -1
+
+
+def is_columnar(path: str | Path) -> bool:
+    path = Path(path)
+    return path.suffix.lower() == COLUMNAR_SUFFIX or (path / SCHEMA_FILE).exists()
+
+
+def _storage_dtype(name: str, values: pd.Series, downcast: bool = True) -> Optional[str]:
+    """Returns the numeric storage dtype, or None for categorical columns."""
+    if pd.api.types.is_bool_dtype(values):
+        return "bool"
+    if not (pd.api.types.is_float_dtype(values) or pd.api.types.is_integer_dtype(values)):
+        return None
+    if not downcast:
+        return values.dtype.name
+    if name in COLUMN_DTYPES:
+        return COLUMN_DTYPES[name]
+    return "float32" if pd.api.types.is_float_dtype(values) else "int64"
+
+
+def _cast(name: str, values: pd.Series, dtype: str) -> np.ndarray:
+    arr = values.to_numpy()
+    if np.issubdtype(np.dtype(dtype), np.integer) and len(arr):
+        info = np.iinfo(dtype)
+        if np.any(np.isnan(arr.astype(float))) or arr.min() < info.min or arr.max() > info.max:
+            raise ValueError(f"Column '{name}' does not fit in {dtype} (range {arr.min()}..{arr.max()})")
+    return arr.astype(dtype, copy=False)
+
+
+class ColumnarWriter:
+    """
+    Appends DataFrame chunks to a columnar dataset; schema.json is written on
+    close(), so a directory without it is an incomplete write. With
+    downcast=False numeric columns keep their in-memory dtype (exact round trip).
+    """
+
+    def __init__(self, path: str | Path, *, downcast: bool = True):
+        self.path = Path(path)
+        self.downcast = downcast
+        self.path.mkdir(parents=True, exist_ok=True)
+        for stale in [self.path / SCHEMA_FILE, *self.path.glob("*.bin")]:
+            stale.unlink(missing_ok=True)
+
+        self.n_rows = 0
+        self.columns: List[Dict[str, Any]] = []
+        self._files: Dict[str, Any] = {}
+        self._categories: Dict[str, Dict[Any, int]] = {}
+
+    def _init_columns(self, df: pd.DataFrame) -> None:
+        for name in df.columns:
+            dtype = _storage_dtype(name, df[name], self.downcast)
+            kind = "numeric" if dtype is not None else "category"
+            self.columns.append({"name": name, "kind": kind, "dtype": dtype or CATEGORY_CODE_DTYPE})
+            self._files[name] = open(self.path / f"{name}.bin", "wb")
+            if kind == "category":
+                self._categories[name] = {}
+                # e.g. "object" / "str": lets readers restore the column's original dtype
+                self.columns[-1]["source_dtype"] = str(df[name].dtype)
+
+    def _encode(self, name: str, values: pd.Series) -> np.ndarray:
+        mapping = self._categories[name]
+        present = values.notna().to_numpy()
+        inverse, uniques = pd.factorize(values[present].astype(str))
+        for value in uniques:
+            if value not in mapping:
+                mapping[value] = len(mapping)
+        if len(mapping) > np.iinfo(CATEGORY_CODE_DTYPE).max:
+            raise ValueError(f"Column '{name}' has too many categories for {CATEGORY_CODE_DTYPE} codes")
+        lookup = np.array([mapping[value] for value in uniques], dtype=CATEGORY_CODE_DTYPE)
+        codes = np.full(len(values), CATEGORY_NA_CODE, dtype=CATEGORY_CODE_DTYPE)
+        codes[present] = lookup[inverse]
+        return codes
+
+    def append(self, df: pd.DataFrame) -> None:
+        if not self.columns:
+            self._init_columns(df)
+        expected = [c["name"] for c in self.columns]
+        if list(df.columns) != expected:
+            raise ValueError(f"Column mismatch: expected {expected}, got {list(df.columns)}")
+
+        for col in self.columns:
+            name = col["name"]
+            if col["kind"] == "category":
+                arr = self._encode(name, df[name])
+            else:
+                arr = _cast(name, df[name], col["dtype"])
+            self._files[name].write(np.ascontiguousarray(arr, dtype=arr.dtype.newbyteorder("<")).tobytes())
+        self.n_rows += len(df)
+
+    def close(self) -> Path:
+        for f in self._files.values():
+            f.close()
+        for col in self.columns:
+            if col["kind"] == "category":
+                col["categories"] = list(self._categories[col["name"]])
+
+        schema = {"format_version": FORMAT_VERSION, "n_rows": self.n_rows, "columns": self.columns}
+        (self.path / SCHEMA_FILE).write_text(json.dumps(schema, indent=2))
+        return self.path
+
+    def __enter__(self) -> "ColumnarWriter":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def write_columnar(df: pd.DataFrame, path: str | Path, *, downcast: bool = True) -> Path:
+    with ColumnarWriter(path, downcast=downcast) as writer:
+        writer.append(df)
+    return writer.path
+
+
+def read_schema(path: str | Path) -> Dict[str, Any]:
+    schema_path = Path(path) / SCHEMA_FILE
+    if not schema_path.exists():
+        raise FileNotFoundError(f"Columnar schema not found (incomplete write?): {schema_path}")
+    schema = json.loads(schema_path.read_text())
+    if schema.get("format_version") != FORMAT_VERSION:
+        raise ValueError(f"Unsupported columnar format version: {schema.get('format_version')}")
+    return schema
+
+
+def _restore_category(values: pd.Categorical, col: Dict[str, Any]) -> Any:
+    source_dtype = col.get("source_dtype")
+    if source_dtype in (None, "category"):
+        return values
+    return pd.Series(values).astype(source_dtype).to_numpy()
+
+
+def restore_source_dtypes(df: pd.DataFrame, schema: Dict[str, Any]) -> pd.DataFrame:
+    """
+    Converts df's categorical columns (as read by read_columnar) back to the
+    dtype they were written from. Applied per slice, this keeps the object
+    arrays as small as the slice.
+    """
+    by_name = {col["name"]: col for col in schema["columns"] if col["kind"] == "category"}
+    restored = {name: _restore_category(df[name].array, by_name[name]) for name in df.columns if name in by_name}
+    return df.assign(**restored) if restored else df
+
+
+def read_columnar(
+    path: str | Path,
+    columns: Optional[Sequence[str]] = None,
+    *,
+    mmap: bool = True,
+    restore_dtypes: bool = False,
+) -> pd.DataFrame:
+    """
+    Loads a columnar dataset. With mmap=True (default) numeric columns are
+    read-only views over the files; categorical columns come back as
+    pd.Categorical over their stored codes, or with restore_dtypes=True in the
+    dtype they were written from (object / str), when the schema records it.
+    Missing values read back as NaN either way.
+    """
+    path = Path(path)
+    schema = read_schema(path)
+    n_rows = schema["n_rows"]
+    by_name = {col["name"]: col for col in schema["columns"]}
+
+    if columns is None:
+        columns = list(by_name)
+    missing = [name for name in columns if name not in by_name]
+    if missing:
+        raise ValueError(f"Columns not found in {path}: {missing}. Columns={list(by_name)}")
+
+    data: Dict[str, Any] = {}
+    for name in columns:
+        col = by_name[name]
+        dtype = np.dtype(col["dtype"]).newbyteorder("<")
+        file_path = path / f"{name}.bin"
+        if n_rows == 0:
+            arr = np.empty(0, dtype=dtype)
+        elif mmap:
+            arr = np.memmap(file_path, dtype=dtype, mode="r", shape=(n_rows,))
+        else:
+            arr = np.fromfile(file_path, dtype=dtype, count=n_rows)
+
+        if col["kind"] == "category":
+            values = pd.Categorical.from_codes(arr, categories=col["categories"])
+            data[name] = _restore_category(values, col) if restore_dtypes else values
+        else:
+            data[name] = np.asarray(arr)
+
+    return pd.DataFrame(data, columns=list(columns), copy=False)
@@ -1,15 +1,26 @@
 from __future__ import annotations
 
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, Any
+from typing import Any, Dict, Iterator, List, Optional
 
 import numpy as np
 import pandas as pd
 import random
-from sklearn.model_selection import train_test_split
+import zlib
 
-from incident_intelligence.settings import SETTINGS, load_class_config
+from incident_intelligence.data.columnar import COLUMNAR_SUFFIX, ColumnarWriter, write_columnar
+from incident_intelligence.data.schema import FEATURE_COLUMNS, FEATURE_SCHEMA
+from incident_intelligence.data.mixtures import (
+    CompiledClassConfig,
+    as_compiled,
+    load_compiled_class_config,
+    validate_configs,
+)
+from incident_intelligence.settings import get_settings
 
 
 DEFAULT_ROOT_CAUSE_PROBS = {
@@ -21,6 +32,8 @@ DEFAULT_ROOT_CAUSE_PROBS = {
     "normal": 0.15,
 }
 
+DEFAULT_SHARD_ROWS = 100_000
+
 
 @dataclass(frozen=True)
 class GeneratorConfig:
@@ -31,16 +44,43 @@ class GeneratorConfig:
     val_size: float = 0.15
     raw_out: str = "raw/incidents_raw.csv"
     processed_dir: str = "processed"
+    # "vectorized" samples whole columns per class with np.random.Generator;
+    # "legacy" replays the original per-row loop (bit-identical to older datasets).
+    engine: str = "vectorized"
+    # When set, generate in chunks of this many rows and stream them to Parquet
+    # (one row group per chunk) so peak memory depends on chunk_rows, not n_samples.
+    chunk_rows: Optional[int] = None
+    # Shards are the unit of seeding (SeedSequence.spawn) and of parallel work, so
+    # output for a given seed depends on shard_rows/chunk_rows but never on workers.
+    shard_rows: int = DEFAULT_SHARD_ROWS
+    workers: int = 1
+    # Optional directory for the compiled class_config .npz cache.
+    config_cache_dir: Optional[str] = None
+    # "csv" | "parquet" | "columnar" (float32/uint16/category .cols directories).
+    # Defaults to csv in memory and parquet when streaming with chunk_rows.
+    output_format: Optional[str] = None
+
+
+ENGINES = ("vectorized", "legacy")
+
+# Baseline (mean, std) for every metric before the class mixtures are applied.
+BASE_METRICS = {
+    "request_rate": (300, 50),
+    "mem_growth": (0.2, 0.1),
+    "error_rate": (0.5, 0.2),
+    "upstream_error": (0.3, 0.2),
+    "dependency_latency": (150, 40),
+    "latency": (200, 50),
+    "avg_cpu": (40, 10),
+}
 
 
-def validate_configs(class_config):
-    for root_cause, metric_mix in class_config.items():
-        for metric, mixture in metric_mix.items():
-            total = sum(p for p, _ in mixture)
-            if not np.isclose(total, 1.0):
-                raise ValueError(
-                    f"config error: root_cause={root_cause} | metric={metric} | mixture probs sum to {total}"
-                )
+@lru_cache(maxsize=None)
+def _sigmoid():
+    # scipy is only needed once rows are actually generated.
+    from scipy.special import expit
+
+    return expit
 
 
 def apply_mixture(value, config):
@@ -83,8 +123,6 @@ def generate_incident(root_cause, class_config):
     )
     metrics["latency"] = max(metrics["latency"], 50)
 
-    from scipy.special import expit as sigmoid
-
     bias = -4.0
     system_stress_score = (
         bias
@@ -96,7 +134,7 @@ def generate_incident(root_cause, class_config):
         + 0.01 * metrics["latency"]
     )
     system_stress_score += 2.0 * metrics["error_rate"]
-    metrics["error_rate"] += sigmoid(system_stress_score)
+    metrics["error_rate"] += _sigmoid()(system_stress_score)
 
     oom_logs = np.random.poisson(max(metrics["mem_growth"] * 2, 0.5))
     timeout_logs = np.random.poisson(max(metrics["dependency_latency"] / 100, 1))
@@ -120,7 +158,188 @@ def generate_incident(root_cause, class_config):
     }
 
 
-def generate_dataset(n_samples, root_cause_probs, class_config, seed=42):
+def generate_incidents_batch(
+    root_cause: str,
+    n: int,
+    class_config: CompiledClassConfig,
+    rng: np.random.Generator,
+) -> Dict[str, np.ndarray]:
+    """
+    Columnar generate_incident: returns the feature columns for n incidents of one root cause.
+    """
+    metrics = {name: rng.normal(mean, std, n) for name, (mean, std) in BASE_METRICS.items()}
+
+    for metric, mixture in class_config[root_cause].items():
+        if metric in metrics:
+            metrics[metric] = mixture.sample(metrics[metric], rng)
+
+    avg_cpu = np.clip(metrics["avg_cpu"] + 0.05 * metrics["request_rate"] + rng.normal(5, 3, n), 0, 100)
+    mem_growth = metrics["mem_growth"] + 0.005 * avg_cpu
+    request_rate = metrics["request_rate"]
+    dependency_latency = metrics["dependency_latency"] + 0.1 * np.maximum(request_rate - 300, 0)
+    upstream_error = metrics["upstream_error"]
+
+    latency = metrics["latency"] + (
+        0.5 * avg_cpu
+        + 0.3 * dependency_latency
+        + 10 * mem_growth
+        + rng.normal(50, 15, n)
+    )
+    latency = np.maximum(latency, 50)
+
+    bias = -4.0
+    system_stress_score = (
+        bias
+        + 0.02 * avg_cpu
+        + 1.0 * mem_growth
+        + 0.0015 * dependency_latency
+        + 0.05 * upstream_error
+        + 0.002 * request_rate
+        + 0.01 * latency
+    )
+    system_stress_score += 2.0 * metrics["error_rate"]
+    error_rate = metrics["error_rate"] + _sigmoid()(system_stress_score)
+
+    oom_logs = rng.poisson(np.maximum(mem_growth * 2, 0.5))
+    timeout_logs = rng.poisson(np.maximum(dependency_latency / 100, 1))
+
+    return {
+        "avg_cpu_usage": avg_cpu,
+        "mem_growth": np.maximum(mem_growth, 0),
+        "oom_log_count": oom_logs,
+        "request_rate": np.maximum(request_rate, 0),
+        "error_rate": np.maximum(error_rate, 0),
+        "latency": latency,
+        "upstream_error_rate": upstream_error,
+        "dependency_latency": np.maximum(dependency_latency, 1),
+        "timeout_log_count": timeout_logs,
+    }
+
+
+def empty_dataset() -> pd.DataFrame:
+    """A zero-row dataset with the generator's columns and dtypes."""
+    df = pd.DataFrame(
+        {name: np.empty(0, dtype=np.int64 if kind == "count" else np.float64) for name, kind in FEATURE_SCHEMA.items()}
+    )
+    df["root_cause_label"] = np.empty(0, dtype=object)
+    return df
+
+
+def generate_dataset_vectorized(
+    n_samples: int,
+    root_cause_probs: Dict[str, float],
+    class_config,
+    seed: int | np.random.Generator = 42,
+) -> pd.DataFrame:
+    """
+    Samples all labels up front, then generates each class as one batch of
+    NumPy columns and scatters them straight into the output frame.
+    """
+    rng = seed if isinstance(seed, np.random.Generator) else np.random.default_rng(seed)
+    class_config = as_compiled(class_config)
+
+    labels = list(root_cause_probs.keys())
+    weights = np.asarray(list(root_cause_probs.values()), dtype=float)
+    codes = rng.choice(len(labels), size=n_samples, p=weights / weights.sum())
+
+    columns: Dict[str, np.ndarray] = {}
+    for code, root_cause in enumerate(labels):
+        idx = np.flatnonzero(codes == code)
+        if idx.size == 0:
+            continue
+        batch = generate_incidents_batch(root_cause, idx.size, class_config, rng)
+        for name, values in batch.items():
+            if name not in columns:
+                columns[name] = np.empty(n_samples, dtype=values.dtype)
+            columns[name][idx] = values
+
+    if not columns:
+        return empty_dataset()
+
+    df = pd.DataFrame({name: columns[name] for name in FEATURE_COLUMNS})
+    df["root_cause_label"] = np.asarray(labels, dtype=object)[codes]
+    return df
+
+
+def chunk_bounds(n_samples: int, chunk_rows: int) -> List[tuple[int, int]]:
+    if chunk_rows <= 0:
+        raise ValueError("chunk_rows must be > 0")
+    return [(start, min(start + chunk_rows, n_samples)) for start in range(0, n_samples, chunk_rows)]
+
+
+def _generate_shard(task) -> pd.DataFrame:
+    n_rows, root_cause_probs, class_config, seed_seq = task
+    rng = np.random.default_rng(seed_seq)
+    return generate_dataset_vectorized(n_rows, root_cause_probs, class_config, seed=rng)
+
+
+def iter_shards(
+    n_samples: int,
+    root_cause_probs: Dict[str, float],
+    class_config,
+    *,
+    seed: int,
+    shard_rows: int = DEFAULT_SHARD_ROWS,
+    workers: int = 1,
+) -> Iterator[pd.DataFrame]:
+    """
+    Yields the dataset shard by shard, in order. Every shard has its own
+    SeedSequence child, so the rows are identical whatever the worker count;
+    with workers > 1 at most 2 * workers shards are in flight at once.
+    """
+    bounds = chunk_bounds(n_samples, shard_rows)
+    seeds = np.random.SeedSequence(seed).spawn(len(bounds))
+    tasks = iter([(stop - start, root_cause_probs, class_config, seq) for (start, stop), seq in zip(bounds, seeds)])
+
+    if workers <= 1:
+        for task in tasks:
+            yield _generate_shard(task)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = deque(pool.submit(_generate_shard, task) for _, task in zip(range(2 * workers), tasks))
+        while pending:
+            shard = pending.popleft().result()
+            task = next(tasks, None)
+            if task is not None:
+                pending.append(pool.submit(_generate_shard, task))
+            yield shard
+
+
+def generate_dataset(
+    n_samples,
+    root_cause_probs,
+    class_config,
+    seed=42,
+    engine="vectorized",
+    *,
+    shard_rows: int = DEFAULT_SHARD_ROWS,
+    workers: int = 1,
+):
+    if engine == "vectorized":
+        class_config = as_compiled(class_config)
+        shards = list(
+            iter_shards(
+                n_samples,
+                root_cause_probs,
+                class_config,
+                seed=seed,
+                shard_rows=shard_rows,
+                workers=workers,
+            )
+        )
+        if not shards:  # n_samples == 0
+            return empty_dataset()
+        if len(shards) == 1:
+            return shards[0]
+        return pd.concat(shards, ignore_index=True)
+    if workers > 1:
+        raise ValueError("workers > 1 requires engine='vectorized'")
+    if engine != "legacy":
+        raise ValueError(f"Unknown engine: {engine} (use one of {ENGINES})")
+    if isinstance(class_config, CompiledClassConfig):
+        class_config = class_config.to_json()
+
     np.random.seed(seed)
     random.seed(seed)
 
@@ -132,31 +351,199 @@ def generate_dataset(n_samples, root_cause_probs, class_config, seed=42):
         root_cause = random.choices(labels, weights=weights, k=1)[0]
         data.append(generate_incident(root_cause, class_config))
 
-    return pd.DataFrame(data)
+    return pd.DataFrame(data) if data else empty_dataset()
 
 
-def stratified_splits(df: pd.DataFrame, label_col: str, seed: int, train_size: float, val_size: float):
-    eval_size = 1.0 - train_size - val_size
-    if eval_size <= 0:
-        raise ValueError("train_size + val_size must be < 1.0")
+SPLITS = ("train", "val", "eval")
 
-    train_df, temp_df = train_test_split(
-        df,
-        test_size=(1.0 - train_size),
-        stratify=df[label_col],
-        random_state=seed,
-    )
+# Fractional part of the golden ratio: the Kronecker sequence frac(k * phi) is
+# equidistributed with O(log n) discrepancy, i.e. it fills [0, 1) evenly at
+# every prefix length.
+_PHI = (np.sqrt(5.0) - 1.0) / 2.0
 
-    val_share_of_temp = val_size / (val_size + eval_size)
+# Stratum for rows whose label is missing (None / NaN); they are split like any
+# other class instead of being compared with ==, which NaN never satisfies.
+_MISSING_LABEL = "\0missing"
 
-    val_df, eval_df = train_test_split(
-        temp_df,
-        test_size=(1.0 - val_share_of_temp),
-        stratify=temp_df[label_col],
-        random_state=seed,
+
+class SplitAssigner:
+    """
+    Streaming stratified train/val/eval assignment.
+
+    Rows are assigned one chunk at a time, in the order they are produced. The
+    k-th row of each class lands at frac(offset + k * phi) in [0, 1), which is
+    bucketed by the cumulative split fractions. Only a per-class counter is kept,
+    so every class tracks the requested fractions to within a few rows at any
+    point of the stream, without buffering or copying the data.
+    """
+
+    def __init__(self, train_size: float, val_size: float, seed: int = 42):
+        if train_size <= 0 or train_size >= 1:
+            raise ValueError("train_size must be between 0 and 1")
+        if val_size <= 0 or val_size >= 1:
+            raise ValueError("val_size must be between 0 and 1")
+        if 1.0 - train_size - val_size <= 0:
+            raise ValueError("train_size + val_size must be < 1.0")
+
+        self.seed = seed
+        self.cum_fracs = np.array([train_size, train_size + val_size])
+        self.seen: Dict[Any, int] = {}
+        self._offsets: Dict[Any, float] = {}
+
+    def _offset(self, label) -> float:
+        if label not in self._offsets:
+            key = zlib.crc32(str(label).encode("utf-8"))
+            self._offsets[label] = float(np.random.default_rng([self.seed, key]).random())
+        return self._offsets[label]
+
+    def assign(self, labels: np.ndarray) -> np.ndarray:
+        """Returns split codes (0=train, 1=val, 2=eval) for the next rows of the stream."""
+        labels = np.asarray(labels)
+        codes = np.full(len(labels), -1, dtype=np.int8)
+        missing = pd.isna(labels)
+
+        groups = [(label, np.flatnonzero(labels == label)) for label in pd.unique(labels[~missing])]
+        if missing.any():
+            groups.append((_MISSING_LABEL, np.flatnonzero(missing)))
+        for label, idx in groups:
+            seen = self.seen.get(label, 0)
+            rank = np.arange(seen, seen + idx.size, dtype=np.float64)
+            position = np.mod(self._offset(label) + rank * _PHI, 1.0)
+            codes[idx] = np.searchsorted(self.cum_fracs, position, side="right")
+            self.seen[label] = seen + idx.size
+
+        return codes
+
+
+def split_frame(df: pd.DataFrame, codes: np.ndarray) -> Dict[str, pd.DataFrame]:
+    return {name: df[codes == i] for i, name in enumerate(SPLITS)}
+
+
+def stratified_splits(df: pd.DataFrame, label_col: str, seed: int, train_size: float, val_size: float):
+    """
+    Splits df into train/val/eval with stratification on label_col.
+
+    eval_size is computed as (1 - train_size - val_size).
+    """
+    codes = SplitAssigner(train_size, val_size, seed=seed).assign(df[label_col].to_numpy())
+    parts = split_frame(df, codes)
+    return parts["train"], parts["val"], parts["eval"]
+
+
+OUTPUT_FORMATS = ("csv", "parquet", "columnar")
+_FORMAT_SUFFIX = {"csv": ".csv", "parquet": ".parquet", "columnar": COLUMNAR_SUFFIX}
+
+
+def output_format(cfg: GeneratorConfig) -> str:
+    fmt = cfg.output_format or ("parquet" if cfg.chunk_rows else "csv")
+    if fmt not in OUTPUT_FORMATS:
+        raise ValueError(f"Unknown output_format: {fmt} (use one of {OUTPUT_FORMATS})")
+    return fmt
+
+
+def output_paths(cfg: GeneratorConfig, fmt: str) -> Dict[str, Path]:
+    suffix = _FORMAT_SUFFIX[fmt]
+    data_dir = get_settings().data_dir
+    processed_dir = data_dir / cfg.processed_dir
+    paths = {"raw": (data_dir / cfg.raw_out).with_suffix(suffix)}
+    for name in SPLITS:
+        paths[name] = processed_dir / f"incident_root_cause_{name}{suffix}"
+    for path in paths.values():
+        path.parent.mkdir(parents=True, exist_ok=True)
+    return paths
+
+
+def save_frame(df: pd.DataFrame, path: Path, fmt: str) -> Path:
+    if fmt == "csv":
+        df.to_csv(path, index=False)
+    elif fmt == "parquet":
+        df.to_parquet(path, index=False)
+    else:
+        write_columnar(df, path)
+    return path
+
+
+class _ParquetAppender:
+    """Appends each chunk as one Parquet row group."""
+
+    def __init__(self, path: Path):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError as e:
+            raise ImportError("Parquet output requires pyarrow (pip install pyarrow)") from e
+        self.pa = pa
+        self.pq = pq
+        self.path = path
+        self.schema = None
+        self.writer = None
+
+    def append(self, df: pd.DataFrame) -> None:
+        if self.writer is None:
+            self.schema = self.pa.Schema.from_pandas(df, preserve_index=False)
+            self.writer = self.pq.ParquetWriter(self.path, self.schema)
+        self.writer.write_table(self.pa.Table.from_pandas(df, schema=self.schema, preserve_index=False))
+
+    def close(self) -> None:
+        if self.writer is not None:
+            self.writer.close()
+
+
+def generate_and_stream_datasets(
+    cfg: GeneratorConfig,
+    root_cause_probs: Dict[str, float],
+    class_config,
+) -> Dict[str, Any]:
+    """
+    Chunked generation: each chunk is a shard from iter_shards (so it can be
+    produced by a worker pool), split, and appended to the raw/train/val/eval
+    outputs (a Parquet row group or a columnar block per chunk).
+    """
+    if cfg.engine != "vectorized":
+        raise ValueError("chunk_rows is only supported with engine='vectorized'")
+
+    fmt = output_format(cfg)
+    if fmt == "csv":
+        raise ValueError("chunk_rows streams to 'parquet' or 'columnar' output")
+    paths = output_paths(cfg, fmt)
+
+    shards = iter_shards(
+        cfg.n_samples,
+        root_cause_probs,
+        class_config,
+        seed=cfg.seed,
+        shard_rows=cfg.chunk_rows,
+        workers=cfg.workers,
     )
+    assigner = SplitAssigner(cfg.train_size, cfg.val_size, seed=cfg.seed)
+
+    counts = {name: 0 for name in paths}
+    writers: Dict[str, Any] = {}
+
+    try:
+        for name, path in paths.items():
+            writers[name] = _ParquetAppender(path) if fmt == "parquet" else ColumnarWriter(path)
 
-    return train_df, val_df, eval_df
+        for chunk in shards:
+            codes = assigner.assign(chunk[cfg.label_col].to_numpy())
+            parts = {"raw": chunk, **split_frame(chunk, codes)}
+            for name, part in parts.items():
+                writers[name].append(part)
+                counts[name] += len(part)
+    finally:
+        for writer in writers.values():
+            writer.close()
+
+    return {
+        "raw_path": paths["raw"],
+        "train_path": paths["train"],
+        "val_path": paths["val"],
+        "eval_path": paths["eval"],
+        "n_raw": counts["raw"],
+        "n_train": counts["train"],
+        "n_val": counts["val"],
+        "n_eval": counts["eval"],
+    }
 
 
 def generate_and_save_datasets(
@@ -165,19 +552,24 @@ def generate_and_save_datasets(
 ) -> Dict[str, Any]:
     root_cause_probs = root_cause_probs or DEFAULT_ROOT_CAUSE_PROBS
 
-    class_config = load_class_config()
-    validate_configs(class_config)
+    class_config = load_compiled_class_config(cache_dir=cfg.config_cache_dir)
+
+    if cfg.chunk_rows:
+        return generate_and_stream_datasets(cfg, root_cause_probs, class_config)
 
     df = generate_dataset(
         cfg.n_samples,
         root_cause_probs,
         class_config,
         seed=cfg.seed,
+        engine=cfg.engine,
+        shard_rows=cfg.shard_rows,
+        workers=cfg.workers,
     )
 
-    raw_path = SETTINGS.data_dir / cfg.raw_out
-    raw_path.parent.mkdir(parents=True, exist_ok=True)
-    df.to_csv(raw_path, index=False)
+    fmt = output_format(cfg)
+    paths = output_paths(cfg, fmt)
+    save_frame(df, paths["raw"], fmt)
 
     train_df, val_df, eval_df = stratified_splits(
         df,
@@ -187,24 +579,17 @@ def generate_and_save_datasets(
         val_size=cfg.val_size,
     )
 
-    processed_dir = SETTINGS.data_dir / cfg.processed_dir
-    processed_dir.mkdir(parents=True, exist_ok=True)
-
-    train_path = processed_dir / "incident_root_cause_train.csv"
-    val_path = processed_dir / "incident_root_cause_val.csv"
-    eval_path = processed_dir / "incident_root_cause_eval.csv"
-
-    train_df.to_csv(train_path, index=False)
-    val_df.to_csv(val_path, index=False)
-    eval_df.to_csv(eval_path, index=False)
+    save_frame(train_df, paths["train"], fmt)
+    save_frame(val_df, paths["val"], fmt)
+    save_frame(eval_df, paths["eval"], fmt)
 
     return {
-        "raw_path": raw_path,
-        "train_path": train_path,
-        "val_path": val_path,
-        "eval_path": eval_path,
+        "raw_path": paths["raw"],
+        "train_path": paths["train"],
+        "val_path": paths["val"],
+        "eval_path": paths["eval"],
         "n_raw": len(df),
         "n_train": len(train_df),
         "n_val": len(val_df),
         "n_eval": len(eval_df),
-    }
\ No newline at end of file
+    }
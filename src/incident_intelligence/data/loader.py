@@ -0,0 +1,211 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from pathlib import Path
+from typing import Iterable, Iterator, Optional, Sequence
+
+import pandas as pd
+
+from incident_intelligence.data.columnar import (
+    COLUMNAR_SUFFIX,
+    SCHEMA_FILE,
+    is_columnar,
+    read_columnar,
+    read_schema,
+    restore_source_dtypes,
+    write_columnar,
+)
+from incident_intelligence.data.schema import FEATURE_COLUMNS, FEATURE_SCHEMA
+
+
+# CSV/Parquet inputs are parsed once and kept as a columnar sidecar named by
+# the blake2b digest of the file content, so every stage (train, evaluate,
+# explain, predict) that reads the same file memory-maps the same pages.
+CACHE_DIRNAME = ".incident_cache"
+SIDECAR_VERSION = 3  # 2: records the source dtype of string columns; 3: keeps missing strings as NaN
+_HASH_BLOCK = 1 << 20
+
+
+def default_cache_dir(path: str | Path) -> Path:
+    return Path(path).parent / CACHE_DIRNAME
+
+
+def content_digest(path: str | Path, cache_dir: str | Path | None = None) -> str:
+    """
+    blake2b of the file content. With cache_dir, the digest is remembered per
+    (path, size, mtime_ns) so unchanged files aren't re-hashed.
+    """
+    path = Path(path)
+    st = path.stat()
+    stat_path = None
+    if cache_dir is not None:
+        key = hashlib.blake2b(str(path.resolve()).encode(), digest_size=8).hexdigest()
+        stat_path = Path(cache_dir) / f"{key}.stat.json"
+        try:
+            cached = json.loads(stat_path.read_text())
+            if cached["size"] == st.st_size and cached["mtime_ns"] == st.st_mtime_ns:
+                return cached["digest"]
+        except (OSError, ValueError, KeyError):
+            pass
+
+    h = hashlib.blake2b()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(_HASH_BLOCK), b""):
+            h.update(block)
+    digest = h.hexdigest()
+
+    if stat_path is not None:
+        try:
+            stat_path.parent.mkdir(parents=True, exist_ok=True)
+            stat_path.write_text(
+                json.dumps({"path": str(path), "size": st.st_size, "mtime_ns": st.st_mtime_ns, "digest": digest})
+            )
+        except OSError:
+            pass
+    return digest
+
+
+def validate_schema(df: pd.DataFrame, path: str | Path, label_col: Optional[str] = None) -> None:
+    """Checks that the declared features (and label, if given) are present and numeric."""
+    missing = [name for name in FEATURE_SCHEMA if name not in df.columns]
+    if label_col is not None and label_col not in df.columns:
+        missing.append(label_col)
+    if missing:
+        raise ValueError(f"{path}: missing columns {missing}. Columns={list(df.columns)}")
+
+    bad = [name for name in FEATURE_SCHEMA if not pd.api.types.is_numeric_dtype(df[name])]
+    if bad:
+        raise ValueError(f"{path}: non-numeric feature columns {bad} (dtypes={df[bad].dtypes.astype(str).to_dict()})")
+
+
+def _parse(path: Path, columns: Optional[Sequence[str]] = None) -> pd.DataFrame:
+    suffix = path.suffix.lower()
+    if suffix == ".csv":
+        return pd.read_csv(path, usecols=list(columns) if columns is not None else None)
+    if suffix in (".parquet", ".pq"):
+        return pd.read_parquet(path, columns=list(columns) if columns is not None else None)
+    raise ValueError(f"Unsupported file type: {path.suffix} (use .csv, .parquet or .cols)")
+
+
+def _sidecar(path: Path, cache_dir: Path) -> Path:
+    """Returns the sidecar for path, parsing and writing it on a cache miss."""
+    digest = content_digest(path, cache_dir)
+    sidecar = cache_dir / f"{digest[:32]}.v{SIDECAR_VERSION}{COLUMNAR_SUFFIX}"
+    if (sidecar / SCHEMA_FILE).exists():
+        return sidecar
+
+    df = _parse(path)
+    validate_schema(df, path)
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    # Write into a temp dir and rename, so concurrent readers never see a partial sidecar.
+    tmp_dir = Path(tempfile.mkdtemp(prefix=".tmp-", dir=cache_dir))
+    try:
+        write_columnar(df, tmp_dir, downcast=False)
+        os.replace(tmp_dir, sidecar)
+    except OSError:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        if not (sidecar / SCHEMA_FILE).exists():
+            raise
+    return sidecar
+
+
+def load_dataset(
+    path: str | Path,
+    columns: Optional[Sequence[str]] = None,
+    *,
+    label_col: Optional[str] = None,
+    cache: bool = True,
+    cache_dir: str | Path | None = None,
+) -> pd.DataFrame:
+    """
+    Loads a .csv, .parquet or .cols dataset and validates the feature schema.
+
+    columns prunes what is loaded; with label_col and no columns, only the
+    model features plus the label are loaded. With cache=True (default)
+    CSV/Parquet files go through a content-hashed columnar sidecar under
+    cache_dir (default: "<data dir>/.incident_cache"), so repeat loads are
+    memory-mapped instead of re-parsed. Sidecars keep the parsed dtypes
+    (string columns such as the label included), so cached and uncached loads
+    return the same values and dtypes.
+    """
+    path = Path(path)
+    if not path.exists():
+        raise FileNotFoundError(f"Dataset not found: {path}")
+
+    if columns is None and label_col is not None:
+        columns = [*FEATURE_COLUMNS, label_col]
+
+    if is_columnar(path):
+        source = path
+    elif cache:
+        try:
+            source = _sidecar(path, Path(cache_dir) if cache_dir is not None else default_cache_dir(path))
+        except OSError:
+            source = None  # read-only data dir etc.: fall back to parsing
+    else:
+        source = None
+
+    if source is not None:
+        df = read_columnar(source, columns, restore_dtypes=True)
+    else:
+        df = _parse(path, columns)
+
+    if columns is None or all(name in columns for name in FEATURE_SCHEMA):
+        validate_schema(df, path, label_col)
+    return df
+
+
+# Stage modules historically exposed load_df; keep that name.
+load_df = load_dataset
+
+
+def iter_chunks(
+    path: str | Path,
+    chunk_rows: int,
+    columns: Optional[Sequence[str]] = None,
+    *,
+    label_col: Optional[str] = None,
+) -> Iterator[pd.DataFrame]:
+    """
+    Yields the dataset in chunks of at most chunk_rows rows with bounded memory:
+    CSV via read_csv(chunksize), Parquet by record batch, .cols as slices of
+    the memory map. Bypasses the sidecar cache (building one needs a full parse).
+    """
+    path = Path(path)
+    if not path.exists():
+        raise FileNotFoundError(f"Dataset not found: {path}")
+    if chunk_rows <= 0:
+        raise ValueError(f"chunk_rows must be > 0, got {chunk_rows}")
+
+    if columns is None and label_col is not None:
+        columns = [*FEATURE_COLUMNS, label_col]
+    usecols = list(columns) if columns is not None else None
+
+    suffix = path.suffix.lower()
+    if is_columnar(path):
+        # Slice the memory map first and restore string columns per chunk, so
+        # only one chunk's labels are ever materialized as objects.
+        schema = read_schema(path)
+        df = read_columnar(path, usecols)
+        chunks: Iterable[pd.DataFrame] = (
+            restore_source_dtypes(df.iloc[i : i + chunk_rows], schema) for i in range(0, len(df), chunk_rows)
+        )
+    elif suffix == ".csv":
+        chunks = pd.read_csv(path, usecols=usecols, chunksize=chunk_rows)
+    elif suffix in (".parquet", ".pq"):
+        import pyarrow.parquet as pq
+
+        batches = pq.ParquetFile(path).iter_batches(batch_size=chunk_rows, columns=usecols)
+        chunks = (batch.to_pandas() for batch in batches)
+    else:
+        raise ValueError(f"Unsupported file type: {path.suffix} (use .csv, .parquet or .cols)")
+
+    validate = columns is None or all(name in columns for name in FEATURE_SCHEMA)
+    for i, chunk in enumerate(chunks):
+        if i == 0 and validate:
+            validate_schema(chunk, path, label_col)
+        yield chunk
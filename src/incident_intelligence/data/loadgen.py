@@ -0,0 +1,229 @@
+from __future__ import annotations
+
+import socket
+import sys
+import time
+from dataclasses import dataclass
+from typing import Any, BinaryIO, Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+from incident_intelligence.data.generator import DEFAULT_ROOT_CAUSE_PROBS, generate_dataset_vectorized
+from incident_intelligence.data.mixtures import load_compiled_class_config
+
+
+ARRIVALS = ("poisson", "bursty", "uniform")
+FORMATS = ("jsonl", "arrow")
+
+
+@dataclass(frozen=True)
+class LoadGenConfig:
+    rate: float = 1000.0  # target incidents/s; 0 = as fast as possible
+    duration: Optional[float] = 10.0  # seconds; None = until max_events or interrupted
+    max_events: Optional[int] = None
+    arrivals: str = "poisson"
+    burst_size: float = 50.0  # mean incidents per burst (bursty arrivals)
+    fmt: str = "jsonl"
+    out: str = "-"  # "-" (stdout), a file or named pipe path, "unix:/path" or "tcp://host:port"
+    batch_size: int = 1000  # incidents generated per step
+    seed: int = 42
+    include_label: bool = True
+    label_col: str = "root_cause_label"
+
+
+# -------------------------
+# Arrival processes
+# -------------------------
+
+def arrival_gaps(n: int, cfg: LoadGenConfig, rng: np.random.Generator) -> np.ndarray:
+    """
+    Inter-arrival gaps (seconds) for the next n incidents; all processes have mean rate cfg.rate.
+      - poisson: exponential gaps
+      - bursty: bursts arrive as a Poisson process, geometric burst sizes
+      - uniform: evenly spaced
+    """
+    if cfg.rate <= 0:
+        return np.zeros(n)
+    if cfg.arrivals == "poisson":
+        return rng.exponential(1.0 / cfg.rate, n)
+    if cfg.arrivals == "uniform":
+        return np.full(n, 1.0 / cfg.rate)
+    if cfg.arrivals == "bursty":
+        burst_size = max(cfg.burst_size, 1.0)
+        starts_burst = rng.random(n) < 1.0 / burst_size
+        return np.where(starts_burst, rng.exponential(burst_size / cfg.rate, n), 0.0)
+    raise ValueError(f"Unknown arrivals: {cfg.arrivals} (use one of {ARRIVALS})")
+
+
+# -------------------------
+# Sinks / writers
+# -------------------------
+
+def _socket_sink(sock: socket.socket) -> BinaryIO:
+    """
+    A write file over sock that owns it: the socket is closed now, which only
+    takes effect once the file is closed too, so closing the file closes both.
+    """
+    sink = sock.makefile("wb")
+    sock.close()
+    return sink
+
+
+def open_sink(out: str) -> BinaryIO:
+    if out == "-":
+        return sys.stdout.buffer
+    if out.startswith("unix:"):
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            sock.connect(out[len("unix:"):])
+        except OSError:
+            sock.close()
+            raise
+        return _socket_sink(sock)
+    if out.startswith("tcp://"):
+        host, _, port = out[len("tcp://"):].rpartition(":")
+        return _socket_sink(socket.create_connection((host or "127.0.0.1", int(port))))
+    # Regular file or named pipe (opening a FIFO blocks until a reader attaches).
+    return open(out, "wb")
+
+
+class _JsonLinesWriter:
+    def __init__(self, sink: BinaryIO):
+        self.sink = sink
+
+    def write(self, df: pd.DataFrame) -> None:
+        text = df.to_json(orient="records", lines=True)
+        if not text.endswith("\n"):
+            text += "\n"
+        self.sink.write(text.encode("utf-8"))
+        self.sink.flush()
+
+    def close(self) -> None:
+        self.sink.flush()
+
+
+class _ArrowWriter:
+    def __init__(self, sink: BinaryIO):
+        try:
+            import pyarrow as pa
+        except ImportError as e:
+            raise ImportError("fmt='arrow' requires pyarrow (pip install pyarrow)") from e
+        self.pa = pa
+        self.sink = sink
+        self.writer = None
+
+    def write(self, df: pd.DataFrame) -> None:
+        batch = self.pa.RecordBatch.from_pandas(df, preserve_index=False)
+        if self.writer is None:
+            self.writer = self.pa.ipc.new_stream(self.sink, batch.schema)
+        self.writer.write_batch(batch)
+        self.sink.flush()
+
+    def close(self) -> None:
+        if self.writer is not None:
+            self.writer.close()
+        self.sink.flush()
+
+
+def make_writer(fmt: str, sink: BinaryIO):
+    if fmt == "jsonl":
+        return _JsonLinesWriter(sink)
+    if fmt == "arrow":
+        return _ArrowWriter(sink)
+    raise ValueError(f"Unknown format: {fmt} (use one of {FORMATS})")
+
+
+# -------------------------
+# Main loop
+# -------------------------
+
+def run_loadgen(
+    cfg: LoadGenConfig,
+    root_cause_probs: Dict[str, float] | None = None,
+    sink: BinaryIO | None = None,
+) -> Dict[str, Any]:
+    """
+    Emits synthetic incidents on a schedule drawn from the arrival process and
+    returns target vs achieved rate. Incidents are generated batch_size at a
+    time with the vectorized class-mixture engine; each row carries an
+    event_id and its scheduled epoch timestamp.
+    """
+    if cfg.duration is None and cfg.max_events is None and cfg.rate <= 0:
+        raise ValueError("Unthrottled load generation needs duration or max_events")
+
+    root_cause_probs = root_cause_probs or DEFAULT_ROOT_CAUSE_PROBS
+    class_config = load_compiled_class_config()
+    rng = np.random.default_rng(cfg.seed)
+
+    own_sink = sink is None
+    sink = sink if sink is not None else open_sink(cfg.out)
+    writer = make_writer(cfg.fmt, sink)
+
+    sent = 0  # incidents generated and scheduled
+    emitted = 0  # incidents actually written to the sink
+    max_lag = 0.0
+    next_offset = 0.0
+    wall_start = time.time()
+    start = time.perf_counter()
+
+    try:
+        while cfg.max_events is None or sent < cfg.max_events:
+            n = cfg.batch_size if cfg.max_events is None else min(cfg.batch_size, cfg.max_events - sent)
+            schedule = next_offset + np.cumsum(arrival_gaps(n, cfg, rng))
+            next_offset = float(schedule[-1])
+
+            if cfg.duration is not None:
+                if cfg.rate <= 0:
+                    if time.perf_counter() - start >= cfg.duration:
+                        break
+                else:
+                    n = int(np.searchsorted(schedule, cfg.duration, side="left"))
+                    if n == 0:
+                        break
+                    schedule = schedule[:n]
+
+            df = generate_dataset_vectorized(n, root_cause_probs, class_config, seed=rng)
+            if not cfg.include_label:
+                df = df.drop(columns=["root_cause_label"])
+            elif cfg.label_col != "root_cause_label":
+                df = df.rename(columns={"root_cause_label": cfg.label_col})
+            df.insert(0, "event_id", np.arange(sent, sent + n))
+            df.insert(1, "ts", wall_start + schedule)
+
+            # Write every incident whose scheduled time has passed; sleep until the next one is due.
+            i = 0
+            while i < n:
+                now = time.perf_counter() - start
+                due = int(np.searchsorted(schedule, now, side="right")) if cfg.rate > 0 else n
+                if due <= i:
+                    time.sleep(min(schedule[i] - now, 0.05))
+                    continue
+                # lag of the oldest incident in this write, i.e. how overdue it went out
+                if cfg.rate > 0:
+                    max_lag = max(max_lag, now - float(schedule[i]))
+                writer.write(df.iloc[i:due])
+                emitted += due - i
+                i = due
+
+            sent += n
+    except (BrokenPipeError, ConnectionResetError, KeyboardInterrupt):
+        pass
+    finally:
+        try:
+            writer.close()
+            if own_sink and sink is not sys.stdout.buffer:
+                sink.close()
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+    elapsed = time.perf_counter() - start
+    return {
+        "events": emitted,
+        "elapsed_sec": round(elapsed, 3),
+        "target_rate": cfg.rate,
+        "achieved_rate": round(emitted / elapsed, 1) if elapsed > 0 else 0.0,
+        "max_lag_sec": round(max_lag, 4),
+        "arrivals": cfg.arrivals,
+        "format": cfg.fmt,
+    }
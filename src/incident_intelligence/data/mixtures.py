@@ -0,0 +1,183 @@
+from __future__ import annotations
+
+import hashlib
+import json
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+
+from incident_intelligence.settings import get_settings
+
+
+@dataclass(frozen=True)
+class CompiledMixture:
+    """One metric's mixture as arrays: component k is picked when r < cum_probs[k]."""
+
+    probs: np.ndarray
+    cum_probs: np.ndarray
+    means: np.ndarray
+    stds: np.ndarray
+
+    @classmethod
+    def from_arrays(cls, probs, means, stds) -> "CompiledMixture":
+        probs = np.asarray(probs, dtype=float)
+        return cls(
+            probs=probs,
+            cum_probs=np.cumsum(probs),
+            means=np.asarray(means, dtype=float),
+            stds=np.asarray(stds, dtype=float),
+        )
+
+    @classmethod
+    def from_json(cls, mixture) -> "CompiledMixture":
+        return cls.from_arrays(
+            [prob for prob, _ in mixture],
+            [mean for _, (mean, _) in mixture],
+            [std for _, (_, std) in mixture],
+        )
+
+    def to_json(self):
+        return [[float(p), [float(m), float(s)]] for p, m, s in zip(self.probs, self.means, self.stds)]
+
+    def sample(self, values: np.ndarray, rng: np.random.Generator) -> np.ndarray:
+        """
+        Adds one mixture draw per row. Rows whose uniform draw falls past the
+        cumulative mass keep their value, like the scalar apply_mixture.
+        """
+        component = np.searchsorted(self.cum_probs, rng.random(len(values)), side="right")
+        hit = component < len(self.cum_probs)
+        component = np.minimum(component, len(self.cum_probs) - 1)
+        noise = rng.normal(self.means[component], self.stds[component])
+        return np.where(hit, values + noise, values)
+
+
+@dataclass(frozen=True)
+class CompiledClassConfig:
+    """class_config.json compiled to root_cause -> metric -> CompiledMixture."""
+
+    mixtures: Dict[str, Dict[str, CompiledMixture]]
+    digest: str = ""
+
+    def __getitem__(self, root_cause: str) -> Dict[str, CompiledMixture]:
+        return self.mixtures[root_cause]
+
+    def __contains__(self, root_cause: object) -> bool:
+        return root_cause in self.mixtures
+
+    def to_json(self) -> Dict[str, Any]:
+        """Back to the list-of-lists layout (used by the legacy per-row engine)."""
+        return {
+            root_cause: {metric: mixture.to_json() for metric, mixture in metric_mix.items()}
+            for root_cause, metric_mix in self.mixtures.items()
+        }
+
+
+def validate_configs(class_config):
+    for root_cause, metric_mix in class_config.items():
+        for metric, mixture in metric_mix.items():
+            total = sum(p for p, _ in mixture)
+            if not np.isclose(total, 1.0):
+                raise ValueError(
+                    f"config error: root_cause={root_cause} | metric={metric} | mixture probs sum to {total}"
+                )
+
+
+def compile_class_config(class_config: Dict[str, Any], digest: str = "") -> CompiledClassConfig:
+    validate_configs(class_config)
+    return CompiledClassConfig(
+        mixtures={
+            root_cause: {metric: CompiledMixture.from_json(mixture) for metric, mixture in metric_mix.items()}
+            for root_cause, metric_mix in class_config.items()
+        },
+        digest=digest,
+    )
+
+
+def as_compiled(class_config) -> CompiledClassConfig:
+    if isinstance(class_config, CompiledClassConfig):
+        return class_config
+    return compile_class_config(class_config)
+
+
+# -------------------------
+# On-disk .npz cache
+# -------------------------
+
+def _npz_path(cache_dir: Path, digest: str) -> Path:
+    return cache_dir / f"class_config.{digest[:16]}.npz"
+
+
+def _save_npz(compiled: CompiledClassConfig, path: Path) -> None:
+    arrays: Dict[str, np.ndarray] = {}
+    for root_cause, metric_mix in compiled.mixtures.items():
+        arrays[f"{root_cause}/"] = np.empty(0)  # keeps classes with no mixtures
+        for metric, mixture in metric_mix.items():
+            arrays[f"{root_cause}/{metric}/probs"] = mixture.probs
+            arrays[f"{root_cause}/{metric}/means"] = mixture.means
+            arrays[f"{root_cause}/{metric}/stds"] = mixture.stds
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(".tmp.npz")
+    np.savez(tmp_path, **arrays)
+    tmp_path.replace(path)
+
+
+def _load_npz(path: Path, digest: str) -> CompiledClassConfig:
+    mixtures: Dict[str, Dict[str, CompiledMixture]] = {}
+    with np.load(path) as npz:
+        for key in npz.files:
+            root_cause, _, rest = key.partition("/")
+            metric_mix = mixtures.setdefault(root_cause, {})
+            if not rest or not rest.endswith("/probs"):
+                continue
+            metric = rest[: -len("/probs")]
+            prefix = f"{root_cause}/{metric}"
+            metric_mix[metric] = CompiledMixture.from_arrays(
+                npz[f"{prefix}/probs"], npz[f"{prefix}/means"], npz[f"{prefix}/stds"]
+            )
+    return CompiledClassConfig(mixtures=mixtures, digest=digest)
+
+
+# -------------------------
+# In-process memo
+# -------------------------
+
+_COMPILED: Dict[Tuple[str, int, str], CompiledClassConfig] = {}
+
+
+def load_compiled_class_config(
+    path: str | Path | None = None,
+    *,
+    cache_dir: str | Path | None = None,
+) -> CompiledClassConfig:
+    """
+    Reads, validates and compiles class_config.json once per process.
+
+    Memoized on (resolved path, mtime, sha256 of the content), so edits to the
+    file are picked up. With cache_dir, the compiled arrays are also kept in a
+    content-addressed .npz so other processes skip JSON parsing and validation.
+    """
+    path = Path(path) if path is not None else get_settings().config_dir / "class_config.json"
+    if not path.exists():
+        raise FileNotFoundError(f"Class config not found: {path}")
+
+    content = path.read_bytes()
+    digest = hashlib.sha256(content).hexdigest()
+    key = (str(path.resolve()), path.stat().st_mtime_ns, digest)
+
+    compiled: Optional[CompiledClassConfig] = _COMPILED.get(key)
+    if compiled is not None:
+        return compiled
+
+    npz_path = _npz_path(Path(cache_dir), digest) if cache_dir is not None else None
+    if npz_path is not None and npz_path.exists():
+        compiled = _load_npz(npz_path, digest)
+    else:
+        compiled = compile_class_config(json.loads(content), digest=digest)
+        if npz_path is not None:
+            _save_npz(compiled, npz_path)
+
+    _COMPILED[key] = compiled
+    return compiled
@@ -0,0 +1,26 @@
+from __future__ import annotations
+
+from typing import Dict
+
+# The nine model features, in the column order the generator writes them.
+FEATURE_COLUMNS = [
+    "avg_cpu_usage",
+    "mem_growth",
+    "oom_log_count",
+    "request_rate",
+    "error_rate",
+    "latency",
+    "upstream_error_rate",
+    "dependency_latency",
+    "timeout_log_count",
+]
+
+COUNT_FEATURES = ["oom_log_count", "timeout_log_count"]
+FLOAT_FEATURES = [name for name in FEATURE_COLUMNS if name not in COUNT_FEATURES]
+
+LABEL_COL = "root_cause_label"
+
+# Declared kind of every feature: "float" (continuous metric) or "count" (log counts).
+FEATURE_SCHEMA: Dict[str, str] = {
+    name: "count" if name in COUNT_FEATURES else "float" for name in FEATURE_COLUMNS
+}
@@ -0,0 +1,239 @@
+from __future__ import annotations
+
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+from functools import lru_cache
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, Optional, Tuple
+
+from incident_intelligence.data.loader import content_digest
+from incident_intelligence.data.schema import FEATURE_SCHEMA
+
+if TYPE_CHECKING:
+    from sklearn.pipeline import Pipeline
+
+
+# A model artifact is "<name>.joblib" plus "<name>.manifest.json". "mmap"
+# artifacts are uncompressed joblib pickles whose numpy arrays load with
+# mmap_mode="r" (pages shared through the OS cache); "compressed" ones use
+# zlib for cold storage and load with a full read. libsvm-backed estimators
+# (SVC, NuSVC, ...) need writable arrays, so they are never memory-mapped.
+ARTIFACT_FORMATS = ("mmap", "compressed")
+MANIFEST_VERSION = 1
+MANIFEST_SUFFIX = ".manifest.json"
+_COMPRESS_LEVEL = 3
+
+
+def manifest_path(path: str | Path) -> Path:
+    path = Path(path)
+    return path.with_name(path.stem + MANIFEST_SUFFIX)
+
+
+def read_manifest(path: str | Path) -> Optional[Dict[str, Any]]:
+    """The artifact's manifest, or None for plain joblib files saved before manifests existed."""
+    try:
+        return json.loads(manifest_path(path).read_text())
+    except (OSError, ValueError):
+        return None
+
+
+def _mmap_safe(model: Any) -> bool:
+    """False when model (or a pipeline step) is libsvm-backed: its predict_proba rejects read-only arrays."""
+    from sklearn.svm._base import BaseLibSVM
+
+    parts = [model, *model.get_params(deep=True).values()] if hasattr(model, "get_params") else [model]
+    return not any(isinstance(part, BaseLibSVM) for part in parts)
+
+
+def _describe(model: Any) -> Dict[str, Any]:
+    steps = getattr(model, "steps", None)
+    classes = getattr(model, "classes_", None)
+    return {
+        "model_class": type(model).__name__,
+        "steps": [[name, type(step).__name__] for name, step in steps] if steps else None,
+        "classes": [c.item() if hasattr(c, "item") else c for c in classes] if classes is not None else None,
+        "feature_names": [str(c) for c in getattr(model, "feature_names_in_", [])] or None,
+    }
+
+
+def save_artifact(
+    model: Any,
+    path: str | Path,
+    *,
+    fmt: str = "mmap",
+    metadata: Optional[Dict[str, Any]] = None,
+) -> Path:
+    """
+    Writes model + manifest (format, size, blake2b, feature schema, library
+    versions). Both files are written to temp names and renamed, manifest
+    first, so readers and hardlinks to a previous version never see a partial
+    file and a watcher that sees the new model also sees its manifest.
+    """
+    import joblib
+
+    from incident_intelligence.modeling.cache import atomic_write_text, library_versions
+
+    if fmt not in ARTIFACT_FORMATS:
+        raise ValueError(f"Unknown artifact format: {fmt} (use one of {ARTIFACT_FORMATS})")
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(prefix=".tmp-", dir=path.parent)
+    os.close(fd)
+    try:
+        joblib.dump(model, tmp, compress=("zlib", _COMPRESS_LEVEL) if fmt == "compressed" else 0)
+        manifest = {
+            "manifest_version": MANIFEST_VERSION,
+            "file": path.name,
+            "format": fmt,
+            "mmap": fmt == "mmap" and _mmap_safe(model),
+            "size_bytes": os.path.getsize(tmp),
+            "blake2b": content_digest(tmp),
+            "created_at": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            **_describe(model),
+            "feature_schema": FEATURE_SCHEMA,
+            "versions": library_versions(),
+            **({"metadata": metadata} if metadata else {}),
+        }
+        atomic_write_text(manifest_path(path), json.dumps(manifest, indent=2, default=str))
+        os.replace(tmp, path)
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+    return path
+
+
+def artifact_version(path: str | Path) -> str:
+    """
+    Short id of the artifact currently at path: its manifest hash, or a
+    size/mtime stamp for files without a (matching) manifest.
+    """
+    path = Path(path)
+    st = path.stat()
+    manifest = read_manifest(path)
+    if manifest and manifest.get("size_bytes") == st.st_size:
+        return manifest["blake2b"][:12]
+    return f"{st.st_size:x}-{st.st_mtime_ns:x}"
+
+
+def verify_artifact(path: str | Path) -> None:
+    """Raises ValueError when the file no longer matches its manifest's size or hash."""
+    path = Path(path)
+    manifest = read_manifest(path)
+    if manifest is None:
+        raise FileNotFoundError(f"Artifact manifest not found: {manifest_path(path)}")
+    size = path.stat().st_size
+    if size != manifest["size_bytes"]:
+        raise ValueError(f"{path}: size {size} != manifest size {manifest['size_bytes']}")
+    digest = content_digest(path)
+    if digest != manifest["blake2b"]:
+        raise ValueError(f"{path}: blake2b {digest[:16]}... != manifest {manifest['blake2b'][:16]}...")
+
+
+def load_artifact(path: str | Path, *, mmap: bool = True, verify: bool = False) -> Any:
+    """
+    Loads an artifact; "mmap" artifacts (and uncompressed legacy files) are
+    memory-mapped unless they hold a libsvm-backed estimator.
+    """
+    import joblib
+
+    path = Path(path)
+    if not path.exists():
+        raise FileNotFoundError(f"Model not found: {path}")
+    if verify:
+        verify_artifact(path)
+    manifest = read_manifest(path) or {}
+    # joblib ignores mmap_mode for compressed files, so legacy files are safe either way.
+    mmap = mmap and manifest.get("format") != "compressed" and manifest.get("mmap", True)
+    model = joblib.load(path, mmap_mode="r" if mmap else None)
+    if mmap and not _mmap_safe(model):
+        # legacy file / manifest without the "mmap" flag: reload with writable arrays
+        model = joblib.load(path)
+    return model
+
+
+def link_artifact(src: str | Path, dst: str | Path) -> Path:
+    """
+    Points dst at the same artifact as src without re-serializing: a hardlink
+    (falling back to a copy across filesystems), manifest included.
+    """
+    src, dst = Path(src), Path(dst)
+    if not src.exists():
+        raise FileNotFoundError(f"Model not found: {src}")
+    dst.parent.mkdir(parents=True, exist_ok=True)
+
+    # manifest first (see save_artifact)
+    pairs = [(src, dst)]
+    if manifest_path(src).exists():
+        pairs.insert(0, (manifest_path(src), manifest_path(dst)))
+    for s, d in pairs:
+        if d.exists() and os.path.samefile(s, d):
+            continue
+        tmp = d.with_name(f".tmp-{os.getpid()}-{d.name}")
+        tmp.unlink(missing_ok=True)
+        try:
+            os.link(s, tmp)
+        except OSError:
+            shutil.copy2(s, tmp)
+        os.replace(tmp, d)
+    return dst
+
+
+class ModelRegistry:
+    """
+    Process-level cache of loaded artifacts: each file is deserialized once
+    and reloaded only when it changes on disk (size / mtime / inode).
+    """
+
+    def __init__(self, *, mmap: bool = True):
+        self.mmap = mmap
+        self._models: Dict[Path, Tuple[Tuple[int, int, int], Any]] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _stamp(path: Path) -> Tuple[int, int, int]:
+        st = path.stat()
+        return st.st_size, st.st_mtime_ns, st.st_ino
+
+    def get(self, path: str | Path) -> Any:
+        path = Path(path).resolve()
+        if not path.exists():
+            raise FileNotFoundError(f"Model not found: {path}")
+        stamp = self._stamp(path)
+        with self._lock:
+            cached = self._models.get(path)
+            if cached is not None and cached[0] == stamp:
+                return cached[1]
+            model = load_artifact(path, mmap=self.mmap)
+            self._models[path] = (stamp, model)
+            return model
+
+    def evict(self, path: str | Path) -> None:
+        with self._lock:
+            self._models.pop(Path(path).resolve(), None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._models.clear()
+
+    def __len__(self) -> int:
+        return len(self._models)
+
+
+@lru_cache(maxsize=None)
+def default_registry() -> ModelRegistry:
+    return ModelRegistry()
+
+
+def load_pipeline(path: str | Path) -> Pipeline:
+    """A Pipeline artifact through the process-level registry."""
+    from sklearn.pipeline import Pipeline
+
+    model = default_registry().get(path)
+    if not isinstance(model, Pipeline):
+        raise TypeError(f"Expected sklearn Pipeline, got {type(model)}")
+    return model
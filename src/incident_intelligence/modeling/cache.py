@@ -0,0 +1,260 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import platform
+import shutil
+import tempfile
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+# Content-addressed store for training results, laid out as
+#   <root>/families/<key[:2]>/<key>/{pipeline.joblib, result.json}
+#   <root>/trials/<key[:2]>/<key>.json
+# Keys are blake2b digests of everything that determines the result (data
+# content, estimator + params, grid, CV/search settings, library versions),
+# so entries never need invalidation; stale ones are just never looked up.
+
+
+def digest(obj: Any) -> str:
+    payload = json.dumps(obj, sort_keys=True, separators=(",", ":"), default=repr)
+    return hashlib.blake2b(payload.encode("utf-8"), digest_size=20).hexdigest()
+
+
+@lru_cache(maxsize=None)
+def library_versions() -> Dict[str, str]:
+    import joblib
+    import scipy
+    import sklearn
+
+    return {
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "scipy": scipy.__version__,
+        "sklearn": sklearn.__version__,
+        "joblib": joblib.__version__,
+    }
+
+
+def dataset_fingerprint(X: pd.DataFrame, y: Optional[pd.Series] = None) -> str:
+    """Digest of column names, dtypes and row values (index ignored)."""
+    h = hashlib.blake2b(digest_size=20)
+    h.update(json.dumps([[str(c), str(X[c].dtype)] for c in X.columns]).encode())
+    h.update(pd.util.hash_pandas_object(X, index=False).to_numpy().tobytes())
+    if y is not None:
+        h.update(pd.util.hash_pandas_object(pd.Series(np.asarray(y, dtype=object)), index=False).to_numpy().tobytes())
+    return h.hexdigest()
+
+
+def canonical(value: Any) -> Any:
+    """JSON-able description of an estimator (class + params, recursively) or plain value."""
+    if hasattr(value, "get_params") and not isinstance(value, type):
+        cls = type(value)
+        params = value.get_params(deep=False)
+        return {"class": f"{cls.__module__}.{cls.__qualname__}", "params": {k: canonical(params[k]) for k in sorted(params)}}
+    if isinstance(value, dict):
+        return {str(k): canonical(v) for k, v in sorted(value.items(), key=lambda kv: str(kv[0]))}
+    if isinstance(value, (list, tuple)):
+        return [canonical(v) for v in value]
+    if isinstance(value, np.generic):
+        return value.item()
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    return repr(value)
+
+
+def atomic_write_text(path: str | Path, text: str) -> None:
+    """Writes text to a temp file next to path and renames it over path, so readers never see a partial file."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(prefix=".tmp-", dir=path.parent)
+    try:
+        with os.fdopen(fd, "w") as f:
+            f.write(text)
+        os.replace(tmp, path)
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+
+
+class TrialStore:
+    """
+    Per-(candidate, fold) CV results. get() returns None on a miss; put()
+    stores a small JSON record ({"score", "fit_time", "score_time"}).
+    """
+
+    def __init__(self, root: str | Path):
+        self.root = Path(root)
+
+    def _path(self, key: str) -> Path:
+        return self.root / key[:2] / f"{key}.json"
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        try:
+            return json.loads(self._path(key).read_text())
+        except (OSError, ValueError):
+            return None
+
+    def put(self, key: str, record: Dict[str, Any]) -> None:
+        try:
+            atomic_write_text(self._path(key), json.dumps(record))
+        except OSError:
+            pass  # caching is best effort
+
+
+class TrainingCache:
+    """Fitted pipelines + their result entries per family key, plus a TrialStore."""
+
+    def __init__(self, root: str | Path):
+        self.root = Path(root)
+        self.trials = TrialStore(self.root / "trials")
+
+    def _dir(self, key: str) -> Path:
+        return self.root / "families" / key[:2] / key
+
+    def get_family(self, key: str) -> Optional[Tuple[Any, Dict[str, Any]]]:
+        import joblib
+
+        entry_dir = self._dir(key)
+        try:
+            result = json.loads((entry_dir / "result.json").read_text())
+            return joblib.load(entry_dir / "pipeline.joblib"), result
+        except (OSError, ValueError, EOFError):
+            return None
+
+    def put_family(self, key: str, pipeline: Any, result: Dict[str, Any]) -> None:
+        import joblib
+
+        entry_dir = self._dir(key)
+        if (entry_dir / "result.json").exists():
+            return
+        entry_dir.parent.mkdir(parents=True, exist_ok=True)
+        tmp_dir = Path(tempfile.mkdtemp(prefix=".tmp-", dir=entry_dir.parent))
+        try:
+            joblib.dump(pipeline, tmp_dir / "pipeline.joblib")
+            (tmp_dir / "result.json").write_text(json.dumps(result, indent=2, default=repr))
+            os.replace(tmp_dir, entry_dir)
+        except OSError:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    def has_family(self, key: str) -> bool:
+        return (self._dir(key) / "result.json").exists()
+
+    def link_family(self, key: str, source: TrainingCache) -> bool:
+        """
+        Adds source's entry for key without re-serializing the pipeline: its
+        files are hardlinked (copied across filesystems). False if source has no entry.
+        """
+        entry_dir, src_dir = self._dir(key), source._dir(key)
+        if self.has_family(key):
+            return True
+        if not source.has_family(key):
+            return False
+        entry_dir.parent.mkdir(parents=True, exist_ok=True)
+        tmp_dir = Path(tempfile.mkdtemp(prefix=".tmp-", dir=entry_dir.parent))
+        try:
+            for name in ("pipeline.joblib", "result.json"):
+                try:
+                    os.link(src_dir / name, tmp_dir / name)
+                except OSError:
+                    shutil.copy2(src_dir / name, tmp_dir / name)
+            os.replace(tmp_dir, entry_dir)
+        except OSError:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            return False
+        return True
+
+
+class ChainedCache:
+    """
+    Several TrainingCaches read in order (first hit wins) and all written to,
+    e.g. the shared content-addressed cache plus one run's journal. A family
+    is serialized once; the other caches hardlink that entry.
+    """
+
+    def __init__(self, caches: Sequence[TrainingCache]):
+        self.caches = list(caches)
+        self.trials = _ChainedTrialStore([c.trials for c in self.caches])
+
+    def get_family(self, key: str) -> Optional[Tuple[Any, Dict[str, Any]]]:
+        for cache in self.caches:
+            hit = cache.get_family(key)
+            if hit is not None:
+                return hit
+        return None
+
+    def put_family(self, key: str, pipeline: Any, result: Dict[str, Any]) -> None:
+        source: Optional[TrainingCache] = None
+        for cache in self.caches:
+            if source is not None and cache.link_family(key, source):
+                continue
+            cache.put_family(key, pipeline, result)
+            if source is None and cache.has_family(key):
+                source = cache
+
+
+class _ChainedTrialStore:
+    def __init__(self, stores: Sequence[TrialStore]):
+        self.stores = list(stores)
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        for store in self.stores:
+            record = store.get(key)
+            if record is not None:
+                return record
+        return None
+
+    def put(self, key: str, record: Dict[str, Any]) -> None:
+        for store in self.stores:
+            store.put(key, record)
+
+
+def family_key(
+    pipeline: Any,
+    param_grid: Dict[str, Any],
+    train_fp: str,
+    val_fp: str,
+    cfg: Any,
+) -> str:
+    return digest(
+        {
+            "kind": "family",
+            "pipeline": canonical(pipeline),
+            "param_grid": canonical(param_grid),
+            "train": train_fp,
+            "val": val_fp,
+            "search": search_settings(cfg),
+            "versions": library_versions(),
+        }
+    )
+
+
+def search_settings(cfg: Any) -> Dict[str, Any]:
+    """The BaselineTrainConfig fields that can change search results."""
+    settings = {
+        "label_col": cfg.label_col,
+        "cv": cfg.cv,
+        # the shared scheduler and GridSearchCV ("sequential") are cached apart
+        "scheduler": cfg.scheduler,
+        "search": cfg.search,
+        "halving_factor": cfg.halving_factor,
+        "budget_sec": cfg.budget_sec,
+        "warm_start_paths": cfg.warm_start_paths,
+        "approximate_paths": cfg.approximate_paths,
+        "random_state": cfg.random_state,
+    }
+    if cfg.search == "coreset":
+        # Only added for coreset searches, so existing keys stay valid.
+        settings.update(
+            coreset_size=cfg.coreset_size,
+            coreset_method=cfg.coreset_method,
+            coreset_check=cfg.coreset_check,
+        )
+    return settings
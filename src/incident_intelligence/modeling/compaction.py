@@ -0,0 +1,282 @@
+from __future__ import annotations
+
+import json
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from incident_intelligence.modeling.artifacts import load_artifact, save_artifact
+from incident_intelligence.modeling.cache import atomic_write_text
+from incident_intelligence.modeling.compiled import DEFAULT_COMPILED_DIR, CompiledForest, _fold_scaler, compile_pipeline
+
+if TYPE_CHECKING:
+    from sklearn.pipeline import Pipeline
+
+
+# Post-training compaction of forest pipelines into a smaller CompiledForest:
+# low-support splits are pruned, identical subtrees (within and across trees)
+# are stored once, thresholds become float32 and leaf class distributions
+# integer levels. The result is only kept if val accuracy / macro-F1 stay
+# within the configured tolerance of the original pipeline.
+
+
+@dataclass(frozen=True)
+class CompactionConfig:
+    # A split is kept only if both children saw at least this many (in-bag)
+    # training samples; otherwise the node becomes a leaf with its own
+    # class distribution. 1 = no pruning.
+    min_leaf_samples: int = 5
+    leaf_bits: int = 8  # 8 / 16: leaf distributions as uint8 / uint16 levels; 0 = keep float64
+    float32_thresholds: bool = True  # ignored (float64) when a StandardScaler is folded in
+    merge_subtrees: bool = True
+    max_accuracy_drop: float = 0.005
+    max_f1_drop: float = 0.01
+
+
+_LEVEL_DTYPES = {8: np.uint8, 16: np.uint16}
+
+
+def _float32_down(t: np.ndarray) -> np.ndarray:
+    """Largest float32 <= t. For float32 inputs x, x <= t  <=>  x <= _float32_down(t), so no split moves."""
+    t32 = t.astype(np.float32)
+    over = t32.astype(np.float64) > t
+    t32[over] = np.nextafter(t32[over], np.float32(-np.inf))
+    return t32
+
+
+def _kept_nodes(tree: Any, min_leaf_samples: int) -> Tuple[np.ndarray, np.ndarray]:
+    """(split_ok mask, reachable node ids in breadth-first order) after support pruning."""
+    left, right, support = tree.children_left, tree.children_right, tree.n_node_samples
+    internal = left != -1
+    split_ok = internal.copy()
+    split_ok[internal] = (support[left[internal]] >= min_leaf_samples) & (support[right[internal]] >= min_leaf_samples)
+
+    levels = [np.zeros(1, dtype=np.int64)]
+    while True:
+        splits = levels[-1][split_ok[levels[-1]]]
+        if not len(splits):
+            return split_ok, np.concatenate(levels)
+        levels.append(np.column_stack([left[splits], right[splits]]).ravel())
+
+
+def compact_pipeline(pipeline: Pipeline, cfg: CompactionConfig) -> CompiledForest:
+    """
+    Compacts a fitted [StandardScaler ->] RandomForest / ExtraTrees /
+    DecisionTree pipeline. Nodes are hash-consed bottom-up, so equal subtrees
+    share one pair of child entries and a split whose two subtrees are equal
+    collapses into that subtree.
+    """
+    from sklearn.ensemble import ExtraTreesClassifier, RandomForestClassifier
+    from sklearn.tree import DecisionTreeClassifier
+
+    steps = [step for _, step in pipeline.steps] if hasattr(pipeline, "steps") else [pipeline]
+    clf = steps[-1]
+    if not isinstance(clf, (RandomForestClassifier, ExtraTreesClassifier, DecisionTreeClassifier)):
+        raise ValueError(f"Only forest pipelines can be compacted, got {type(clf).__name__}")
+    if cfg.leaf_bits and cfg.leaf_bits not in _LEVEL_DTYPES:
+        raise ValueError(f"leaf_bits must be 0, 8 or 16, got {cfg.leaf_bits}")
+    names = getattr(pipeline, "feature_names_in_", None)
+    if names is None:
+        raise ValueError("Pipeline was not fit on a DataFrame; feature names are needed to compact it")
+
+    n_features = int(clf.n_features_in_)
+    n_classes = len(clf.classes_)
+    mean, scale = _fold_scaler(steps[0], n_features) if len(steps) == 2 else (None, None)
+    levels = (1 << cfg.leaf_bits) - 1 if cfg.leaf_bits else None
+    # Rounding down to float32 only preserves splits for float32 input; with a
+    # folded scaler the input stays float64, so thresholds do too.
+    float32_thresholds = cfg.float32_thresholds and mean is None
+    estimators = [clf] if isinstance(clf, DecisionTreeClassifier) else list(clf.estimators_)
+
+    # Entries are array slots; every internal entry's children are the pair
+    # of slots at child / child + 1. A node (node_id) may appear in several
+    # slots, but its subtree is stored once.
+    feature: List[int] = []
+    threshold: List[float] = []
+    child: List[int] = []
+    missing_right: List[bool] = []
+    value: List[np.ndarray] = []
+
+    node_ids: Dict[Any, int] = {}
+    nodes: List[Tuple[int, float, bool, int, Optional[np.ndarray]]] = []  # (feature, thr, missing_right, child pair, leaf value)
+    depth: List[int] = []
+    pairs: Dict[Tuple[int, int], int] = {}
+    root_slots: Dict[int, int] = {}
+    roots: List[int] = []
+    zero = np.zeros(n_classes, dtype=_LEVEL_DTYPES.get(cfg.leaf_bits, np.float64))
+
+    def node_id(key: Any, node: Tuple[int, float, bool, int, Optional[np.ndarray]], node_depth: int) -> int:
+        if not cfg.merge_subtrees:
+            key = len(nodes)
+        found = node_ids.get(key)
+        if found is None:
+            found = node_ids[key] = len(nodes)
+            nodes.append(node)
+            depth.append(node_depth)
+        return found
+
+    def emit(nid: int) -> int:
+        f, thr, mr, pair, leaf = nodes[nid]
+        slot = len(feature)
+        feature.append(f)
+        threshold.append(thr)
+        child.append(slot if pair < 0 else pair)
+        missing_right.append(mr)
+        value.append(zero if leaf is None else leaf)
+        return slot
+
+    for est in estimators:
+        tree = est.tree_
+        split_ok, order = _kept_nodes(tree, cfg.min_leaf_samples)
+
+        dist = tree.value[:, 0, :n_classes].astype(np.float64)
+        norm = dist.sum(axis=1, keepdims=True)
+        norm[norm == 0.0] = 1.0
+        dist /= norm
+        if levels is not None:
+            dist = np.rint(dist * levels).astype(_LEVEL_DTYPES[cfg.leaf_bits])
+
+        feat = np.maximum(tree.feature, 0)
+        thr = tree.threshold.astype(np.float64)
+        if mean is not None:
+            thr = thr * scale[feat] + mean[feat]
+        if float32_thresholds:
+            thr = _float32_down(thr)
+        mgl = getattr(tree, "missing_go_to_left", None)
+        mgl = np.zeros(tree.node_count, dtype=bool) if mgl is None else np.asarray(mgl, dtype=bool)
+
+        ids: Dict[int, int] = {}
+        for n in order[::-1].tolist():  # children before parents
+            if not split_ok[n]:
+                leaf = dist[n]
+                ids[n] = node_id(("L", leaf.tobytes()), (0, np.inf, False, -1, leaf), 0)
+                continue
+            lid, rid = ids[tree.children_left[n]], ids[tree.children_right[n]]
+            if cfg.merge_subtrees and lid == rid:
+                ids[n] = lid  # both branches predict the same way: drop the split
+                continue
+            if (lid, rid) not in pairs:
+                pairs[(lid, rid)] = emit(lid)
+                emit(rid)
+            key = ("S", int(feat[n]), float(thr[n]), bool(~mgl[n]), lid, rid)
+            ids[n] = node_id(key, (int(feat[n]), float(thr[n]), bool(~mgl[n]), pairs[(lid, rid)], None), 1 + max(depth[lid], depth[rid]))
+
+        root = ids[0]
+        if root not in root_slots or not cfg.merge_subtrees:
+            root_slots[root] = emit(root)
+        roots.append(root_slots[root])
+
+    float_dtype = np.float32 if float32_thresholds else np.float64
+    return CompiledForest(
+        kind="forest",
+        classes_=np.asarray(clf.classes_),
+        feature_names_in_=np.asarray(names, dtype=object),
+        feature=np.asarray(feature, dtype=np.int32),
+        threshold=np.asarray(threshold, dtype=float_dtype),
+        child=np.asarray(child, dtype=np.int32),
+        missing_right=np.asarray(missing_right, dtype=bool),
+        value=np.ascontiguousarray(np.stack(value)),
+        roots=np.asarray(roots, dtype=np.int32),
+        max_depth=int(max(depth[nid] for nid in root_slots)),
+        float32_input=mean is None,
+        quantized=levels is not None,
+    )
+
+
+def _scores(y_true: pd.Series, y_pred: np.ndarray) -> Dict[str, float]:
+    from sklearn.metrics import accuracy_score, f1_score
+
+    return {
+        "accuracy": float(accuracy_score(y_true, y_pred)),
+        "f1_macro": float(f1_score(y_true, y_pred, average="macro", zero_division=0)),
+    }
+
+
+def _median_sec(fn: Any, repeats: int) -> float:
+    fn()  # warm-up
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return float(np.median(times))
+
+
+def compact_artifact(
+    model_path: str | Path,
+    X_val: pd.DataFrame,
+    y_val: pd.Series,
+    cfg: CompactionConfig,
+    *,
+    out_path: Optional[str | Path] = None,
+    report_out: Optional[str | Path] = None,
+    repeats: int = 20,
+) -> Dict[str, Any]:
+    """
+    Compacts a saved forest pipeline and reports size / load time / predict
+    latency against the original artifact and the val accuracy / macro-F1
+    delta. The compacted artifact (default: artifacts/compiled/<stem>.compact.joblib)
+    is only written when both drops are within cfg's tolerance; report["accepted"]
+    says whether it was.
+    """
+    model_path = Path(model_path)
+    pipeline = load_artifact(model_path, mmap=False)
+    exact = compile_pipeline(pipeline)
+
+    start = time.perf_counter()
+    compacted = compact_pipeline(pipeline, cfg)
+    compact_sec = time.perf_counter() - start
+
+    before = _scores(y_val, pipeline.predict(X_val))
+    after = _scores(y_val, compacted.predict(X_val))
+    accuracy_drop = before["accuracy"] - after["accuracy"]
+    f1_drop = before["f1_macro"] - after["f1_macro"]
+    accepted = accuracy_drop <= cfg.max_accuracy_drop and f1_drop <= cfg.max_f1_drop
+
+    report: Dict[str, Any] = {
+        "model": str(model_path),
+        "config": asdict(cfg),
+        "accepted": accepted,
+        "compact_sec": round(compact_sec, 3),
+        "n_trees": compacted.n_trees,
+        "nodes": {"before": len(exact.feature), "after": len(compacted.feature)},
+        "max_depth": {"before": exact.max_depth, "after": compacted.max_depth},
+        "val": {
+            "n_rows": len(X_val),
+            "before": before,
+            "after": after,
+            "accuracy_drop": accuracy_drop,
+            "f1_macro_drop": f1_drop,
+        },
+    }
+
+    if accepted:
+        out_path = Path(out_path) if out_path else Path(DEFAULT_COMPILED_DIR) / f"{model_path.stem}.compact.joblib"
+        save_artifact(compacted, out_path, metadata={"source": str(model_path), "compaction": asdict(cfg)})
+        row = X_val.iloc[:1]
+        report["out"] = str(out_path)
+        report["size_bytes"] = {"before": model_path.stat().st_size, "after": out_path.stat().st_size}
+        report["load_sec"] = {
+            "before": _median_sec(lambda: load_artifact(model_path), max(repeats // 4, 3)),
+            "after": _median_sec(lambda: load_artifact(out_path), max(repeats // 4, 3)),
+        }
+        report["predict_single_ms"] = {
+            "sklearn": _median_sec(lambda: pipeline.predict_proba(row), repeats) * 1000,
+            "compiled": _median_sec(lambda: exact.predict_proba(row), repeats) * 1000,
+            "compacted": _median_sec(lambda: compacted.predict_proba(row), repeats) * 1000,
+        }
+        report["predict_batch_ms"] = {
+            "sklearn": _median_sec(lambda: pipeline.predict_proba(X_val), max(repeats // 4, 3)) * 1000,
+            "compiled": _median_sec(lambda: exact.predict_proba(X_val), max(repeats // 4, 3)) * 1000,
+            "compacted": _median_sec(lambda: compacted.predict_proba(X_val), max(repeats // 4, 3)) * 1000,
+        }
+
+    if report_out:
+        report_out = Path(report_out)
+        report_out.parent.mkdir(parents=True, exist_ok=True)
+        atomic_write_text(report_out, json.dumps(report, indent=2))
+    return report
@@ -0,0 +1,305 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from incident_intelligence.modeling.artifacts import load_artifact, save_artifact
+
+if TYPE_CHECKING:
+    from sklearn.pipeline import Pipeline
+
+
+# Tree ensembles flattened into one set of node arrays for all trees. A batch
+# is scored by walking every (row, tree) pair one level per step with numpy
+# gathers, instead of sklearn's per-estimator Python dispatch (and, for
+# RandomForest, a joblib thread pool even for a single row). That overhead is
+# what dominates single incidents and small batches; for batches of thousands
+# of rows sklearn's Cython traversal is faster, so use this for online scoring.
+COMPILED_KINDS = ("forest", "gb")
+DEFAULT_COMPILED_DIR = "artifacts/compiled"
+
+# Rows per traversal chunk are chosen so rows * n_trees stays below this, which
+# bounds the (rows, trees) index arrays to a few tens of MB.
+_MAX_CELLS = 1 << 18
+_COMPACT_EVERY = 4
+
+
+@dataclass(frozen=True)
+class CompiledForest:
+    """
+    Packed nodes of all trees, numbered breadth-first per tree so siblings are
+    adjacent: one step is idx = child[idx] + (x > threshold[idx]). Leaves point
+    to themselves (threshold=+inf), so max_depth steps land every (row, tree)
+    pair on its leaf without branching.
+      forest: value = per-tree class probabilities, averaged over trees.
+      gb:     value = regression leaf * learning_rate; trees are stage-major
+              (stage * n_trees_per_stage + class), summed onto init_raw.
+    """
+
+    kind: str
+    classes_: np.ndarray
+    feature_names_in_: np.ndarray
+    feature: np.ndarray  # int64 (n_nodes,)
+    threshold: np.ndarray  # float64 (n_nodes,), in unscaled feature units when a scaler was folded in
+    child: np.ndarray  # int64 (n_nodes,): global index of the left child; the right child is child + 1
+    missing_right: np.ndarray  # bool (n_nodes,): NaN goes to the right child
+    value: np.ndarray  # float64 (n_nodes, n_classes) forest / (n_nodes,) gb
+    roots: np.ndarray  # int64 (n_trees,)
+    max_depth: int
+    float32_input: bool  # sklearn trees see float32 X; False once a scaler is folded in
+    init_raw: Optional[np.ndarray] = None  # gb: (n_trees_per_stage,)
+    loss: Optional[str] = None  # gb: "log_loss" | "exponential"
+    # forest: value holds integer levels (see modeling.compaction); the tree
+    # sums are renormalized per row instead of divided by n_trees
+    quantized: bool = False
+
+    @property
+    def n_trees(self) -> int:
+        return len(self.roots)
+
+    def _as_array(self, X: pd.DataFrame | np.ndarray) -> np.ndarray:
+        if isinstance(X, pd.DataFrame):
+            missing = [c for c in self.feature_names_in_ if c not in X.columns]
+            if missing:
+                raise ValueError(f"Input is missing feature columns: {missing}")
+            X = X[list(self.feature_names_in_)].to_numpy()
+        X = np.asarray(X, dtype=np.float32 if self.float32_input else np.float64)
+        if X.ndim != 2 or X.shape[1] != len(self.feature_names_in_):
+            raise ValueError(f"Expected {len(self.feature_names_in_)} features, got shape {X.shape}")
+        if self.kind == "gb" and np.isnan(X).any():
+            # same as sklearn: GradientBoostingClassifier has no missing-value routing
+            raise ValueError("Input X contains NaN (GradientBoosting models do not accept missing values)")
+        return np.ascontiguousarray(X, dtype=np.float64)
+
+    def apply(self, X: pd.DataFrame | np.ndarray) -> np.ndarray:
+        """Leaf node index (global) of every tree for every row, shape (n_rows, n_trees)."""
+        return self._apply(self._as_array(X))
+
+    def _apply(self, X: np.ndarray) -> np.ndarray:
+        n_rows, n_features = X.shape
+        flat = X.ravel()
+        has_nan = bool(np.isnan(flat).any())
+        # One entry per (row, tree) pair; pairs that reached a leaf are dropped
+        # every few steps, which pays off for deep, unbalanced forests.
+        rows = np.repeat(np.arange(n_rows, dtype=np.int64) * n_features, self.n_trees)
+        idx = np.tile(self.roots, n_rows)
+        pos = None
+        out = None
+        for step in range(self.max_depth):
+            x = np.take(flat, np.take(self.feature, idx) + rows)
+            go_right = x > np.take(self.threshold, idx)
+            if has_nan:
+                go_right |= np.isnan(x) & np.take(self.missing_right, idx)
+            idx = np.take(self.child, idx) + go_right
+            if step % _COMPACT_EVERY == _COMPACT_EVERY - 1 and step < self.max_depth - 1:
+                active = np.take(self.child, idx) != idx
+                if out is None:
+                    out, pos = idx.copy(), np.arange(len(idx))
+                else:
+                    out[pos] = idx
+                pos, rows, idx = pos[active], rows[active], idx[active]
+        if out is None:
+            return idx.reshape(n_rows, self.n_trees)
+        out[pos] = idx
+        return out.reshape(n_rows, self.n_trees)
+
+    def _proba(self, X: np.ndarray) -> np.ndarray:
+        leaves = self._apply(X)
+        if self.kind == "forest":
+            if self.quantized:
+                proba = np.take(self.value, leaves, axis=0).sum(axis=1, dtype=np.float64)
+                return proba / proba.sum(axis=1, keepdims=True)
+            return np.take(self.value, leaves, axis=0).sum(axis=1) / self.n_trees
+
+        n_per_stage = len(self.init_raw)
+        raw = self.init_raw + np.take(self.value, leaves).reshape(len(X), -1, n_per_stage).sum(axis=1)
+        if n_per_stage == 1:
+            p1 = 1.0 / (1.0 + np.exp(-(2.0 * raw[:, 0] if self.loss == "exponential" else raw[:, 0])))
+            return np.column_stack([1.0 - p1, p1])
+        raw -= raw.max(axis=1, keepdims=True)
+        np.exp(raw, out=raw)
+        raw /= raw.sum(axis=1, keepdims=True)
+        return raw
+
+    def predict_proba(self, X: pd.DataFrame | np.ndarray) -> np.ndarray:
+        X = self._as_array(X)
+        step = max(_MAX_CELLS // max(self.n_trees, 1), 1)
+        if len(X) <= step:
+            return self._proba(X)
+        return np.concatenate([self._proba(X[i : i + step]) for i in range(0, len(X), step)])
+
+    def predict(self, X: pd.DataFrame | np.ndarray) -> np.ndarray:
+        return self.classes_[self.predict_proba(X).argmax(axis=1)]
+
+
+def _fold_scaler(scaler: Any, n_features: int) -> Tuple[np.ndarray, np.ndarray]:
+    """(mean, scale) such that scaled = (x - mean) / scale; identity when a part is disabled."""
+    from sklearn.preprocessing import StandardScaler
+
+    if not isinstance(scaler, StandardScaler):
+        raise ValueError(f"Only StandardScaler can be folded into a compiled forest, got {type(scaler).__name__}")
+    mean = scaler.mean_ if scaler.with_mean else np.zeros(n_features)
+    scale = scaler.scale_ if scaler.with_std else np.ones(n_features)
+    return np.asarray(mean, dtype=np.float64), np.asarray(scale, dtype=np.float64)
+
+
+def _bfs_order(tree: Any) -> np.ndarray:
+    """Node ids of one sklearn Tree in breadth-first order, each node's children adjacent."""
+    levels = [np.zeros(1, dtype=np.int64)]
+    while True:
+        level = levels[-1]
+        internal = level[tree.children_left[level] != -1]
+        if not len(internal):
+            return np.concatenate(levels)
+        levels.append(np.column_stack([tree.children_left[internal], tree.children_right[internal]]).ravel())
+
+
+def _pack_trees(trees: List[Any], leaf_values: List[np.ndarray]) -> Dict[str, Any]:
+    """Concatenates sklearn Tree objects into global node arrays with self-looping leaves."""
+    feature, threshold, child, missing_right, values, roots = [], [], [], [], [], []
+    offset = 0
+    for tree, value in zip(trees, leaf_values):
+        order = _bfs_order(tree)
+        new_id = np.empty(tree.node_count, dtype=np.int64)
+        new_id[order] = np.arange(tree.node_count) + offset
+        left = tree.children_left[order]
+        is_leaf = left == -1
+        feature.append(np.where(is_leaf, 0, tree.feature[order]))
+        threshold.append(np.where(is_leaf, np.inf, tree.threshold[order]))
+        child.append(np.where(is_leaf, new_id[order], new_id[np.where(is_leaf, 0, left)]))
+        mgl = getattr(tree, "missing_go_to_left", None)
+        mgl = np.zeros(tree.node_count, dtype=bool) if mgl is None else np.asarray(mgl, dtype=bool)[order]
+        missing_right.append(~mgl & ~is_leaf)
+        values.append(value[order])
+        roots.append(offset)
+        offset += tree.node_count
+    return {
+        "feature": np.concatenate(feature).astype(np.int64),
+        "threshold": np.concatenate(threshold).astype(np.float64),
+        "child": np.concatenate(child).astype(np.int64),
+        "missing_right": np.concatenate(missing_right),
+        "value": np.ascontiguousarray(np.concatenate(values), dtype=np.float64),
+        "roots": np.asarray(roots, dtype=np.int64),
+        "max_depth": int(max(t.max_depth for t in trees)),
+    }
+
+
+def compile_pipeline(pipeline: Pipeline) -> CompiledForest:
+    """
+    Compiles a fitted [StandardScaler ->] RandomForest / ExtraTrees /
+    DecisionTree / GradientBoosting classifier pipeline. A leading
+    StandardScaler is folded into the split thresholds.
+    """
+    from sklearn.ensemble import ExtraTreesClassifier, GradientBoostingClassifier, RandomForestClassifier
+    from sklearn.tree import DecisionTreeClassifier
+
+    steps = [step for _, step in pipeline.steps] if hasattr(pipeline, "steps") else [pipeline]
+    clf = steps[-1]
+    if len(steps) > 2:
+        raise ValueError(f"Expected [scaler ->] classifier, got {len(steps)} steps")
+    n_features = int(clf.n_features_in_)
+    names = getattr(pipeline, "feature_names_in_", None)
+    if names is None:
+        raise ValueError("Pipeline was not fit on a DataFrame; feature names are needed to compile it")
+
+    if isinstance(clf, (RandomForestClassifier, ExtraTreesClassifier, DecisionTreeClassifier)):
+        estimators = [clf] if isinstance(clf, DecisionTreeClassifier) else list(clf.estimators_)
+        trees = [est.tree_ for est in estimators]
+        if any(t.n_outputs != 1 for t in trees):
+            raise ValueError("Multi-output forests are not supported")
+        n_classes = len(clf.classes_)
+        leaf_values = []
+        for t in trees:
+            # DecisionTreeClassifier.predict_proba: leaf value normalized to sum to 1
+            v = t.value[:, 0, :n_classes].astype(np.float64)
+            norm = v.sum(axis=1, keepdims=True)
+            norm[norm == 0.0] = 1.0
+            leaf_values.append(v / norm)
+        extra: Dict[str, Any] = {"kind": "forest"}
+    elif isinstance(clf, GradientBoostingClassifier):
+        if clf.init not in (None, "zero"):
+            raise ValueError("GradientBoosting with a custom init estimator cannot be compiled")
+        trees = [est.tree_ for est in clf.estimators_.ravel()]
+        leaf_values = [t.value[:, 0, 0] * clf.learning_rate for t in trees]
+        # The default init (class priors) is the same constant for every row.
+        init_raw = clf._raw_predict_init(np.zeros((1, n_features), dtype=np.float32))[0]
+        extra = {"kind": "gb", "init_raw": np.asarray(init_raw, dtype=np.float64), "loss": clf.loss}
+    else:
+        raise ValueError(f"Cannot compile {type(clf).__name__} (supported: RandomForest, ExtraTrees, DecisionTree, GradientBoosting)")
+
+    packed = _pack_trees(trees, leaf_values)
+    float32_input = True
+    if len(steps) == 2:
+        mean, scale = _fold_scaler(steps[0], n_features)
+        # (x - mean) / scale <= t  <=>  x <= t * scale + mean, since scale > 0
+        f = packed["feature"]
+        packed["threshold"] = packed["threshold"] * scale[f] + mean[f]
+        float32_input = False
+
+    return CompiledForest(
+        classes_=np.asarray(clf.classes_),
+        feature_names_in_=np.asarray(names, dtype=object),
+        float32_input=float32_input,
+        **packed,
+        **extra,
+    )
+
+
+def check_parity(
+    compiled: CompiledForest,
+    pipeline: Pipeline,
+    X: pd.DataFrame,
+    *,
+    atol: float = 1e-9,
+) -> Dict[str, Any]:
+    """Compares compiled and sklearn predict_proba on X; ok means max |diff| <= atol and equal labels."""
+    expected = pipeline.predict_proba(X)
+    got = compiled.predict_proba(X)
+    max_abs_diff = float(np.abs(expected - got).max()) if len(X) else 0.0
+    label_mismatches = int((expected.argmax(axis=1) != got.argmax(axis=1)).sum())
+    return {
+        "n_rows": len(X),
+        "max_abs_diff": max_abs_diff,
+        "label_mismatches": label_mismatches,
+        "atol": atol,
+        "ok": max_abs_diff <= atol and label_mismatches == 0,
+    }
+
+
+def compiled_path(model_path: str | Path, out_dir: str | Path = DEFAULT_COMPILED_DIR) -> Path:
+    return Path(out_dir) / f"{Path(model_path).stem}.joblib"
+
+
+def compile_artifact(
+    model_path: str | Path,
+    out_path: Optional[str | Path] = None,
+    *,
+    X_check: Optional[pd.DataFrame] = None,
+    atol: float = 1e-9,
+) -> Tuple[Path, Optional[Dict[str, Any]]]:
+    """
+    Compiles a saved pipeline into an mmap artifact (default: artifacts/compiled/<stem>.joblib).
+    With X_check, the parity check must pass before anything is written.
+    """
+    pipeline = load_artifact(model_path)
+    compiled = compile_pipeline(pipeline)
+    parity = None
+    if X_check is not None:
+        parity = check_parity(compiled, pipeline, X_check, atol=atol)
+        if not parity["ok"]:
+            raise ValueError(
+                f"Compiled model disagrees with {model_path}: max |diff|={parity['max_abs_diff']:.3g}, "
+                f"label mismatches={parity['label_mismatches']}/{parity['n_rows']}"
+            )
+
+    out_path = Path(out_path) if out_path else compiled_path(model_path)
+    save_artifact(
+        compiled,
+        out_path,
+        metadata={"source": str(model_path), "n_trees": compiled.n_trees, "parity": parity},
+    )
+    return out_path, parity
@@ -3,18 +3,18 @@ from __future__ import annotations
 import json
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
 
-import joblib
 import numpy as np
 import pandas as pd
-from sklearn.metrics import (
-    accuracy_score,
-    classification_report,
-    confusion_matrix,
-    roc_auc_score,
-)
-from sklearn.pipeline import Pipeline
+
+from incident_intelligence.data.loader import iter_chunks, load_df
+from incident_intelligence.modeling.artifacts import load_pipeline as load_artifact_pipeline
+from incident_intelligence.modeling.cache import dataset_fingerprint
+from incident_intelligence.modeling.predictions import Predictions, PredictionStore, predict_once
+
+if TYPE_CHECKING:
+    from sklearn.pipeline import Pipeline
 
 
 @dataclass(frozen=True)
@@ -22,27 +22,14 @@ class EvalConfig:
     label_col: str = "root_cause_label"
     metrics_out: str = "artifacts/metrics/evaluation.json"
     summary_csv_out: Optional[str] = "artifacts/metrics/evaluation_summary.csv"
-
-
-def load_df(path: str | Path) -> pd.DataFrame:
-    path = Path(path)
-    if not path.exists():
-        raise FileNotFoundError(f"Dataset not found: {path}")
-    if path.suffix.lower() == ".csv":
-        return pd.read_csv(path)
-    if path.suffix.lower() in (".parquet", ".pq"):
-        return pd.read_parquet(path)
-    raise ValueError(f"Unsupported file type: {path.suffix} (use .csv or .parquet)")
+    prediction_cache_dir: Optional[str] = "artifacts/cache/predictions"  # None = always re-predict
+    chunk_rows: Optional[int] = None  # stream the eval set in chunks (constant memory)
+    auc_bins: int = 1000  # score-histogram resolution for streamed ROC-AUC
 
 
 def load_pipeline(path: str | Path) -> Pipeline:
-    path = Path(path)
-    if not path.exists():
-        raise FileNotFoundError(f"Model not found: {path}")
-    model = joblib.load(path)
-    if not isinstance(model, Pipeline):
-        raise TypeError(f"Expected sklearn Pipeline, got {type(model)}")
-    return model
+    """Loaded once per process via the model registry (memory-mapped artifacts); treat as read-only."""
+    return load_artifact_pipeline(path)
 
 
 def find_model_files(models_dir: str | Path) -> List[Path]:
@@ -74,11 +61,19 @@ def _json_safe(obj: Any) -> Any:
 
 
 def evaluate_one(
-    model: Pipeline,
+    model: Optional[Pipeline],
     X: pd.DataFrame,
     y: pd.Series,
+    preds: Optional[Predictions] = None,
 ) -> Dict[str, Any]:
-    y_pred = model.predict(X)
+    """
+    Metrics from a single predict_proba pass (predict_once); pass preds to
+    reuse stored predictions, in which case model is not used.
+    """
+    from sklearn.metrics import accuracy_score, classification_report, confusion_matrix, roc_auc_score
+
+    preds = preds if preds is not None else predict_once(model, X)
+    y_pred = preds.labels
 
     out: Dict[str, Any] = {
         "accuracy": float(accuracy_score(y, y_pred)),
@@ -87,9 +82,11 @@ def evaluate_one(
     }
 
     # Optional ROC-AUC (only if predict_proba exists and labels support it)
-    if hasattr(model, "predict_proba"):
+    if preds.proba_error is not None:
+        out["roc_auc_error"] = preds.proba_error
+    elif preds.proba is not None:
         try:
-            proba = model.predict_proba(X)
+            proba = np.asarray(preds.proba)
             # Binary
             if proba.shape[1] == 2:
                 out["roc_auc"] = float(roc_auc_score(y, proba[:, 1]))
@@ -104,6 +101,192 @@ def evaluate_one(
     return out
 
 
+_LOGIT_EPS = 1e-7
+_LOGIT_MAX = float(np.log((1 - _LOGIT_EPS) / _LOGIT_EPS))
+
+
+class StreamingMetrics:
+    """
+    Accumulates evaluate_one's metrics over chunks in O(classes^2 + classes * bins)
+    memory: a confusion matrix, plus per-class histograms of predict_proba
+    scores (logit-spaced bins) for positives and negatives. ROC-AUC is computed
+    from the histograms; pairs that land in the same bin count as ties, so the
+    error is at most half the fraction of such pairs (shrinks with bins).
+    """
+
+    def __init__(self, classes, n_bins: int = 1000):
+        self.labels: List[Any] = list(classes)
+        self.n_proba = len(self.labels)  # predict_proba columns follow the model's classes_
+        self.n_bins = n_bins
+        self.n_rows = 0
+        self.cm = np.zeros((len(self.labels), len(self.labels)), dtype=np.int64)
+        self.pos_hist = np.zeros((self.n_proba, n_bins), dtype=np.int64)
+        self.neg_hist = np.zeros((self.n_proba, n_bins), dtype=np.int64)
+
+    def _codes(self, values) -> np.ndarray:
+        values = np.asarray(values, dtype=object)
+        index = pd.Index(self.labels)
+        codes = index.get_indexer(values)
+        if (codes < 0).any():
+            # Labels the model never saw still get confusion-matrix rows/columns.
+            new = list(pd.unique(values[codes < 0]))
+            self.labels.extend(new)
+            self.cm = np.pad(self.cm, ((0, len(new)), (0, len(new))))
+            codes = pd.Index(self.labels).get_indexer(values)
+        return codes
+
+    def update(self, y_true, y_pred, proba: Optional[np.ndarray] = None) -> None:
+        t = self._codes(y_true)
+        p = self._codes(y_pred)
+        k = len(self.labels)
+        self.cm += np.bincount(t * k + p, minlength=k * k).reshape(k, k)
+        self.n_rows += len(t)
+
+        if proba is not None:
+            # Bins are uniform in logit space: confident models put most scores
+            # near 0/1, where uniform probability bins would tie them all.
+            proba = np.clip(np.asarray(proba, dtype=float), _LOGIT_EPS, 1 - _LOGIT_EPS)
+            logit = np.log(proba) - np.log1p(-proba)
+            scaled = (logit + _LOGIT_MAX) / (2 * _LOGIT_MAX) * self.n_bins
+            bins = np.clip(scaled.astype(np.int64), 0, self.n_bins - 1) + np.arange(self.n_proba) * self.n_bins
+            is_pos = t[:, None] == np.arange(self.n_proba)
+            size = self.n_proba * self.n_bins
+            self.pos_hist += np.bincount(bins[is_pos], minlength=size).reshape(self.n_proba, self.n_bins)
+            self.neg_hist += np.bincount(bins[~is_pos], minlength=size).reshape(self.n_proba, self.n_bins)
+
+    def _class_auc(self, k: int) -> Optional[float]:
+        pos, neg = self.pos_hist[k], self.neg_hist[k]
+        n_pos, n_neg = pos.sum(), neg.sum()
+        if n_pos == 0 or n_neg == 0:
+            return None
+        neg_below = np.cumsum(neg) - neg
+        return float((pos * (neg_below + 0.5 * neg)).sum() / (n_pos * n_neg))
+
+    def _order(self) -> np.ndarray:
+        """
+        Indices of the labels seen in y_true or y_pred, sorted: sklearn's
+        unique_labels, so model classes absent from both get no row.
+        """
+        present = np.flatnonzero((self.cm.sum(axis=0) + self.cm.sum(axis=1)) > 0)
+        return present[np.argsort([str(self.labels[i]) for i in present], kind="stable")]
+
+    def classification_report(self) -> Dict[str, Any]:
+        """Same layout as sklearn's classification_report(output_dict=True, zero_division=0)."""
+        order = self._order()
+        cm = self.cm[np.ix_(order, order)]
+        tp = np.diag(cm).astype(float)
+        support = cm.sum(axis=1)
+        predicted = cm.sum(axis=0)
+        precision = np.divide(tp, predicted, out=np.zeros_like(tp), where=predicted > 0)
+        recall = np.divide(tp, support, out=np.zeros_like(tp), where=support > 0)
+        denom = precision + recall
+        f1 = np.divide(2 * precision * recall, denom, out=np.zeros_like(tp), where=denom > 0)
+
+        report: Dict[str, Any] = {}
+        for i, idx in enumerate(order):
+            report[str(self.labels[idx])] = {
+                "precision": float(precision[i]),
+                "recall": float(recall[i]),
+                "f1-score": float(f1[i]),
+                "support": float(support[i]),
+            }
+        total = support.sum()
+        report["accuracy"] = float(tp.sum() / total) if total else 0.0
+        weights = support / total if total else np.zeros_like(tp)
+        report["macro avg"] = {
+            "precision": float(precision.mean()),
+            "recall": float(recall.mean()),
+            "f1-score": float(f1.mean()),
+            "support": float(total),
+        }
+        report["weighted avg"] = {
+            "precision": float((precision * weights).sum()),
+            "recall": float((recall * weights).sum()),
+            "f1-score": float((f1 * weights).sum()),
+            "support": float(total),
+        }
+        return report
+
+    def result(self, with_proba: bool = True) -> Dict[str, Any]:
+        order = self._order()
+        report = self.classification_report()
+        out: Dict[str, Any] = {
+            "accuracy": report["accuracy"],
+            "classification_report": report,
+            "confusion_matrix": self.cm[np.ix_(order, order)].tolist(),
+            "n_rows": self.n_rows,
+        }
+        if with_proba:
+            if self.n_proba == 2:
+                auc = self._class_auc(1)
+                if auc is not None:
+                    out["roc_auc"] = auc
+            else:
+                aucs = [a for a in (self._class_auc(k) for k in range(self.n_proba)) if a is not None]
+                if aucs:
+                    out["roc_auc_ovr_macro"] = float(np.mean(aucs))
+            out["roc_auc_bins"] = self.n_bins
+        return out
+
+
+def evaluate_models_streaming(
+    model_paths: List[Path],
+    data_path: str | Path,
+    cfg: EvalConfig,
+) -> Dict[str, Any]:
+    """
+    One pass over data_path in cfg.chunk_rows chunks; every model scores each
+    chunk and updates its StreamingMetrics, so memory doesn't grow with rows.
+    """
+    models = [(mp, load_pipeline(mp)) for mp in model_paths]
+    accumulators = [StreamingMetrics(model.classes_, cfg.auc_bins) for _, model in models]
+    proba_errors: Dict[int, str] = {}
+
+    for chunk in iter_chunks(data_path, cfg.chunk_rows, label_col=cfg.label_col):
+        X, y = split_xy(chunk, cfg.label_col)
+        for i, (_, model) in enumerate(models):
+            if i in proba_errors:
+                accumulators[i].update(y, model.predict(X))
+                continue
+            # one model pass per chunk: labels are argmax(predict_proba) except for SVC
+            preds = predict_once(model, X)
+            if preds.proba_error is not None:
+                proba_errors[i] = preds.proba_error
+            accumulators[i].update(y, preds.labels, preds.proba)
+
+    results: Dict[str, Any] = {"label_col": cfg.label_col, "models": []}
+    summary_rows: List[Dict[str, Any]] = []
+    for i, ((mp, model), acc) in enumerate(zip(models, accumulators)):
+        metrics = acc.result(with_proba=hasattr(model, "predict_proba") and i not in proba_errors)
+        if i in proba_errors:
+            metrics["roc_auc_error"] = proba_errors[i]
+        results["models"].append({"model_path": str(mp), "model_name": mp.stem, "metrics": metrics})
+        summary_rows.append(_summary_row(mp, metrics))
+
+    _write_outputs(results, summary_rows, cfg)
+    return results
+
+
+def _summary_row(mp: Path, metrics: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "model_name": mp.stem,
+        "model_path": str(mp),
+        "accuracy": metrics.get("accuracy"),
+        "roc_auc": metrics.get("roc_auc", metrics.get("roc_auc_ovr_macro")),
+    }
+
+
+def _write_outputs(results: Dict[str, Any], summary_rows: List[Dict[str, Any]], cfg: EvalConfig) -> None:
+    metrics_path = Path(cfg.metrics_out)
+    metrics_path.parent.mkdir(parents=True, exist_ok=True)
+    metrics_path.write_text(json.dumps(_json_safe(results), indent=2))
+
+    if cfg.summary_csv_out:
+        summary_path = Path(cfg.summary_csv_out)
+        summary_path.parent.mkdir(parents=True, exist_ok=True)
+        pd.DataFrame(summary_rows).sort_values("accuracy", ascending=False).to_csv(summary_path, index=False)
+
+
 def evaluate_models(
     model_paths: List[Path],
     df_eval: pd.DataFrame,
@@ -114,9 +297,15 @@ def evaluate_models(
     results: Dict[str, Any] = {"label_col": cfg.label_col, "models": []}
     summary_rows: List[Dict[str, Any]] = []
 
+    store = PredictionStore(cfg.prediction_cache_dir) if cfg.prediction_cache_dir else None
+    data_key = dataset_fingerprint(X) if store is not None else None
+
     for mp in model_paths:
-        model = load_pipeline(mp)
-        metrics = evaluate_one(model, X, y)
+        if store is not None:
+            preds = store.predict_file(mp, X, load_pipeline, data_key=data_key)
+        else:
+            preds = predict_once(load_pipeline(mp), X)
+        metrics = evaluate_one(None, X, y, preds=preds)
 
         model_result = {
             "model_path": str(mp),
@@ -125,24 +314,9 @@ def evaluate_models(
         }
         results["models"].append(model_result)
 
-        row = {
-            "model_name": mp.stem,
-            "model_path": str(mp),
-            "accuracy": metrics.get("accuracy"),
-            "roc_auc": metrics.get("roc_auc", metrics.get("roc_auc_ovr_macro")),
-        }
-        summary_rows.append(row)
-
-    # Write outputs
-    metrics_path = Path(cfg.metrics_out)
-    metrics_path.parent.mkdir(parents=True, exist_ok=True)
-    metrics_path.write_text(json.dumps(_json_safe(results), indent=2))
-
-    if cfg.summary_csv_out:
-        summary_path = Path(cfg.summary_csv_out)
-        summary_path.parent.mkdir(parents=True, exist_ok=True)
-        pd.DataFrame(summary_rows).sort_values("accuracy", ascending=False).to_csv(summary_path, index=False)
+        summary_rows.append(_summary_row(mp, metrics))
 
+    _write_outputs(results, summary_rows, cfg)
     return results
 
 def run_evaluation(
@@ -152,11 +326,13 @@ def run_evaluation(
     model_path: str | Path | None = None,
     models_dir: str | Path = "artifacts/models",
 ) -> Dict[str, Any]:
-    df_eval = load_df(data_path)
-
     if model_path:
         model_paths = [Path(model_path)]
     else:
         model_paths = find_model_files(models_dir)
 
+    if cfg.chunk_rows:
+        return evaluate_models_streaming(model_paths, data_path, cfg)
+
+    df_eval = load_df(data_path, label_col=cfg.label_col)
     return evaluate_models(model_paths, df_eval, cfg)
\ No newline at end of file
@@ -1,27 +1,31 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
 
-import joblib
 import numpy as np
 import pandas as pd
 import json
 
-from sklearn.pipeline import Pipeline
-from sklearn.inspection import permutation_importance
-from sklearn.linear_model import LogisticRegression
-from sklearn.svm import SVC
-from sklearn.ensemble import RandomForestClassifier, GradientBoostingClassifier
+from incident_intelligence.data.loader import load_df
+from incident_intelligence.modeling.artifacts import load_pipeline as load_artifact_pipeline
+from incident_intelligence.modeling.cache import dataset_fingerprint
+from incident_intelligence.modeling.predictions import Predictions, PredictionStore
 
-# Optional SHAP import (fallback gracefully if not installed)
-try:
-    import shap  # type: ignore
-    _HAS_SHAP = True
-except Exception:
-    shap = None
-    _HAS_SHAP = False
+if TYPE_CHECKING:
+    from sklearn.pipeline import Pipeline
+
+
+@lru_cache(maxsize=None)
+def _load_shap():
+    """Optional SHAP import, deferred until a model is explained (fallback gracefully if not installed)."""
+    try:
+        import shap  # type: ignore
+        return shap
+    except Exception:
+        return None
 
 
 @dataclass(frozen=True)
@@ -44,19 +48,17 @@ class ExplainConfig:
     # Output controls
     top_k: int = 20
 
+    # Shared with evaluate (None = always re-predict)
+    prediction_cache_dir: Optional[str] = "artifacts/cache/predictions"
+
 
 # -------------------------
 # Loading / utility
 # -------------------------
 
 def load_pipeline(model_path: str | Path) -> Pipeline:
-    model_path = Path(model_path)
-    if not model_path.exists():
-        raise FileNotFoundError(f"Model not found: {model_path}")
-    model = joblib.load(model_path)
-    if not isinstance(model, Pipeline):
-        raise TypeError(f"Expected sklearn Pipeline, got {type(model)}")
-    return model
+    # Shared with evaluate through the process-level model registry
+    return load_artifact_pipeline(model_path)
 
 
 def find_models(models_dir: str | Path) -> List[Path]:
@@ -132,9 +134,14 @@ def make_explainer(clf: Any, X_bg: pd.DataFrame, cfg: ExplainConfig):
     Returns (explainer, kind) where kind in {"tree","linear","kernel"}.
     If unsupported, returns (None, "unsupported").
     """
-    if not _HAS_SHAP:
+    shap = _load_shap()
+    if shap is None:
         return None, "no_shap"
 
+    from sklearn.ensemble import GradientBoostingClassifier, RandomForestClassifier
+    from sklearn.linear_model import LogisticRegression
+    from sklearn.svm import SVC
+
     # sklearn GradientBoostingClassifier: TreeExplainer works well for binary, but multiclass is tricky.
     if isinstance(clf, GradientBoostingClassifier):
         n_classes = len(getattr(clf, "classes_", []))
@@ -185,14 +192,43 @@ def _normalize_multiclass_shap(shap_out, n_classes: int) -> List[np.ndarray]:
 # Global importance
 # -------------------------
 
+def permutation_importances(
+    model: Pipeline,
+    X: pd.DataFrame,
+    y: pd.Series,
+    baseline: float,
+    *,
+    n_repeats: int,
+    random_state: int,
+) -> np.ndarray:
+    """
+    Accuracy drop from baseline when one column is shuffled, shape
+    (n_features, n_repeats). All repeats of a column are scored in one
+    predict call on the stacked permuted copies.
+    """
+    rng = np.random.RandomState(random_state)
+    n = len(X)
+    y_true = np.tile(np.asarray(y), n_repeats)
+    out = np.empty((X.shape[1], n_repeats))
+    for j, col in enumerate(X.columns):
+        values = X[col].to_numpy()
+        stacked = pd.concat([X] * n_repeats, ignore_index=True)
+        stacked[col] = np.concatenate([values[rng.permutation(n)] for _ in range(n_repeats)])
+        correct = np.asarray(model.predict(stacked)) == y_true
+        out[j] = baseline - correct.reshape(n_repeats, n).mean(axis=1)
+    return out
+
+
 def global_importance_for_model(
     model: Pipeline,
     X: pd.DataFrame,
     y: pd.Series,
     cfg: ExplainConfig,
+    preds: Optional[Predictions] = None,
 ) -> Dict[str, Any]:
     """
     Computes global importance using SHAP if possible; otherwise permutation importance.
+    preds (the model's stored predictions on X) supply the unpermuted baseline score.
     Returns a dict with:
       - method
       - runtime_sec
@@ -201,6 +237,8 @@ def global_importance_for_model(
     """
     import time
 
+    from sklearn.ensemble import GradientBoostingClassifier
+
     rng = cfg.random_state
     feature_names = _safe_feature_names(X)
 
@@ -226,17 +264,22 @@ def global_importance_for_model(
         kind = "skip_gb_multiclass"
 
     if explainer is None or kind in {"no_shap", "unsupported", "skip_gb_multiclass"}:
+        from sklearn.metrics import accuracy_score
+
+        y_ex = y.loc[X_ex_raw.index]
+        # Unpermuted baseline: the stored predictions on these rows when available.
+        if preds is not None:
+            baseline_pred = preds.labels[X.index.get_indexer(X_ex_raw.index)]
+        else:
+            baseline_pred = model.predict(X_ex_raw)
+        baseline = accuracy_score(y_ex, baseline_pred)
+
         # Permutation importance on the *pipeline* for correctness
-        perm = permutation_importance(
-            model,
-            X_ex_raw,
-            y.loc[X_ex_raw.index],
-            n_repeats=cfg.perm_repeats,
-            random_state=rng,
-            n_jobs=-1,
+        importances = permutation_importances(
+            model, X_ex_raw, y_ex, baseline, n_repeats=cfg.perm_repeats, random_state=rng
         )
 
-        scores = pd.Series(perm.importances_mean, index=feature_names).sort_values(ascending=False)
+        scores = pd.Series(importances.mean(axis=1), index=feature_names).sort_values(ascending=False)
         runtime = round(time.time() - start, 2)
 
         return {
@@ -248,6 +291,7 @@ def global_importance_for_model(
 
     # SHAP path
     if kind == "kernel":
+        shap = _load_shap()
         # Reduce background for speed
         X_bg_small = shap.sample(X_bg, min(cfg.kernel_bg, len(X_bg)))
         explainer = shap.KernelExplainer(clf.predict_proba, X_bg_small.to_numpy())
@@ -314,12 +358,15 @@ def explain_models(
     X, y = split_xy(df_eval, cfg.label_col)
 
     results: List[Dict[str, Any]] = []
+    store = PredictionStore(cfg.prediction_cache_dir) if cfg.prediction_cache_dir else None
+    data_key = dataset_fingerprint(X) if store is not None else None
 
     for mp in models:
         model = load_pipeline(mp)
         model_name = mp.stem
+        preds = store.predict_file(mp, X, lambda _: model, data_key=data_key) if store is not None else None
 
-        gi = global_importance_for_model(model, X, y, cfg)
+        gi = global_importance_for_model(model, X, y, cfg, preds=preds)
         importance_items = gi["importance"]
         csv_path, png_path = write_importance_outputs(model_name, importance_items, cfg)
 
@@ -350,16 +397,6 @@ def explain_models(
     return summary
 
 
-def load_df(path: str | Path) -> pd.DataFrame:
-    path = Path(path)
-    if not path.exists():
-        raise FileNotFoundError(f"Dataset not found: {path}")
-    if path.suffix.lower() == ".csv":
-        return pd.read_csv(path)
-    if path.suffix.lower() in (".parquet", ".pq"):
-        return pd.read_parquet(path)
-    raise ValueError(f"Unsupported file type: {path.suffix} (use .csv or .parquet)")
-
 def run_explainability(
     *,
     data_path: str | Path,
@@ -368,7 +405,7 @@ def run_explainability(
     models_dir: str | Path = "artifacts/models",
 ) -> Dict[str, Any]:
 
-    df_eval = pd.read_csv(data_path) if str(data_path).endswith(".csv") else pd.read_parquet(data_path)
+    df_eval = load_df(data_path, label_col=cfg.label_col)
 
     if model_path:
         models = [Path(model_path)]
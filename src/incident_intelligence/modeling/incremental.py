@@ -0,0 +1,222 @@
+from __future__ import annotations
+
+import json
+import sys
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from incident_intelligence.data.loader import iter_chunks, validate_schema
+from incident_intelligence.data.schema import FEATURE_COLUMNS
+from incident_intelligence.modeling.artifacts import link_artifact, load_artifact, manifest_path, save_artifact
+from incident_intelligence.modeling.cache import atomic_write_text
+
+if TYPE_CHECKING:
+    from sklearn.pipeline import Pipeline
+
+
+# Online updates for the persisted pipeline: every batch of new labeled
+# incidents goes through partial_fit (StandardScaler statistics, then the
+# classifier), so an update costs O(batch) regardless of how much history the
+# model has already absorbed.
+INCREMENTAL_MODELS = ("sgd", "nb")
+
+
+@dataclass(frozen=True)
+class IncrementalConfig:
+    label_col: str = "root_cause_label"
+    model: str = "sgd"  # "sgd": averaged SGDClassifier(log_loss) on scaled features; "nb": GaussianNB
+    model_out: str = "artifacts/models/incremental_pipeline.joblib"
+    checkpoint_dir: Optional[str] = "artifacts/checkpoints/incremental"
+    keep_checkpoints: int = 5
+    chunk_rows: int = 10_000  # rows per partial_fit call when reading files / stdin
+    # Labels the model can ever predict (fixed on the first update). None =
+    # the root causes in config/class_config.json.
+    classes: Optional[Tuple[str, ...]] = None
+    alpha: float = 1e-4  # SGD regularization
+    random_state: int = 42
+
+
+def default_classes() -> List[str]:
+    from incident_intelligence.data.mixtures import load_compiled_class_config
+
+    return sorted(load_compiled_class_config().mixtures)
+
+
+def make_incremental_pipeline(cfg: IncrementalConfig) -> Pipeline:
+    from sklearn.linear_model import SGDClassifier
+    from sklearn.naive_bayes import GaussianNB
+    from sklearn.pipeline import Pipeline
+    from sklearn.preprocessing import StandardScaler
+
+    if cfg.model == "sgd":
+        return Pipeline(
+            [
+                ("scaler", StandardScaler().set_output(transform="pandas")),
+                # average=True (ASGD): the averaged weights are far less sensitive to
+                # the last few batches than plain SGD's
+                (
+                    "clf",
+                    SGDClassifier(loss="log_loss", alpha=cfg.alpha, average=True, random_state=cfg.random_state),
+                ),
+            ]
+        )
+    if cfg.model == "nb":
+        return Pipeline([("clf", GaussianNB())])
+    raise ValueError(f"Unknown incremental model: {cfg.model} (use one of {INCREMENTAL_MODELS})")
+
+
+def partial_fit_pipeline(pipe: Pipeline, X: pd.DataFrame, y: pd.Series, classes: Sequence[Any]) -> Pipeline:
+    """
+    One online step: each transformer updates its statistics with the batch
+    (partial_fit) and transforms it, then the final estimator's partial_fit.
+    """
+    Xt = X
+    for _, step in pipe.steps[:-1]:
+        if not hasattr(step, "partial_fit"):
+            raise TypeError(f"Step {type(step).__name__} does not support partial_fit")
+        step.partial_fit(Xt)
+        Xt = step.transform(Xt)
+
+    clf = pipe.steps[-1][1]
+    if not hasattr(clf, "partial_fit"):
+        raise TypeError(f"Estimator {type(clf).__name__} does not support partial_fit")
+    clf.partial_fit(Xt, y, classes=np.asarray(classes))
+    return pipe
+
+
+def iter_labeled_batches(
+    sources: Sequence[str | Path],
+    chunk_rows: int,
+    label_col: str,
+) -> Iterator[pd.DataFrame]:
+    """Chunks of features + label from CSV/Parquet/.cols files, or CSV on stdin ("-")."""
+    columns = [*FEATURE_COLUMNS, label_col]
+    for source in sources:
+        if str(source) == "-":
+            for i, chunk in enumerate(pd.read_csv(sys.stdin, usecols=columns, chunksize=chunk_rows)):
+                if i == 0:
+                    validate_schema(chunk, "<stdin>", label_col)
+                yield chunk
+        else:
+            yield from iter_chunks(source, chunk_rows, label_col=label_col)
+
+
+def _state_path(model_out: Path) -> Path:
+    return model_out.with_suffix(".state.json")
+
+
+def load_incremental(cfg: IncrementalConfig) -> Tuple[Pipeline, Dict[str, Any]]:
+    """The persisted pipeline and its update state, or a fresh pipeline."""
+    model_out = Path(cfg.model_out)
+    if model_out.exists():
+        state_path = _state_path(model_out)
+        if not state_path.exists():
+            raise FileNotFoundError(f"Incremental state not found for {model_out}: {state_path}")
+        # Not memory-mapped: partial_fit updates the arrays in place.
+        return load_artifact(model_out, mmap=False), json.loads(state_path.read_text())
+
+    classes = list(cfg.classes) if cfg.classes is not None else default_classes()
+    state = {
+        "model": cfg.model,
+        "label_col": cfg.label_col,
+        "classes": classes,
+        "n_updates": 0,
+        "n_rows_seen": 0,
+        "n_prequential_correct": 0,
+        "n_prequential_rows": 0,
+    }
+    return make_incremental_pipeline(cfg), state
+
+
+def save_incremental(pipe: Pipeline, state: Dict[str, Any], cfg: IncrementalConfig) -> Path:
+    """
+    Replaces model_out (an artifact with manifest) and its .state.json
+    atomically, so readers never see a partial file, and keeps the last
+    keep_checkpoints versions in checkpoint_dir as hardlinks.
+    """
+    model_out = Path(cfg.model_out)
+    state = {**state, "updated_at": time.strftime("%Y-%m-%dT%H:%M:%S%z")}
+    save_artifact(pipe, model_out, metadata={"n_updates": state["n_updates"], "n_rows_seen": state["n_rows_seen"]})
+    atomic_write_text(_state_path(model_out), json.dumps(state, indent=2))
+
+    if cfg.checkpoint_dir:
+        ckpt_dir = Path(cfg.checkpoint_dir)
+        link_artifact(model_out, ckpt_dir / f"{model_out.stem}-{state['n_updates']:08d}.joblib")
+        checkpoints = sorted(ckpt_dir.glob(f"{model_out.stem}-*.joblib"))
+        for old in checkpoints[: max(len(checkpoints) - cfg.keep_checkpoints, 0)]:
+            old.unlink(missing_ok=True)
+            manifest_path(old).unlink(missing_ok=True)
+    return model_out
+
+
+def update_model(
+    batches: Iterable[pd.DataFrame],
+    cfg: IncrementalConfig,
+    *,
+    checkpoint_every: Optional[int] = None,
+) -> Dict[str, Any]:
+    """
+    Applies partial_fit for each batch to the persisted pipeline and saves it
+    at the end (and every checkpoint_every batches, if set). Each batch is
+    scored before it is learned from (prequential accuracy).
+    """
+    if cfg.model not in INCREMENTAL_MODELS:
+        raise ValueError(f"Unknown incremental model: {cfg.model} (use one of {INCREMENTAL_MODELS})")
+
+    pipe, state = load_incremental(cfg)
+    if state["model"] != cfg.model:
+        raise ValueError(f"{cfg.model_out} holds a '{state['model']}' model, not '{cfg.model}'")
+    classes = state["classes"]
+    known = set(classes)
+
+    n_batches = 0
+    start = time.perf_counter()
+    for batch in batches:
+        if batch.empty:
+            continue
+        X = batch[FEATURE_COLUMNS]
+        y = batch[cfg.label_col]
+        unknown = sorted(set(y.unique()) - known)
+        if unknown:
+            raise ValueError(f"Labels {unknown} are not in the model's classes {classes}")
+
+        if state["n_updates"] > 0:
+            state["n_prequential_correct"] += int((pipe.predict(X) == y.to_numpy()).sum())
+            state["n_prequential_rows"] += len(batch)
+
+        partial_fit_pipeline(pipe, X, y, classes)
+        state["n_updates"] += 1
+        state["n_rows_seen"] += len(batch)
+        n_batches += 1
+
+        if checkpoint_every and n_batches % checkpoint_every == 0:
+            save_incremental(pipe, state, cfg)
+
+    if n_batches == 0:
+        print("[OK] no new rows; model unchanged")
+        return state
+
+    if state["n_prequential_rows"]:
+        state["prequential_accuracy"] = state["n_prequential_correct"] / state["n_prequential_rows"]
+    save_incremental(pipe, state, cfg)
+    elapsed = time.perf_counter() - start
+    print(
+        f"[OK] {n_batches} batch(es) applied in {elapsed:.2f}s "
+        f"(rows seen={state['n_rows_seen']}, updates={state['n_updates']})  saved={cfg.model_out}"
+    )
+    return state
+
+
+def run_incremental(
+    sources: Sequence[str | Path],
+    cfg: IncrementalConfig,
+    *,
+    checkpoint_every: Optional[int] = None,
+) -> Dict[str, Any]:
+    batches = iter_labeled_batches(sources, cfg.chunk_rows, cfg.label_col)
+    return update_model(batches, cfg, checkpoint_every=checkpoint_every)
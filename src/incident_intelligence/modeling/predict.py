@@ -1,32 +1,25 @@
 from __future__ import annotations
 
 from pathlib import Path
+from typing import TYPE_CHECKING
 import argparse
 
-import joblib
 import pandas as pd
-from sklearn.pipeline import Pipeline
+
+from incident_intelligence.data.loader import load_dataset
+from incident_intelligence.modeling.artifacts import load_pipeline
+
+if TYPE_CHECKING:
+    from sklearn.pipeline import Pipeline
 
 
 def load_model(path: str | Path) -> Pipeline:
-    path = Path(path)
-    if not path.exists():
-        raise FileNotFoundError(f"Model not found: {path}")
-    model = joblib.load(path)
-    if not isinstance(model, Pipeline):
-        raise TypeError(f"Expected sklearn Pipeline, got {type(model)}")
-    return model
+    return load_pipeline(path)
 
 
 def load_inputs(path: str | Path) -> pd.DataFrame:
-    path = Path(path)
-    if not path.exists():
-        raise FileNotFoundError(f"Inputs not found: {path}")
-    if path.suffix.lower() == ".csv":
-        return pd.read_csv(path)
-    if path.suffix.lower() in (".parquet", ".pq"):
-        return pd.read_parquet(path)
-    raise ValueError(f"Unsupported file type: {path.suffix} (use .csv or .parquet)")
+    """All input columns (passthrough columns are kept in the output); the features are validated."""
+    return load_dataset(path)
 
 
 def predict_df(model: Pipeline, X: pd.DataFrame) -> pd.DataFrame:
@@ -35,7 +28,9 @@ def predict_df(model: Pipeline, X: pd.DataFrame) -> pd.DataFrame:
 
     if hasattr(model, "predict_proba"):
         proba = model.predict_proba(X)
-        classes = getattr(model.named_steps.get("clf", model), "classes_", None) or [f"class_{i}" for i in range(proba.shape[1])]
+        classes = getattr(model, "classes_", None)
+        if classes is None:
+            classes = [f"class_{i}" for i in range(proba.shape[1])]
         for i, c in enumerate(classes):
             out[f"proba_{c}"] = proba[:, i]
 
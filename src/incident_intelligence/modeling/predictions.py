@@ -0,0 +1,148 @@
+from __future__ import annotations
+
+import json
+import os
+import shutil
+import tempfile
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+import numpy as np
+import pandas as pd
+
+from incident_intelligence.data.loader import content_digest
+from incident_intelligence.modeling.cache import dataset_fingerprint
+
+
+# One predict_proba pass per (model artifact, dataset): train, evaluate and
+# explain all derive labels and metrics from the stored probabilities instead
+# of calling predict / predict_proba again.
+
+
+@dataclass(frozen=True)
+class Predictions:
+    """
+    A model's outputs on one dataset. proba is float32 (n_rows, n_classes) in
+    classes order, memory-mapped when loaded from a PredictionStore.
+    """
+
+    classes: np.ndarray
+    codes: np.ndarray  # index into classes of model.predict() per row
+    proba: Optional[np.ndarray] = None
+    proba_error: Optional[str] = None
+
+    @property
+    def labels(self) -> np.ndarray:
+        return self.classes[self.codes]
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+
+def _predict_is_argmax(model: Any) -> bool:
+    """False where predict() can disagree with argmax(predict_proba()) (SVC's Platt scaling)."""
+    from sklearn.svm import SVC, NuSVC
+
+    clf = model.named_steps.get("clf", model) if hasattr(model, "named_steps") else model
+    return not isinstance(clf, (SVC, NuSVC))
+
+
+def predict_once(model: Any, X: pd.DataFrame) -> Predictions:
+    """Runs predict_proba once (plus predict only for SVC-style models)."""
+    classes = np.asarray(model.classes_)
+    proba = None
+    proba_error = None
+    if hasattr(model, "predict_proba"):
+        try:
+            proba = model.predict_proba(X)
+        except Exception as e:
+            proba_error = str(e)
+
+    if proba is not None and _predict_is_argmax(model):
+        # argmax on the float64 output, before the float32 downcast
+        codes = proba.argmax(axis=1)
+    else:
+        codes = np.searchsorted(classes, model.predict(X))
+    return Predictions(
+        classes=classes,
+        codes=codes.astype(np.int32),
+        proba=proba.astype(np.float32) if proba is not None else None,
+        proba_error=proba_error,
+    )
+
+
+class PredictionStore:
+    """
+    Predictions on disk, one directory per (model key, data key):
+      codes.npy, proba.npy (float32) and meta.json. Loads are memory-mapped.
+    """
+
+    def __init__(self, root: str | Path):
+        self.root = Path(root)
+
+    def model_key(self, model_path: str | Path) -> str:
+        """Content hash of a saved model artifact (re-hashed only when it changes)."""
+        return content_digest(model_path, self.root / "stat")
+
+    def _dir(self, model_key: str, data_key: str) -> Path:
+        return self.root / f"{model_key[:24]}-{data_key[:24]}"
+
+    def get(self, model_key: str, data_key: str) -> Optional[Predictions]:
+        entry = self._dir(model_key, data_key)
+        try:
+            meta = json.loads((entry / "meta.json").read_text())
+            proba = np.load(entry / "proba.npy", mmap_mode="r") if meta["has_proba"] else None
+            return Predictions(
+                classes=np.asarray(meta["classes"], dtype=object if meta["classes_kind"] == "str" else None),
+                codes=np.load(entry / "codes.npy", mmap_mode="r"),
+                proba=proba,
+                proba_error=meta.get("proba_error"),
+            )
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def put(self, model_key: str, data_key: str, preds: Predictions) -> None:
+        entry = self._dir(model_key, data_key)
+        if preds.proba_error is not None or (entry / "meta.json").exists():
+            return  # a failed predict_proba is not cached, so it is retried (and reported) next time
+        meta = {
+            "classes": [c.item() if isinstance(c, np.generic) else c for c in preds.classes],
+            "classes_kind": "str" if preds.classes.dtype.kind in "OUS" else "num",
+            "n_rows": len(preds),
+            "has_proba": preds.proba is not None,
+            "proba_error": preds.proba_error,
+        }
+        try:
+            self.root.mkdir(parents=True, exist_ok=True)
+            tmp_dir = Path(tempfile.mkdtemp(prefix=".tmp-", dir=self.root))
+        except OSError:
+            return  # caching is best effort
+        try:
+            np.save(tmp_dir / "codes.npy", np.asarray(preds.codes))
+            if preds.proba is not None:
+                np.save(tmp_dir / "proba.npy", np.asarray(preds.proba, dtype=np.float32))
+            (tmp_dir / "meta.json").write_text(json.dumps(meta))
+            os.replace(tmp_dir, entry)
+        except OSError:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    def predict_file(
+        self,
+        model_path: str | Path,
+        X: pd.DataFrame,
+        loader: Callable[[Path], Any],
+        *,
+        data_key: Optional[str] = None,
+    ) -> Predictions:
+        """
+        Predictions of the model saved at model_path on X; the model is only
+        loaded (loader(model_path)) and run on a miss.
+        """
+        model_key = self.model_key(model_path)
+        data_key = data_key or dataset_fingerprint(X)
+        preds = self.get(model_key, data_key)
+        if preds is None:
+            preds = predict_once(loader(Path(model_path)), X)
+            self.put(model_key, data_key, preds)
+        return preds
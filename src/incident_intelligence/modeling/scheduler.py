@@ -0,0 +1,745 @@
+from __future__ import annotations
+
+import math
+import time
+from dataclasses import dataclass, field, replace
+from typing import TYPE_CHECKING, Any, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from incident_intelligence.modeling.baseline import CORESET_METHODS, SEARCH_MODES, BaselineTrainConfig, make_pipeline
+from incident_intelligence.modeling.cache import TrialStore, canonical, dataset_fingerprint, digest, library_versions
+
+if TYPE_CHECKING:
+    from sklearn.pipeline import Pipeline
+
+
+# All (family, candidate, fold) fits of every model family go through one
+# joblib pool, longest first, instead of one GridSearchCV per family. With
+# search="grid" the results mirror GridSearchCV(cv=cfg.cv, scoring=None,
+# refit=True): same folds, same scores, same first-best tie-break, then a
+# refit on all rows.
+
+
+@dataclass(frozen=True)
+class FitTask:
+    family: str
+    candidates: Tuple[int, ...]  # more than one = a warm-start path, scored at every point
+    fold: int  # -1 = refit on the full training set
+    params: Tuple[Dict[str, Any], ...]
+    cost: float
+    iteration: int = 0
+    path: Optional[str] = None  # None, "warm_start" or "staged"
+
+
+@dataclass
+class SearchResult:
+    """The parts of a fitted GridSearchCV that the training loop reads."""
+
+    best_estimator_: Pipeline
+    best_params_: Dict[str, Any]
+    best_score_: float
+    best_index_: int
+    cv_results_: Dict[str, Any] = field(default_factory=dict)
+    search_: Dict[str, Any] = field(default_factory=dict)
+
+    def predict(self, X):
+        return self.best_estimator_.predict(X)
+
+    def predict_proba(self, X):
+        return self.best_estimator_.predict_proba(X)
+
+
+# -------------------------
+# Cost model
+# -------------------------
+
+def estimate_fit_cost(pipeline: Pipeline, params: Dict[str, Any], n_rows: int, n_classes: int) -> float:
+    """
+    Rough relative fit time, only used to order tasks (longest first).
+    Uses the usual asymptotics per family; anything unknown is linear in rows.
+    """
+    from sklearn.base import clone
+    from sklearn.ensemble import GradientBoostingClassifier, HistGradientBoostingClassifier, RandomForestClassifier
+    from sklearn.kernel_approximation import Nystroem
+    from sklearn.linear_model import LogisticRegression
+    from sklearn.pipeline import Pipeline as SkPipeline
+    from sklearn.svm import SVC
+
+    clf = clone(pipeline).set_params(**params).named_steps["clf"]
+    n = max(n_rows, 2)
+    log_n = math.log2(n)
+
+    if isinstance(clf, SVC):
+        cost = 0.05 * n**2 / 1000 * n_classes
+        return cost * (5 if clf.probability else 1)  # probability=True adds an internal 5-fold CV
+    if isinstance(clf, RandomForestClassifier):
+        depth = min(clf.max_depth or log_n, log_n)
+        return clf.n_estimators * n * depth / 100
+    if isinstance(clf, GradientBoostingClassifier):
+        return clf.n_estimators * n * clf.max_depth * max(n_classes, 1) / 100
+    if isinstance(clf, HistGradientBoostingClassifier):
+        return clf.max_iter * n * max(n_classes, 1) / 2000  # binned splits: ~20x cheaper per tree than GB
+    if isinstance(clf, LogisticRegression):
+        return n * n_classes / 10
+    if isinstance(clf, SkPipeline) and isinstance(clf.steps[0][1], Nystroem):
+        return n * clf.steps[0][1].n_components * max(n_classes, 1) / 200
+    return float(n)
+
+
+# -------------------------
+# Task execution
+# -------------------------
+
+def _fit_and_score(
+    pipeline: Pipeline,
+    task: FitTask,
+    X: pd.DataFrame,
+    y: pd.Series,
+    train_idx: Optional[np.ndarray],
+    test_idx: Optional[np.ndarray],
+) -> Tuple[FitTask, Any, List[float], List[float], List[float]]:
+    """
+    Fits a fresh clone; returns (task, fitted pipeline or None, scores,
+    fit_times, score_times), one entry per candidate of the task. On a path,
+    each point's fit time is the increment it adds, so they sum to the real cost.
+    """
+    from sklearn.base import clone
+
+    est = clone(pipeline)
+    if train_idx is None:
+        start = time.perf_counter()
+        est.set_params(**task.params[0]).fit(X, y)
+        return task, est, [float("nan")], [time.perf_counter() - start], [0.0]
+
+    X_train, y_train = X.iloc[train_idx], y.iloc[train_idx]
+    X_test, y_test = X.iloc[test_idx], y.iloc[test_idx]
+    scores: List[float] = []
+    fit_times: List[float] = []
+    score_times: List[float] = []
+
+    if task.path == "staged":
+        # One fit with the most stages; every grid point is an earlier stage.
+        start = time.perf_counter()
+        est.set_params(**task.params[-1]).fit(X_train, y_train)
+        fit_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        clf = est.named_steps["clf"]
+        Xt = est[:-1].transform(X_test) if len(est.steps) > 1 else X_test
+        stages = {p["clf__n_estimators"]: i for i, p in enumerate(task.params)}
+        staged_scores: Dict[int, float] = {}
+        for n_stages, y_pred in enumerate(clf.staged_predict(Xt), start=1):
+            if n_stages in stages:
+                staged_scores[n_stages] = float(np.mean(y_pred == np.asarray(y_test)))
+        score_time = (time.perf_counter() - start) / len(task.params)
+
+        n_max = task.params[-1]["clf__n_estimators"]
+        prev = 0
+        for params in task.params:
+            n_stages = params["clf__n_estimators"]
+            scores.append(staged_scores[n_stages])
+            fit_times.append(fit_time * (n_stages - prev) / n_max)
+            score_times.append(score_time)
+            prev = n_stages
+        return task, None, scores, fit_times, score_times
+
+    if task.path == "warm_start":
+        est.set_params(clf__warm_start=True)
+
+    for params in task.params:
+        start = time.perf_counter()
+        est.set_params(**params).fit(X_train, y_train)
+        fit_times.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        scores.append(float(est.score(X_test, y_test)))
+        score_times.append(time.perf_counter() - start)
+    return task, None, scores, fit_times, score_times
+
+
+# -------------------------
+# Warm-start paths
+# -------------------------
+
+def _path_param(pipeline: Pipeline, approximate: bool = False) -> Tuple[Optional[str], Optional[str], bool]:
+    """
+    (grid parameter that forms a path, how to walk it, exact?) for the
+    pipeline's classifier. Approximate paths (scores drift slightly from
+    independent fits) are only returned when approximate=True.
+    """
+    from sklearn.ensemble import GradientBoostingClassifier, HistGradientBoostingClassifier
+    from sklearn.ensemble._forest import BaseForest
+    from sklearn.linear_model import LogisticRegression
+
+    clf = pipeline.named_steps["clf"]
+    if isinstance(clf, BaseForest):
+        return "clf__n_estimators", "warm_start", True  # trees are added with the same seeds
+    if isinstance(clf, GradientBoostingClassifier):
+        return "clf__n_estimators", "staged", True  # stage k of a longer fit is the k-stage model
+    if isinstance(clf, HistGradientBoostingClassifier) and clf.early_stopping is False:
+        return "clf__max_iter", "warm_start", True  # further iterations on the same bins
+    if approximate and isinstance(clf, LogisticRegression) and clf.solver != "liblinear":
+        return "clf__C", "warm_start", False  # each C starts from the previous solution
+    return None, None, True
+
+
+def path_groups(
+    pipeline: Pipeline,
+    candidates: List[Dict[str, Any]],
+    alive: List[int],
+    approximate: bool = False,
+) -> List[Tuple[Tuple[int, ...], Optional[str]]]:
+    """
+    Groups candidate indices that differ only in the path parameter, ordered
+    along the path (fewest trees / strongest regularization first).
+    Candidates without a path partner are returned on their own.
+    """
+    param, kind, _ = _path_param(pipeline, approximate)
+    if param is None:
+        return [((cand,), None) for cand in alive]
+
+    groups: Dict[str, List[int]] = {}
+    for cand in alive:
+        params = candidates[cand]
+        if param not in params or params[param] is None:
+            groups[repr(("single", cand))] = [cand]
+            continue
+        key = repr(sorted((k, repr(v)) for k, v in params.items() if k != param))
+        groups.setdefault(key, []).append(cand)
+
+    out: List[Tuple[Tuple[int, ...], Optional[str]]] = []
+    for members in groups.values():
+        members.sort(key=lambda cand: candidates[cand][param])
+        out.append((tuple(members), kind if len(members) > 1 else None))
+    return out
+
+
+def _run_tasks(
+    tasks: List[FitTask],
+    pipelines: Dict[str, Pipeline],
+    X: pd.DataFrame,
+    y: pd.Series,
+    splits: List[Tuple[np.ndarray, np.ndarray]],
+    cfg: BaselineTrainConfig,
+) -> Iterator[Tuple[FitTask, Any, List[float], List[float], List[float]]]:
+    """
+    Runs tasks on one joblib pool in descending cost order (LPT scheduling),
+    yielding results as tasks finish so callers can journal them right away.
+    """
+    from joblib import Parallel, delayed, effective_n_jobs
+
+    ordered = sorted(tasks, key=lambda t: t.cost, reverse=True)
+    if effective_n_jobs(cfg.n_jobs) == 1:
+        # Plain loop: same order, and Ctrl-C surfaces as a clean KeyboardInterrupt.
+        return (
+            _fit_and_score(pipelines[task.family], task, X, y, *(splits[task.fold] if task.fold >= 0 else (None, None)))
+            for task in ordered
+        )
+    return Parallel(n_jobs=cfg.n_jobs, verbose=cfg.verbose, return_as="generator_unordered")(
+        delayed(_fit_and_score)(
+            pipelines[task.family],
+            task,
+            X,
+            y,
+            *(splits[task.fold] if task.fold >= 0 else (None, None)),
+        )
+        for task in ordered
+    )
+
+
+def _rank(iters: np.ndarray, means: np.ndarray) -> np.ndarray:
+    """1 = best. Later iterations rank first (as in sklearn's halving search), then mean score."""
+    ranks = np.empty(len(means), dtype=np.int32)
+    prev = None
+    for pos, i in enumerate(np.lexsort((-means, -iters))):
+        key = (iters[i], means[i])
+        if key != prev:
+            rank, prev = pos + 1, key
+        ranks[i] = rank
+    return ranks
+
+
+def _cv_results(candidates: List[Dict[str, Any]], evals: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """GridSearchCV-style cv_results_, one row per (iteration, candidate) evaluation."""
+    scores = np.array([e["scores"] for e in evals])
+    fit_times = np.array([e["fit_times"] for e in evals])
+    score_times = np.array([e["score_times"] for e in evals])
+    iters = np.array([e["iter"] for e in evals])
+    params = [candidates[e["candidate"]] for e in evals]
+
+    means = scores.mean(axis=1)
+    results: Dict[str, Any] = {
+        "params": params,
+        "iter": iters,
+        "n_resources": np.array([e["n_resources"] for e in evals]),
+        "mean_test_score": means,
+        "std_test_score": scores.std(axis=1),
+        "rank_test_score": _rank(iters, means),
+        "mean_fit_time": fit_times.mean(axis=1),
+        "std_fit_time": fit_times.std(axis=1),
+        "mean_score_time": score_times.mean(axis=1),
+        "std_score_time": score_times.std(axis=1),
+    }
+    for fold in range(scores.shape[1]):
+        results[f"split{fold}_test_score"] = scores[:, fold]
+    for name in sorted({key for p in params for key in p}):
+        results[f"param_{name}"] = [p.get(name) for p in params]
+    return results
+
+
+# -------------------------
+# Resource schedule (halving / budget)
+# -------------------------
+
+def _stratified_order(y: pd.Series, seed: int) -> np.ndarray:
+    """Row order in which every prefix keeps roughly the class proportions of y."""
+    rng = np.random.default_rng(seed)
+    codes, uniques = pd.factorize(y)
+    keys = np.empty(len(y))
+    for c in range(len(uniques)):
+        idx = np.flatnonzero(codes == c)
+        rng.shuffle(idx)
+        keys[idx] = (np.arange(len(idx)) + rng.random(len(idx))) / len(idx)
+    return np.argsort(keys, kind="stable")
+
+
+def resource_schedule(n_rows: int, n_candidates: int, y: pd.Series, cfg: BaselineTrainConfig) -> List[int]:
+    """
+    Training rows per iteration. "grid" is one iteration on all rows; halving
+    grows rows by halving_factor per iteration (ending on all rows) for as many
+    iterations as it takes to cut n_candidates down to one, starting from the
+    smallest subset where every class still has cv rows.
+    """
+    if cfg.search == "grid":
+        return [n_rows]
+
+    factor = cfg.halving_factor
+    min_rows = max(2 * cfg.cv * int(y.nunique()), math.ceil(cfg.cv * n_rows / y.value_counts().min()))
+
+    n_required, remaining = 1, n_candidates
+    while remaining > 1:
+        remaining = math.ceil(remaining / factor)
+        n_required += 1
+    n_possible, rows = 1, min_rows
+    while rows * factor <= n_rows:
+        rows *= factor
+        n_possible += 1
+
+    n_iter = min(n_required, n_possible)
+    return [int(n_rows / factor ** (n_iter - 1 - i)) for i in range(n_iter)]
+
+
+def search_summary(search, n_rows: int) -> Dict[str, Any]:
+    """JSON-friendly search description; also accepts a fitted GridSearchCV."""
+    summary = getattr(search, "search_", None)
+    if summary:
+        return summary
+    res = search.cv_results_
+    return {
+        "mode": "grid",
+        "schedule": [n_rows],
+        "candidates": [
+            {
+                "params": params,
+                "mean_test_score": float(res["mean_test_score"][i]),
+                "rank_test_score": int(res["rank_test_score"][i]),
+                "trace": [
+                    {
+                        "iter": 0,
+                        "n_resources": n_rows,
+                        "mean_test_score": float(res["mean_test_score"][i]),
+                        "std_test_score": float(res["std_test_score"][i]),
+                        "fit_time_sec": float(res["mean_fit_time"][i] * search.n_splits_),
+                    }
+                ],
+            }
+            for i, params in enumerate(res["params"])
+        ],
+    }
+
+
+# -------------------------
+# Coreset
+# -------------------------
+
+def _allocate(quota: int, sizes: np.ndarray) -> np.ndarray:
+    """Splits quota across groups proportionally to sizes (largest remainder), capped at each size."""
+    exact = quota * sizes / sizes.sum()
+    alloc = np.minimum(np.floor(exact).astype(int), sizes)
+    for i in np.argsort(-(exact - alloc), kind="stable"):
+        if alloc.sum() >= quota:
+            break
+        if alloc[i] < sizes[i]:
+            alloc[i] += 1
+    return alloc
+
+
+def coreset_indices(
+    X: pd.DataFrame,
+    y: pd.Series,
+    size: int,
+    method: str = "stratified",
+    seed: int = 42,
+    n_clusters: int = 32,
+) -> np.ndarray:
+    """
+    Sorted positions of a size-row training subsample that keeps the class
+    proportions of y. "kmeans" additionally stratifies within each class by
+    MiniBatchKMeans cluster (on standardized features), so sparse regions of
+    feature space keep proportional representation.
+    """
+    if method not in CORESET_METHODS:
+        raise ValueError(f"Unknown coreset method: {method} (use one of {CORESET_METHODS})")
+    if size >= len(y):
+        return np.arange(len(y))
+
+    if method == "stratified":
+        return np.sort(_stratified_order(y, seed)[:size])
+
+    from sklearn.cluster import MiniBatchKMeans
+
+    rng = np.random.default_rng(seed)
+    codes, uniques = pd.factorize(y)
+    class_rows = [np.flatnonzero(codes == c) for c in range(len(uniques))]
+    quotas = _allocate(size, np.array([len(rows) for rows in class_rows]))
+
+    picked: List[np.ndarray] = []
+    for rows, quota in zip(class_rows, quotas):
+        if quota == 0:
+            continue
+        Xc = X.iloc[rows].to_numpy(dtype=np.float64)
+        Xc = (Xc - Xc.mean(axis=0)) / np.where(Xc.std(axis=0) > 0, Xc.std(axis=0), 1.0)
+        k = int(min(n_clusters, quota, len(rows)))
+        labels = MiniBatchKMeans(n_clusters=k, random_state=seed, n_init=3, batch_size=4096).fit_predict(Xc)
+        cluster_rows = [rows[labels == j] for j in range(k)]
+        per_cluster = _allocate(quota, np.array([len(r) for r in cluster_rows]))
+        for members, n_take in zip(cluster_rows, per_cluster):
+            if n_take:
+                picked.append(rng.choice(members, size=n_take, replace=False))
+    return np.sort(np.concatenate(picked))
+
+
+def _ranking_agreement(core: SearchResult, check: SearchResult) -> Dict[str, Any]:
+    """Kendall's tau between the candidates' mean CV scores on the coreset and on the check sample."""
+    from scipy.stats import kendalltau
+
+    a = np.asarray(core.cv_results_["mean_test_score"], dtype=float)
+    b = np.asarray(check.cv_results_["mean_test_score"], dtype=float)
+    tau = kendalltau(a, b).statistic if len(a) > 1 else float("nan")
+    return {
+        "kendall_tau": None if np.isnan(tau) else round(float(tau), 4),
+        "best_agrees": core.best_index_ == check.best_index_,
+        "check_best_params": check.best_params_,
+        "check_best_score": check.best_score_,
+    }
+
+
+def run_coreset_search(
+    families: List[Dict[str, Any]],
+    X: pd.DataFrame,
+    y: pd.Series,
+    cfg: BaselineTrainConfig,
+    *,
+    trial_store: Optional[TrialStore] = None,
+) -> Dict[str, SearchResult]:
+    """
+    search="coreset": the full grid (shared scheduler) on a cfg.coreset_size
+    subsample, then one refit per family of the winning candidate on all rows.
+    With cfg.coreset_check the grid is also run on a disjoint sample of the
+    same size, and the ranking agreement goes into search_["coreset"].
+    """
+    n_rows = len(X)
+    grid_cfg = replace(cfg, search="grid")
+    core = coreset_indices(X, y, cfg.coreset_size, cfg.coreset_method, cfg.random_state)
+    if len(core) >= n_rows:
+        return run_search(families, X, y, grid_cfg, trial_store=trial_store)
+
+    start = time.perf_counter()
+    searches = run_search(families, X.iloc[core], y.iloc[core], grid_cfg, trial_store=trial_store, refit=False)
+    search_sec = time.perf_counter() - start
+
+    checks: Dict[str, SearchResult] = {}
+    check_rows = 0
+    if cfg.coreset_check:
+        rest = np.setdiff1d(np.arange(n_rows), core, assume_unique=True)
+        order = _stratified_order(y.iloc[rest], cfg.random_state + 1)
+        check = np.sort(rest[order[: len(core)]])
+        check_rows = len(check)
+        if check_rows >= 2 * cfg.cv * int(y.nunique()):
+            checks = run_search(families, X.iloc[check], y.iloc[check], grid_cfg, trial_store=trial_store, refit=False)
+
+    pipelines = {m["name"]: m.get("pipeline") or make_pipeline(m["estimator"]) for m in families}
+    n_classes = int(y.nunique())
+    refit_tasks = []
+    for name, res in searches.items():
+        cost = estimate_fit_cost(pipelines[name], res.best_params_, n_rows, n_classes)
+        refit_tasks.append(FitTask(name, (res.best_index_,), -1, (res.best_params_,), cost))
+    start = time.perf_counter()
+    fitted = {task.family: (est, fit_times[0]) for task, est, _, fit_times, _ in _run_tasks(refit_tasks, pipelines, X, y, [], cfg)}
+    refit_sec = time.perf_counter() - start
+
+    for name, res in searches.items():
+        res.best_estimator_ = fitted[name][0]
+        res.search_ = {
+            **res.search_,
+            "mode": "coreset",
+            "coreset": {
+                "method": cfg.coreset_method,
+                "size": int(len(core)),
+                "n_rows_full": n_rows,
+                "fraction": round(len(core) / n_rows, 6),
+                "all_families_search_sec": round(search_sec, 3),
+                "refit_sec": round(fitted[name][1], 3),
+                "check": {"rows": check_rows, **_ranking_agreement(res, checks[name])} if name in checks else None,
+            },
+        }
+        if cfg.verbose:
+            agreement = res.search_["coreset"]["check"]
+            tau = f", check tau={agreement['kendall_tau']}" if agreement else ""
+            print(f"[OK] coreset {name}: {len(core)}/{n_rows} rows{tau}; refit on all rows {fitted[name][1]:.1f}s")
+    if cfg.verbose:
+        print(f"[OK] coreset search {search_sec:.1f}s, refits {refit_sec:.1f}s")
+    return searches
+
+
+# -------------------------
+# Search
+# -------------------------
+
+def run_search(
+    families: List[Dict[str, Any]],
+    X: pd.DataFrame,
+    y: pd.Series,
+    cfg: BaselineTrainConfig,
+    *,
+    trial_store: Optional[TrialStore] = None,
+    refit: bool = True,
+) -> Dict[str, SearchResult]:
+    """
+    Searches every family (get_models_to_run() format; a prebuilt "pipeline"
+    may replace "estimator") on one worker pool of cfg.n_jobs cores and
+    returns model_name -> SearchResult.
+
+    Each iteration schedules the CV fits of all families' surviving candidates
+    longest-first, so the slow SVC/GB fits start while cheap LR fits fill the
+    remaining cores; the winners' refits on all rows run the same way.
+
+    cfg.search:
+      - "grid": one iteration on all rows (same result as GridSearchCV)
+      - "halving": successive halving on growing stratified row subsets; after
+        each iteration only the top 1/halving_factor candidates continue
+      - "budget": halving, and a family also stops once its spent fit time plus
+        the projected cost of its next iteration exceeds cfg.budget_sec
+      - "coreset": "grid" on a subsample, refit on all rows (run_coreset_search)
+
+    With trial_store, every (candidate, fold) result is looked up before
+    scheduling and stored as soon as its task finishes, so an interrupted
+    search resumes where it stopped and re-running with an extended grid only
+    fits the new candidates. refit=False skips the final refits
+    (best_estimator_ is None).
+    """
+    from sklearn.model_selection import ParameterGrid, check_cv
+
+    if cfg.search not in SEARCH_MODES:
+        raise ValueError(f"Unknown search: {cfg.search} (use one of {SEARCH_MODES})")
+    if cfg.search == "coreset":
+        return run_coreset_search(families, X, y, cfg, trial_store=trial_store)
+    if cfg.search == "budget" and not cfg.budget_sec:
+        raise ValueError("search='budget' needs budget_sec > 0")
+
+    n_rows = len(X)
+    n_classes = int(y.nunique())
+
+    pipelines: Dict[str, Pipeline] = {}
+    candidates: Dict[str, List[Dict[str, Any]]] = {}
+    for model_info in families:
+        name = model_info["name"]
+        pipelines[name] = model_info.get("pipeline") or make_pipeline(model_info["estimator"])
+        candidates[name] = list(ParameterGrid(model_info["param_grid"]))
+
+    schedule = resource_schedule(n_rows, max(len(c) for c in candidates.values()), y, cfg)
+    order = _stratified_order(y, cfg.random_state) if len(schedule) > 1 else None
+
+    if trial_store is not None:
+        data_fp = dataset_fingerprint(X, y)
+        trial_base = {name: _trial_base(pipelines[name], data_fp, cfg) for name in candidates}
+
+    alive = {name: list(range(len(cands))) for name, cands in candidates.items()}
+    evals: Dict[str, List[Dict[str, Any]]] = {name: [] for name in candidates}
+    spent = {name: 0.0 for name in candidates}
+    stopped: Dict[str, Optional[str]] = {name: None for name in candidates}
+
+    for it, n_res in enumerate(schedule):
+        active = [name for name in candidates if stopped[name] is None]
+        if not active:
+            break
+        rows = np.arange(n_rows) if n_res >= n_rows else np.sort(order[:n_res])
+        y_sub = y.iloc[rows]
+        splits = [(rows[tr], rows[te]) for tr, te in check_cv(cfg.cv, y_sub, classifier=True).split(rows, y_sub)]
+        n_fit = len(splits[0][0])
+
+        shape = {name: (len(candidates[name]), len(splits)) for name in active}
+        scores = {name: np.full(s, np.nan) for name, s in shape.items()}
+        fit_times = {name: np.zeros(s) for name, s in shape.items()}
+        score_times = {name: np.zeros(s) for name, s in shape.items()}
+        done = {name: np.zeros(s, dtype=bool) for name, s in shape.items()}
+
+        def trial_key(name: str, cand: int, fold: int) -> str:
+            return digest({**trial_base[name], "params": canonical(candidates[name][cand]), "n_resources": n_res, "fold": fold})
+
+        tasks: List[FitTask] = []
+        for name in active:
+            if trial_store is not None:
+                for cand in alive[name]:
+                    for fold in range(len(splits)):
+                        record = trial_store.get(trial_key(name, cand, fold))
+                        if record is not None:
+                            scores[name][cand, fold] = record["score"]
+                            fit_times[name][cand, fold] = record["fit_time"]
+                            score_times[name][cand, fold] = record["score_time"]
+                            done[name][cand, fold] = True
+
+            if cfg.warm_start_paths:
+                groups = path_groups(pipelines[name], candidates[name], alive[name], cfg.approximate_paths)
+            else:
+                groups = [((cand,), None) for cand in alive[name]]
+            exact = _path_param(pipelines[name], cfg.approximate_paths)[2]
+            for members, path in groups:
+                for fold in range(len(splits)):
+                    missing = tuple(cand for cand in members if not done[name][cand, fold])
+                    if not missing:
+                        continue
+                    # Approximate paths are re-walked whole, so scores never depend on what was stored.
+                    run = missing if exact else members
+                    params = tuple(candidates[name][cand] for cand in run)
+                    costs = [estimate_fit_cost(pipelines[name], p, n_fit, n_classes) for p in params]
+                    cost = max(costs)  # a path costs about as much as its longest point
+                    tasks.append(FitTask(name, run, fold, params, cost, it, path if len(run) > 1 else None))
+
+        for task, _, task_scores, task_fit_times, task_score_times in _run_tasks(tasks, pipelines, X, y, splits, cfg):
+            for cand, score, fit_time, score_time in zip(task.candidates, task_scores, task_fit_times, task_score_times):
+                scores[task.family][cand, task.fold] = score
+                fit_times[task.family][cand, task.fold] = fit_time
+                score_times[task.family][cand, task.fold] = score_time
+                if trial_store is not None:
+                    record = {"score": score, "fit_time": fit_time, "score_time": score_time}
+                    trial_store.put(trial_key(task.family, cand, task.fold), record)
+
+        for name in active:
+            round_time = 0.0
+            for cand in alive[name]:
+                evals[name].append(
+                    {
+                        "iter": it,
+                        "n_resources": n_res,
+                        "candidate": cand,
+                        "scores": scores[name][cand],
+                        "fit_times": fit_times[name][cand],
+                        "score_times": score_times[name][cand],
+                    }
+                )
+                # Stored trials count with their recorded times, so a resumed or
+                # cached budget search makes the same decisions as a fresh one.
+                round_time += float(fit_times[name][cand].sum() + score_times[name][cand].sum())
+            spent[name] += round_time
+
+            if it + 1 == len(schedule):
+                continue
+            means = scores[name][alive[name]].mean(axis=1)
+            keep = math.ceil(len(alive[name]) / cfg.halving_factor)
+            survivors = sorted(alive[name][j] for j in np.argsort(-means, kind="stable")[:keep])
+            if len(survivors) == 1:
+                stopped[name] = "single candidate left"
+            elif cfg.search == "budget":
+                projected = round_time * (schedule[it + 1] / n_res) * (len(survivors) / len(alive[name]))
+                if spent[name] + projected > cfg.budget_sec:
+                    stopped[name] = "budget"
+            alive[name] = survivors
+
+    best_index: Dict[str, int] = {}
+    cv_results: Dict[str, Dict[str, Any]] = {}
+    for name in candidates:
+        cv_results[name] = _cv_results(candidates[name], evals[name])
+        best_row = int(cv_results[name]["rank_test_score"].argmin())
+        best_index[name] = evals[name][best_row]["candidate"]
+
+    fitted: Dict[str, Any] = {name: None for name in best_index}
+    if refit:
+        refit_tasks = []
+        for name, idx in best_index.items():
+            params = candidates[name][idx]
+            cost = estimate_fit_cost(pipelines[name], params, n_rows, n_classes)
+            refit_tasks.append(FitTask(name, (idx,), -1, (params,), cost))
+        fitted = {task.family: est for task, est, *_ in _run_tasks(refit_tasks, pipelines, X, y, [], cfg)}
+
+    results: Dict[str, SearchResult] = {}
+    for name, idx in best_index.items():
+        res = cv_results[name]
+        best_row = int(res["rank_test_score"].argmin())
+        results[name] = SearchResult(
+            best_estimator_=fitted[name],
+            best_params_=candidates[name][idx],
+            best_score_=float(res["mean_test_score"][best_row]),
+            best_index_=idx,
+            cv_results_=res,
+            search_=_summary(name, candidates[name], evals[name], res, schedule, spent[name], stopped[name], cfg),
+        )
+        if cfg.verbose:
+            n_iter = int(res["iter"].max()) + 1
+            print(
+                f"[OK] search {name}: {cfg.search}, {len(candidates[name])} candidates, {n_iter} iteration(s), "
+                f"{spent[name]:.1f}s, best cv={results[name].best_score_:.4f} {results[name].best_params_}"
+            )
+    return results
+
+
+def _trial_base(pipeline: Pipeline, data_fp: str, cfg: BaselineTrainConfig) -> Dict[str, Any]:
+    """Trial-key parts shared by all of a family's (candidate, fold) fits."""
+    _, _, exact = _path_param(pipeline, cfg.approximate_paths)
+    return {
+        "kind": "trial",
+        "pipeline": canonical(pipeline),
+        "data": data_fp,
+        "cv": cfg.cv,
+        # Subset rows depend on the seed; approximate warm-start paths change scores.
+        "order_seed": cfg.random_state if cfg.search != "grid" else None,
+        "approx_path": bool(cfg.warm_start_paths and not exact),
+        "versions": library_versions(),
+    }
+
+
+def _summary(
+    name: str,
+    candidates: List[Dict[str, Any]],
+    evals: List[Dict[str, Any]],
+    cv_results: Dict[str, Any],
+    schedule: List[int],
+    spent: float,
+    stopped: Optional[str],
+    cfg: BaselineTrainConfig,
+) -> Dict[str, Any]:
+    per_candidate: List[Dict[str, Any]] = [{"params": params, "trace": []} for params in candidates]
+    for row, e in enumerate(evals):
+        entry = per_candidate[e["candidate"]]
+        entry["mean_test_score"] = float(cv_results["mean_test_score"][row])
+        entry["rank_test_score"] = int(cv_results["rank_test_score"][row])
+        entry["trace"].append(
+            {
+                "iter": e["iter"],
+                "n_resources": e["n_resources"],
+                "mean_test_score": float(cv_results["mean_test_score"][row]),
+                "std_test_score": float(cv_results["std_test_score"][row]),
+                "fit_time_sec": float(np.sum(e["fit_times"])),
+            }
+        )
+    return {
+        "mode": cfg.search,
+        "schedule": schedule,
+        "halving_factor": cfg.halving_factor if cfg.search != "grid" else None,
+        "budget_sec": cfg.budget_sec if cfg.search == "budget" else None,
+        "spent_sec": round(spent, 3),
+        "stopped_early": stopped,
+        "candidates": per_candidate,
+    }
@@ -1,22 +1,37 @@
 from __future__ import annotations
 
 import json
-from dataclasses import dataclass
+import time
+from dataclasses import asdict, dataclass, replace
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
 
-import joblib
 import numpy as np
 import pandas as pd
-from sklearn.metrics import accuracy_score, f1_score
-from sklearn.model_selection import GridSearchCV
 
+from incident_intelligence.data.loader import load_df
+from incident_intelligence.modeling.artifacts import ARTIFACT_FORMATS, link_artifact, save_artifact
 from incident_intelligence.modeling.baseline import (
+    SCHEDULERS,
+    SEARCH_MODES,
     BaselineTrainConfig,
     get_models_to_run,
     make_pipeline,
 )
+from incident_intelligence.modeling.cache import (
+    ChainedCache,
+    TrainingCache,
+    TrialStore,
+    atomic_write_text,
+    dataset_fingerprint,
+    family_key,
+)
 from incident_intelligence.modeling.evaluate import evaluate_one  # reuse your evaluator
+from incident_intelligence.modeling.predictions import predict_once
+from incident_intelligence.modeling.scheduler import SearchResult, run_search, search_summary
+
+if TYPE_CHECKING:
+    from sklearn.model_selection import GridSearchCV
 
 
 @dataclass(frozen=True)
@@ -26,17 +41,11 @@ class TrainValidateConfig:
     metrics_out_json: str = "artifacts/metrics/train_val_results.json"
     leaderboard_out_csv: str = "artifacts/metrics/leaderboard_val.csv"
     best_model_out: str = "artifacts/models/best_model.joblib"
-
-
-def load_df(path: str | Path) -> pd.DataFrame:
-    path = Path(path)
-    if not path.exists():
-        raise FileNotFoundError(f"Dataset not found: {path}")
-    if path.suffix.lower() == ".csv":
-        return pd.read_csv(path)
-    if path.suffix.lower() in (".parquet", ".pq"):
-        return pd.read_parquet(path)
-    raise ValueError(f"Unsupported file type: {path.suffix} (use .csv or .parquet)")
+    cache_dir: Optional[str] = "artifacts/cache"  # None disables the training cache
+    # Journal of this run: every finished (family, candidate, fold) CV score and
+    # every finished family's pipeline + metrics, so resume_training() skips them.
+    run_dir: Optional[str] = None
+    artifact_format: str = "mmap"  # "mmap" (uncompressed, memory-mapped loads) or "compressed" (zlib)
 
 
 def split_xy(df: pd.DataFrame, label_col: str):
@@ -67,7 +76,14 @@ def fit_grid(
     estimator,
     param_grid: Dict[str, Any],
     base_cfg: BaselineTrainConfig,
-) -> GridSearchCV:
+    trial_store: Optional[TrialStore] = None,
+) -> GridSearchCV | SearchResult:
+    from sklearn.model_selection import GridSearchCV
+
+    if base_cfg.search != "grid":
+        family = {"name": model_name, "estimator": estimator, "param_grid": param_grid}
+        return run_search([family], X_train, y_train, base_cfg, trial_store=trial_store)[model_name]
+
     pipe = make_pipeline(estimator)
     grid = GridSearchCV(
         pipe,
@@ -80,10 +96,8 @@ def fit_grid(
     return grid
 
 
-def save_pipeline(pipeline, out_path: Path) -> Path:
-    out_path.parent.mkdir(parents=True, exist_ok=True)
-    joblib.dump(pipeline, out_path)
-    return out_path
+def save_pipeline(pipeline, out_path: Path, fmt: str = "mmap", metadata: Optional[Dict[str, Any]] = None) -> Path:
+    return save_artifact(pipeline, out_path, fmt=fmt, metadata=metadata)
 
 
 def train_and_validate(
@@ -93,7 +107,15 @@ def train_and_validate(
     cfg: TrainValidateConfig,
     base_cfg: Optional[BaselineTrainConfig] = None,
 ) -> Dict[str, Any]:
+    from sklearn.metrics import accuracy_score, f1_score
+
     base_cfg = base_cfg or BaselineTrainConfig(label_col=cfg.label_col)
+    if base_cfg.scheduler not in SCHEDULERS:
+        raise ValueError(f"Unknown scheduler: {base_cfg.scheduler} (use one of {SCHEDULERS})")
+    if base_cfg.search not in SEARCH_MODES:
+        raise ValueError(f"Unknown search: {base_cfg.search} (use one of {SEARCH_MODES})")
+    if cfg.artifact_format not in ARTIFACT_FORMATS:
+        raise ValueError(f"Unknown artifact format: {cfg.artifact_format} (use one of {ARTIFACT_FORMATS})")
 
     X_train, y_train = split_xy(train_df, cfg.label_col)
     X_val, y_val = split_xy(val_df, cfg.label_col)
@@ -103,42 +125,83 @@ def train_and_validate(
 
     results: List[Dict[str, Any]] = []
 
-    for model_info in get_models_to_run(base_cfg.random_state):
+    families = get_models_to_run(base_cfg.random_state, base_cfg.families)
+
+    # Content-addressed cache: a family whose data, pipeline, grid, search
+    # settings and library versions are unchanged is reused without searching.
+    # The run journal uses the same keys, on top of the shared cache.
+    stores = [TrainingCache(d) for d in (cfg.cache_dir, cfg.run_dir) if d]
+    cache = ChainedCache(stores) if stores else None
+    keys: Dict[str, str] = {}
+    hits: Dict[str, Any] = {}
+    if cache is not None:
+        train_fp = dataset_fingerprint(X_train, y_train)
+        val_fp = dataset_fingerprint(X_val, y_val)
+        for model_info in families:
+            name = model_info["name"]
+            pipe = make_pipeline(model_info["estimator"])
+            keys[name] = family_key(pipe, model_info["param_grid"], train_fp, val_fp, base_cfg)
+            hit = cache.get_family(keys[name])
+            if hit is not None:
+                hits[name] = hit
+    trial_store = cache.trials if cache is not None else None
+
+    if base_cfg.scheduler == "shared":
+        missing = [model_info for model_info in families if model_info["name"] not in hits]
+        searches = run_search(missing, X_train, y_train, base_cfg, trial_store=trial_store) if missing else {}
+
+    for model_info in families:
         name = model_info["name"]
         est = model_info["estimator"]
         param_grid = model_info["param_grid"]
 
-        grid = fit_grid(
-            X_train,
-            y_train,
-            model_name=name,
-            estimator=est,
-            param_grid=param_grid,
-            base_cfg=base_cfg,
-        )
-
-        best_pipe = grid.best_estimator_
-
-        # Evaluate on validation set
-        metrics = evaluate_one(best_pipe, X_val, y_val)
-
-        # Add a couple leaderboard-friendly numbers
-        y_pred = best_pipe.predict(X_val)
-        metrics["val_accuracy"] = float(accuracy_score(y_val, y_pred))
-        metrics["val_f1_macro"] = float(f1_score(y_val, y_pred, average="macro"))
+        if name in hits:
+            best_pipe, entry = hits[name]
+            print(f"[OK] {name}: cache/journal hit ({keys[name][:12]}), search skipped")
+        else:
+            if base_cfg.scheduler == "shared":
+                grid = searches[name]
+            else:
+                grid = fit_grid(
+                    X_train,
+                    y_train,
+                    model_name=name,
+                    estimator=est,
+                    param_grid=param_grid,
+                    base_cfg=base_cfg,
+                    trial_store=trial_store,
+                )
+
+            best_pipe = grid.best_estimator_
+
+            # Evaluate on validation set (one predict_proba pass for all metrics)
+            preds = predict_once(best_pipe, X_val)
+            metrics = evaluate_one(best_pipe, X_val, y_val, preds=preds)
+
+            # Add a couple leaderboard-friendly numbers
+            y_pred = preds.labels
+            metrics["val_accuracy"] = float(accuracy_score(y_val, y_pred))
+            metrics["val_f1_macro"] = float(f1_score(y_val, y_pred, average="macro"))
+
+            entry = _json_safe(
+                {
+                    "best_params": grid.best_params_,
+                    "cv_best_score": float(grid.best_score_),
+                    "search": search_summary(grid, len(X_train)),
+                    "val_metrics": metrics,
+                }
+            )
+            if cache is not None:
+                cache.put_family(keys[name], best_pipe, entry)
+
+        metrics = entry["val_metrics"]
 
         # Save pipeline
         model_file = models_out_dir / f"{name.replace(' ', '_')}_pipeline.joblib"
-        save_pipeline(best_pipe, model_file)
+        metadata = {"model_name": name, "best_params": entry["best_params"]}
+        save_pipeline(best_pipe, model_file, cfg.artifact_format, metadata)
 
-        results.append(
-            {
-                "model_name": name,
-                "model_path": str(model_file),
-                "best_params": grid.best_params_,
-                "val_metrics": metrics,
-            }
-        )
+        results.append({"model_name": name, "model_path": str(model_file), **entry})
 
         print(f"[OK] {name}: val_accuracy={metrics['val_accuracy']:.4f}  saved={model_file}")
 
@@ -146,8 +209,7 @@ def train_and_validate(
     best = max(results, key=lambda r: r["val_metrics"]["val_f1_macro"])
     best_model_path = Path(best["model_path"])
     best_out_path = Path(cfg.best_model_out)
-    best_out_path.parent.mkdir(parents=True, exist_ok=True)
-    joblib.dump(joblib.load(best_model_path), best_out_path)
+    link_artifact(best_model_path, best_out_path)  # hardlink, no deserialize/reserialize
 
     payload = {
         "label_col": cfg.label_col,
@@ -189,6 +251,51 @@ def train_and_validate(
 
     return payload
 
+
+RUN_MANIFEST = "run.json"
+
+
+def new_run_dir(runs_dir: str | Path) -> Path:
+    """A fresh, timestamped journal directory under runs_dir."""
+    base = Path(runs_dir) / time.strftime("%Y%m%d-%H%M%S")
+    run_dir, n = base, 1
+    while run_dir.exists():
+        n += 1
+        run_dir = base.with_name(f"{base.name}-{n}")
+    run_dir.mkdir(parents=True)
+    return run_dir
+
+
+def prune_runs(runs_dir: str | Path, keep: int, *, exclude: Optional[str | Path] = None) -> List[Path]:
+    """
+    Deletes all but the newest keep run journals under runs_dir (never
+    exclude, e.g. the run being started); returns the removed directories.
+    Journal families are hardlinks into the shared cache, so this mostly frees
+    the entries the cache no longer has.
+    """
+    import shutil
+
+    if keep < 0:
+        raise ValueError(f"keep must be >= 0, got {keep}")
+    runs_dir = Path(runs_dir)
+    if not runs_dir.exists():
+        return []
+    exclude = Path(exclude).resolve() if exclude else None
+    runs = sorted(
+        (d for d in runs_dir.iterdir() if (d / RUN_MANIFEST).exists() and d.resolve() != exclude),
+        key=lambda d: d.stat().st_mtime,
+    )
+    keep = keep - 1 if exclude is not None else keep  # the excluded run counts towards keep
+    removed = runs[: max(len(runs) - keep, 0)]
+    for run_dir in removed:
+        shutil.rmtree(run_dir, ignore_errors=True)
+    return removed
+
+
+def _write_manifest(run_dir: Path, manifest: Dict[str, Any]) -> None:
+    atomic_write_text(run_dir / RUN_MANIFEST, json.dumps(manifest, indent=2))
+
+
 def run_training(
     train_path: str | Path,
     val_path: str | Path,
@@ -196,6 +303,50 @@ def run_training(
     cfg: TrainValidateConfig,
     base_cfg: Optional[BaselineTrainConfig] = None,
 ) -> Dict[str, Any]:
-    train_df = load_df(train_path)
-    val_df = load_df(val_path)
-    return train_and_validate(train_df, val_df, cfg=cfg, base_cfg=base_cfg)
+    base_cfg = base_cfg or BaselineTrainConfig(label_col=cfg.label_col)
+
+    manifest: Optional[Dict[str, Any]] = None
+    if cfg.run_dir:
+        run_dir = Path(cfg.run_dir)
+        run_dir.mkdir(parents=True, exist_ok=True)
+        now = time.strftime("%Y-%m-%dT%H:%M:%S%z")
+        manifest = {
+            "train_path": str(Path(train_path).resolve()),
+            "val_path": str(Path(val_path).resolve()),
+            "cfg": asdict(cfg),
+            "base_cfg": asdict(base_cfg),
+            "started_at": now,
+            "status": "running",
+        }
+        if (run_dir / RUN_MANIFEST).exists():
+            previous = json.loads((run_dir / RUN_MANIFEST).read_text())
+            manifest.update(started_at=previous.get("started_at", now), resumed_at=now)
+        _write_manifest(run_dir, manifest)
+        print(f"[OK] journaling to {run_dir} (resume with: incident-train --resume {run_dir})")
+
+    train_df = load_df(train_path, label_col=cfg.label_col)
+    val_df = load_df(val_path, label_col=cfg.label_col)
+    payload = train_and_validate(train_df, val_df, cfg=cfg, base_cfg=base_cfg)
+
+    if manifest is not None:
+        finished_at = time.strftime("%Y-%m-%dT%H:%M:%S%z")
+        _write_manifest(Path(cfg.run_dir), {**manifest, "status": "complete", "finished_at": finished_at})
+    return payload
+
+
+def resume_training(run_dir: str | Path, *, n_jobs: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Re-runs the training recorded in run_dir/run.json with the same data and
+    settings; journaled CV scores and finished families are not recomputed, so
+    the outputs match an uninterrupted run. n_jobs may differ from the original.
+    """
+    manifest_path = Path(run_dir) / RUN_MANIFEST
+    if not manifest_path.exists():
+        raise FileNotFoundError(f"Run manifest not found: {manifest_path}")
+    manifest = json.loads(manifest_path.read_text())
+
+    cfg = TrainValidateConfig(**{**manifest["cfg"], "run_dir": str(run_dir)})
+    base_cfg = BaselineTrainConfig(**{**manifest["base_cfg"], "families": tuple(manifest["base_cfg"]["families"])})
+    if n_jobs is not None:
+        base_cfg = replace(base_cfg, n_jobs=n_jobs)
+    return run_training(manifest["train_path"], manifest["val_path"], cfg=cfg, base_cfg=base_cfg)
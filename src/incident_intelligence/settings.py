@@ -3,6 +3,7 @@ from __future__ import annotations
 import json
 import os
 from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
 from typing import Any, Dict
 
@@ -31,7 +32,17 @@ class Settings:
         )
 
 
-SETTINGS = Settings.load()
+@lru_cache(maxsize=None)
+def get_settings() -> Settings:
+    """Resolved on first use (not at import), so PROJECT_ROOT can be set late."""
+    return Settings.load()
+
+
+def __getattr__(name: str) -> Any:
+    # Backwards compatible `from incident_intelligence.settings import SETTINGS`.
+    if name == "SETTINGS":
+        return get_settings()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 def load_json(path: Path) -> Dict[str, Any]:
@@ -40,4 +51,4 @@ def load_json(path: Path) -> Dict[str, Any]:
 
 
 def load_class_config() -> Dict[str, Any]:
-    return load_json(SETTINGS.config_dir / "class_config.json")
\ No newline at end of file
+    return load_json(get_settings().config_dir / "class_config.json")
\ No newline at end of file
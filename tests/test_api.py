@@ -0,0 +1,149 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+import pytest
+from fastapi.testclient import TestClient
+from sklearn.linear_model import LogisticRegression
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import StandardScaler
+
+from incident_intelligence.api.inference_api import ServeConfig, create_app
+from incident_intelligence.data.generator import DEFAULT_ROOT_CAUSE_PROBS, generate_dataset
+from incident_intelligence.data.mixtures import load_compiled_class_config
+from incident_intelligence.data.schema import COUNT_FEATURES, FEATURE_COLUMNS
+from incident_intelligence.modeling.artifacts import save_artifact
+
+
+@pytest.fixture(scope="module")
+def incidents() -> pd.DataFrame:
+    return generate_dataset(300, DEFAULT_ROOT_CAUSE_PROBS, load_compiled_class_config(), seed=0)
+
+
+def _save_model(df: pd.DataFrame, path: Path, columns: Optional[List[str]] = None, clf: Any = None) -> Pipeline:
+    columns = columns or FEATURE_COLUMNS
+    pipe = Pipeline(
+        [
+            ("scaler", StandardScaler().set_output(transform="pandas")),
+            ("clf", clf if clf is not None else LogisticRegression(max_iter=1000)),
+        ]
+    )
+    pipe.fit(df[columns], df["root_cause_label"])
+    save_artifact(pipe, path)
+    return pipe
+
+
+def _payload(df: pd.DataFrame) -> List[Dict[str, Any]]:
+    rows = df[FEATURE_COLUMNS].to_dict(orient="records")
+    return [{k: int(v) if k in COUNT_FEATURES else float(v) for k, v in row.items()} for row in rows]
+
+
+def _client(model_path: Path, **kwargs) -> TestClient:
+    cfg = ServeConfig(model_path=str(model_path), reload_interval_s=0, canary_rows=32, **kwargs)
+    return TestClient(create_app(cfg))
+
+
+@pytest.mark.parametrize("batching", [True, False])
+def test_predict_and_batch(incidents: pd.DataFrame, tmp_path: Path, batching: bool) -> None:
+    model_path = tmp_path / "best_model.joblib"
+    pipe = _save_model(incidents, model_path)
+    X = incidents[FEATURE_COLUMNS].head(20)
+    expected = pipe.predict(X)
+    expected_proba = pipe.predict_proba(X)
+
+    with _client(model_path, batching=batching) as client:
+        health = client.get("/health").json()
+        assert health["status"] == "ok"
+        assert health["classes"] == list(pipe.classes_)
+
+        single = client.post("/predict", json=_payload(X.head(1))[0])
+        assert single.status_code == 200
+        assert single.json()["label"] == expected[0]
+
+        batch = client.post("/predict/batch", json={"incidents": _payload(X)})
+        assert batch.status_code == 200
+        body = batch.json()
+        assert body["n"] == 20
+        assert [p["label"] for p in body["predictions"]] == list(expected)
+        proba = np.array([[p["probabilities"][c] for c in pipe.classes_] for p in body["predictions"]])
+        np.testing.assert_allclose(proba, expected_proba, atol=1e-5)
+
+
+def test_rejects_bad_input(incidents: pd.DataFrame, tmp_path: Path) -> None:
+    model_path = tmp_path / "best_model.joblib"
+    _save_model(incidents, model_path)
+    incident = _payload(incidents.head(1))[0]
+
+    with _client(model_path, max_batch_rows=5) as client:
+        assert client.post("/predict", json={**incident, "extra": 1}).status_code == 422
+        assert client.post("/predict", json={**incident, "oom_log_count": -1}).status_code == 422
+        missing = {k: v for k, v in incident.items() if k != "latency"}
+        assert client.post("/predict", json=missing).status_code == 422
+        assert client.post("/predict/batch", json={"incidents": []}).status_code == 422
+        assert client.post("/predict/batch", json={"incidents": [incident] * 6}).status_code == 413
+
+
+def test_model_fit_in_another_column_order(incidents: pd.DataFrame, tmp_path: Path) -> None:
+    model_path = tmp_path / "best_model.joblib"
+    columns = FEATURE_COLUMNS[::-1]
+    pipe = _save_model(incidents, model_path, columns=columns)
+    X = incidents.head(10)
+
+    with _client(model_path) as client:
+        response = client.post("/predict/batch", json={"incidents": _payload(X)})
+
+    assert response.status_code == 200
+    assert [p["label"] for p in response.json()["predictions"]] == list(pipe.predict(X[columns]))
+
+
+def test_startup_fails_on_wrong_features(incidents: pd.DataFrame, tmp_path: Path) -> None:
+    model_path = tmp_path / "best_model.joblib"
+    _save_model(incidents, model_path, columns=FEATURE_COLUMNS[:-1])
+
+    with pytest.raises(ValueError, match="schema features"):
+        with _client(model_path):
+            pass
+
+
+class BrokenProba(LogisticRegression):
+    def predict_proba(self, X):
+        raise RuntimeError("no probabilities")
+
+
+def test_hot_swap_accepts_good_and_rejects_failing_candidates(incidents: pd.DataFrame, tmp_path: Path) -> None:
+    model_path = tmp_path / "best_model.joblib"
+    _save_model(incidents, model_path)
+    incident = _payload(incidents.head(1))[0]
+
+    with _client(model_path) as client:
+        version = client.get("/health").json()["model_version"]
+
+        _save_model(incidents, model_path, clf=BrokenProba(max_iter=1000))
+        rejected = client.post("/reload").json()
+        assert rejected["swapped"] is False
+        assert "no probabilities" in rejected["last_error"]
+        assert rejected["model_version"] == version
+        assert client.post("/predict", json=incident).json()["model_version"] == version
+
+        assert client.post("/reload").json()["swapped"] is False  # the same file is not retried
+
+        _save_model(incidents.iloc[::-1], model_path, clf=LogisticRegression(C=0.5, max_iter=1000))
+        swapped = client.post("/reload").json()
+        assert swapped["swapped"] is True
+        assert swapped["n_swaps"] == 1 and swapped["last_error"] is None
+        assert client.post("/predict", json=incident).json()["model_version"] == swapped["model_version"] != version
+
+
+def test_hot_swap_rejects_changed_classes(incidents: pd.DataFrame, tmp_path: Path) -> None:
+    model_path = tmp_path / "best_model.joblib"
+    _save_model(incidents, model_path)
+
+    with _client(model_path) as client:
+        _save_model(incidents[incidents["root_cause_label"] != "normal"], model_path)
+        response = client.post("/reload").json()
+
+    assert response["swapped"] is False
+    assert "serving classes" in response["last_error"]
@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+import asyncio
+from typing import List
+
+import pytest
+
+from incident_intelligence.api.batching import MicroBatcher
+
+
+def _run(coro):
+    return asyncio.run(coro)
+
+
+def test_results_follow_submission_order() -> None:
+    batches: List[List[int]] = []
+
+    def score(items: List[int]) -> List[int]:
+        batches.append(list(items))
+        return [item * 10 for item in items]
+
+    async def main() -> List[int]:
+        batcher = MicroBatcher(score, max_batch_size=8, max_wait_ms=20)
+        await batcher.start()
+
+        async def call(i: int) -> int:
+            await asyncio.sleep((i * 7 % 5) / 1000)  # arrival order differs from i
+            return await batcher.submit(i)
+
+        try:
+            return await asyncio.gather(*(call(i) for i in range(50)))
+        finally:
+            await batcher.stop()
+
+    results = _run(main())
+
+    assert results == [i * 10 for i in range(50)]
+    assert sorted(i for batch in batches for i in batch) == list(range(50))
+    assert max(len(batch) for batch in batches) <= 8
+    assert any(len(batch) > 1 for batch in batches)
+
+
+def test_idle_requests_are_not_delayed() -> None:
+    sizes: List[int] = []
+
+    def score(items: List[int]) -> List[int]:
+        sizes.append(len(items))
+        return items
+
+    async def main() -> float:
+        batcher = MicroBatcher(score, max_batch_size=8, max_wait_ms=500)
+        await batcher.start()
+        try:
+            loop = asyncio.get_running_loop()
+            start = loop.time()
+            for i in range(3):
+                assert await batcher.submit(i) == i
+            return loop.time() - start
+        finally:
+            await batcher.stop()
+
+    elapsed = _run(main())
+
+    assert sizes == [1, 1, 1]
+    assert elapsed < 0.5  # no max_wait_ms after a batch of one
+
+
+def test_score_error_reaches_every_caller_of_the_batch() -> None:
+    def score(items: List[int]) -> List[int]:
+        raise RuntimeError("model failed")
+
+    async def main() -> list:
+        batcher = MicroBatcher(score, max_batch_size=4, max_wait_ms=20)
+        await batcher.start()
+        try:
+            return await asyncio.gather(*(batcher.submit(i) for i in range(4)), return_exceptions=True)
+        finally:
+            await batcher.stop()
+
+    results = _run(main())
+
+    assert len(results) == 4
+    assert all(isinstance(r, RuntimeError) and str(r) == "model failed" for r in results)
+
+
+def test_metrics_count_batches() -> None:
+    async def main() -> str:
+        batcher = MicroBatcher(lambda items: items, max_batch_size=4, max_wait_ms=20)
+        await batcher.start()
+        try:
+            await asyncio.gather(*(batcher.submit(i) for i in range(10)))
+            return batcher.render_metrics()
+        finally:
+            await batcher.stop()
+
+    text = _run(main())
+
+    assert 'incident_batch_size_bucket{le="+Inf"}' in text
+    assert "incident_queue_wait_seconds_count 10" in text
+
+
+def test_submit_requires_start() -> None:
+    with pytest.raises(RuntimeError, match="start"):
+        _run(MicroBatcher(lambda items: items).submit(1))
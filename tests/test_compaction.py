@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.datasets import make_classification
+from sklearn.ensemble import ExtraTreesClassifier, RandomForestClassifier
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import StandardScaler
+
+from incident_intelligence.data.schema import FEATURE_COLUMNS
+from incident_intelligence.modeling.artifacts import load_artifact, save_artifact
+from incident_intelligence.modeling.compaction import CompactionConfig, compact_artifact, compact_pipeline
+from incident_intelligence.modeling.compiled import check_parity, compile_pipeline
+
+# Compaction that keeps predictions exact: no pruning, float64 leaf values.
+LOSSLESS = CompactionConfig(min_leaf_samples=1, leaf_bits=0)
+
+
+def _data(seed: int = 0) -> tuple[pd.DataFrame, pd.Series]:
+    X, y = make_classification(
+        n_samples=600,
+        n_features=len(FEATURE_COLUMNS),
+        n_informative=5,
+        n_classes=3,
+        random_state=seed,
+    )
+    labels = np.array(["cpu", "disk", "network"])
+    return pd.DataFrame(X * 10 + 50, columns=FEATURE_COLUMNS), pd.Series(labels[y], name="root_cause_label")
+
+
+def _pipeline(clf, scaled: bool) -> Pipeline:
+    steps = [("scaler", StandardScaler().set_output(transform="pandas"))] if scaled else []
+    return Pipeline([*steps, ("clf", clf)])
+
+
+@pytest.mark.parametrize("scaled", [False, True], ids=["raw", "scaler"])
+@pytest.mark.parametrize("clf", [RandomForestClassifier, ExtraTreesClassifier])
+def test_lossless_compaction_keeps_predict_proba(clf, scaled: bool) -> None:
+    X, y = _data()
+    pipe = _pipeline(clf(n_estimators=20, random_state=0), scaled).fit(X, y)
+
+    for cfg in (LOSSLESS, CompactionConfig(min_leaf_samples=1, leaf_bits=0, float32_thresholds=False)):
+        parity = check_parity(compact_pipeline(pipe, cfg), pipe, X)
+        assert parity["ok"], (cfg, parity)
+
+
+def test_float32_thresholds_do_not_move_splits_on_scaled_input() -> None:
+    X, y = _data(seed=3)
+    pipe = _pipeline(RandomForestClassifier(n_estimators=20, random_state=0), scaled=True).fit(X, y)
+    compiled, compacted = compile_pipeline(pipe), compact_pipeline(pipe, LOSSLESS)
+
+    # Rows sitting exactly on folded split thresholds (unscaled units), where
+    # rounding a threshold down would send them to the other child.
+    scaler, forest = pipe.named_steps["scaler"], pipe.named_steps["clf"]
+    edge = X.iloc[:1].to_numpy().repeat(200, axis=0)
+    rng = np.random.default_rng(0)
+    for row in edge:
+        tree = forest.estimators_[rng.integers(len(forest.estimators_))].tree_
+        node = rng.choice(np.flatnonzero(tree.children_left != -1))
+        f = tree.feature[node]
+        row[f] = tree.threshold[node] * scaler.scale_[f] + scaler.mean_[f]
+    edge = pd.DataFrame(edge, columns=FEATURE_COLUMNS)
+
+    np.testing.assert_allclose(compacted.predict_proba(edge), compiled.predict_proba(edge), atol=1e-9)
+
+
+def test_compaction_with_nans() -> None:
+    X, y = _data(seed=1)
+    X = X.mask(np.random.default_rng(0).random(X.shape) < 0.1)
+    pipe = _pipeline(RandomForestClassifier(n_estimators=20, random_state=0), scaled=False).fit(X, y)
+
+    assert check_parity(compact_pipeline(pipe, LOSSLESS), pipe, X)["ok"]
+
+
+def test_quantized_leaves_stay_close() -> None:
+    X, y = _data()
+    pipe = _pipeline(RandomForestClassifier(n_estimators=20, random_state=0), scaled=False).fit(X, y)
+
+    compacted = compact_pipeline(pipe, CompactionConfig(min_leaf_samples=1, leaf_bits=16))
+    parity = check_parity(compacted, pipe, X, atol=1e-3)
+    assert parity["max_abs_diff"] <= 1e-3, parity
+
+
+def test_compact_artifact_tolerance_gate(tmp_path) -> None:
+    X, y = _data(seed=2)
+    X_val, y_val = X.iloc[400:], y.iloc[400:]
+    pipe = _pipeline(RandomForestClassifier(n_estimators=20, random_state=0), scaled=False).fit(X.iloc[:400], y.iloc[:400])
+    model_path = save_artifact(pipe, tmp_path / "rf_pipeline.joblib")
+
+    out = tmp_path / "rf.compact.joblib"
+    report = compact_artifact(model_path, X_val, y_val, LOSSLESS, out_path=out, repeats=1)
+    assert report["accepted"]
+    assert report["val"]["accuracy_drop"] == 0.0
+    assert out.exists()
+    np.testing.assert_allclose(load_artifact(out).predict_proba(X_val), pipe.predict_proba(X_val), atol=1e-9)
+
+    # Every split pruned away: each tree is a single prior leaf, far outside tolerance.
+    rejected_out = tmp_path / "rejected.compact.joblib"
+    report = compact_artifact(
+        model_path, X_val, y_val, CompactionConfig(min_leaf_samples=10**6), out_path=rejected_out, repeats=1
+    )
+    assert not report["accepted"]
+    assert report["val"]["accuracy_drop"] > CompactionConfig().max_accuracy_drop
+    assert not rejected_out.exists()
+    assert "out" not in report
@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.datasets import make_classification
+from sklearn.ensemble import ExtraTreesClassifier, GradientBoostingClassifier, RandomForestClassifier
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import StandardScaler
+
+from incident_intelligence.data.schema import FEATURE_COLUMNS
+from incident_intelligence.modeling.compiled import check_parity, compile_pipeline
+
+
+def _data(n_classes: int = 3, seed: int = 0) -> tuple[pd.DataFrame, pd.Series]:
+    X, y = make_classification(
+        n_samples=400,
+        n_features=len(FEATURE_COLUMNS),
+        n_informative=5,
+        n_classes=n_classes,
+        random_state=seed,
+    )
+    labels = np.array(["cpu", "disk", "network", "memory"])[:n_classes]
+    return pd.DataFrame(X * 10 + 50, columns=FEATURE_COLUMNS), pd.Series(labels[y], name="root_cause_label")
+
+
+def _pipeline(clf, scaled: bool) -> Pipeline:
+    steps = [("scaler", StandardScaler().set_output(transform="pandas"))] if scaled else []
+    return Pipeline([*steps, ("clf", clf)])
+
+
+CLASSIFIERS = {
+    "rf": lambda: RandomForestClassifier(n_estimators=25, random_state=0),
+    "rf_shallow": lambda: RandomForestClassifier(n_estimators=25, max_depth=4, random_state=0),
+    "extra_trees": lambda: ExtraTreesClassifier(n_estimators=25, random_state=0),
+    "gb": lambda: GradientBoostingClassifier(n_estimators=20, max_depth=3, random_state=0),
+}
+
+
+@pytest.mark.parametrize("scaled", [False, True], ids=["raw", "scaler"])
+@pytest.mark.parametrize("name", list(CLASSIFIERS))
+def test_compiled_matches_predict_proba(name: str, scaled: bool) -> None:
+    X, y = _data()
+    pipe = _pipeline(CLASSIFIERS[name](), scaled).fit(X, y)
+
+    compiled = compile_pipeline(pipe)
+    parity = check_parity(compiled, pipe, X)
+
+    assert parity["ok"], parity
+    assert (compiled.predict(X) == pipe.predict(X)).all()
+
+
+@pytest.mark.parametrize("n_classes", [2, 3])
+def test_compiled_gb_binary_and_multiclass(n_classes: int) -> None:
+    X, y = _data(n_classes=n_classes, seed=1)
+    pipe = _pipeline(CLASSIFIERS["gb"](), scaled=False).fit(X, y)
+
+    assert check_parity(compile_pipeline(pipe), pipe, X)["ok"]
+
+
+@pytest.mark.parametrize("scaled", [False, True], ids=["raw", "scaler"])
+def test_compiled_rf_routes_missing_values(scaled: bool) -> None:
+    X, y = _data(seed=2)
+    rng = np.random.default_rng(0)
+    X = X.mask(rng.random(X.shape) < 0.1)
+    pipe = _pipeline(CLASSIFIERS["rf"](), scaled).fit(X, y)
+
+    X_check = X.copy()
+    X_check.iloc[:20] = np.nan  # rows with no values at all
+    parity = check_parity(compile_pipeline(pipe), pipe, X_check)
+
+    assert parity["ok"], parity
+
+
+def test_compiled_single_row_and_column_order() -> None:
+    X, y = _data()
+    pipe = _pipeline(CLASSIFIERS["rf"](), scaled=True).fit(X, y)
+    compiled = compile_pipeline(pipe)
+
+    row = X.iloc[[7], ::-1]  # same features, reversed column order
+    np.testing.assert_allclose(compiled.predict_proba(row), pipe.predict_proba(X.iloc[[7]]), atol=1e-9)
+
+
+def test_compile_rejects_unsupported_pipeline() -> None:
+    from sklearn.linear_model import LogisticRegression
+
+    X, y = _data()
+    pipe = _pipeline(LogisticRegression(max_iter=500), scaled=True).fit(X, y)
+
+    with pytest.raises(ValueError, match="Cannot compile"):
+        compile_pipeline(pipe)
@@ -0,0 +1,145 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.datasets import make_classification
+from sklearn.linear_model import LogisticRegression
+from sklearn.metrics import classification_report, confusion_matrix, roc_auc_score
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import StandardScaler
+
+from incident_intelligence.data.columnar import write_columnar
+from incident_intelligence.data.loader import load_dataset
+from incident_intelligence.data.schema import FEATURE_COLUMNS
+from incident_intelligence.modeling.artifacts import save_artifact
+from incident_intelligence.modeling.evaluate import (
+    EvalConfig,
+    StreamingMetrics,
+    evaluate_models,
+    evaluate_models_streaming,
+)
+
+LABELS = np.array(["cpu", "disk", "memory", "network"], dtype=object)
+
+
+class BrokenProba(LogisticRegression):
+    def predict_proba(self, X):
+        raise RuntimeError("no probabilities")
+
+
+def _scores(n: int, n_classes: int, seed: int = 0) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Labels, noisy predicted labels and predict_proba-like scores that are informative but imperfect."""
+    rng = np.random.default_rng(seed)
+    t = rng.integers(0, n_classes, size=n)
+    logits = rng.normal(size=(n, n_classes)) + 1.5 * np.eye(n_classes)[t]
+    proba = np.exp(logits) / np.exp(logits).sum(axis=1, keepdims=True)
+    labels = LABELS[:n_classes]
+    return labels[t], labels[proba.argmax(axis=1)], proba
+
+
+def _assert_report_equal(report: dict, expected: dict) -> None:
+    assert list(report) == list(expected)
+    for key, value in expected.items():
+        assert report[key] == pytest.approx(value), key
+
+
+def _stream(y_true, y_pred, proba, classes, n_chunks: int = 7) -> StreamingMetrics:
+    acc = StreamingMetrics(classes)
+    for idx in np.array_split(np.arange(len(y_true)), n_chunks):
+        acc.update(y_true[idx], y_pred[idx], proba[idx])
+    return acc
+
+
+@pytest.mark.parametrize("n_classes", [2, 4])
+def test_streaming_metrics_match_sklearn(n_classes: int) -> None:
+    y_true, y_pred, proba = _scores(5000, n_classes)
+    classes = LABELS[:n_classes]
+
+    result = _stream(y_true, y_pred, proba, classes).result()
+
+    expected = classification_report(y_true, y_pred, output_dict=True, zero_division=0)
+    _assert_report_equal(result["classification_report"], expected)
+    assert result["confusion_matrix"] == confusion_matrix(y_true, y_pred).tolist()
+    if n_classes == 2:
+        assert result["roc_auc"] == pytest.approx(roc_auc_score(y_true, proba[:, 1]), abs=1e-3)
+    else:
+        auc = roc_auc_score(y_true, proba, multi_class="ovr", average="macro")
+        assert result["roc_auc_ovr_macro"] == pytest.approx(auc, abs=1e-3)
+
+
+def test_streaming_report_skips_absent_classes() -> None:
+    y_true, y_pred, proba = _scores(600, 3, seed=1)
+    keep = (y_true != "memory") & (y_pred != "memory")
+    y_true, y_pred, proba = y_true[keep], y_pred[keep], proba[keep]
+
+    result = _stream(y_true, y_pred, proba, LABELS[:3]).result()
+
+    expected = classification_report(y_true, y_pred, output_dict=True, zero_division=0)
+    _assert_report_equal(result["classification_report"], expected)
+    assert "memory" not in result["classification_report"]
+
+
+def _eval_frame() -> pd.DataFrame:
+    X, y = make_classification(
+        n_samples=900, n_features=len(FEATURE_COLUMNS), n_informative=5, n_classes=3, random_state=0
+    )
+    df = pd.DataFrame(X, columns=FEATURE_COLUMNS)
+    df["root_cause_label"] = LABELS[y]
+    return df
+
+
+def _save(clf, df: pd.DataFrame, path: Path) -> Path:
+    pipe = Pipeline([("scaler", StandardScaler()), ("clf", clf)])
+    pipe.fit(df[FEATURE_COLUMNS], df["root_cause_label"])
+    return save_artifact(pipe, path)
+
+
+@pytest.fixture()
+def saved_model(tmp_path: Path) -> tuple[Path, Path]:
+    df = _eval_frame()
+    model_path = _save(LogisticRegression(max_iter=500), df, tmp_path / "models" / "logreg.joblib")
+    return model_path, write_columnar(df, tmp_path / "eval.cols", downcast=False)
+
+
+def test_streaming_evaluation_matches_in_memory(saved_model, tmp_path: Path, monkeypatch) -> None:
+    model_path, data_path = saved_model
+    cfg = EvalConfig(metrics_out=str(tmp_path / "eval.json"), summary_csv_out=None, prediction_cache_dir=None)
+    in_memory = evaluate_models([model_path], load_dataset(data_path), cfg)["models"][0]["metrics"]
+
+    def no_predict(self, X):
+        raise AssertionError("labels should come from predict_proba")
+
+    # one model pass per chunk: labels are derived from predict_proba
+    monkeypatch.setattr(Pipeline, "predict", no_predict)
+    streamed_cfg = EvalConfig(metrics_out=str(tmp_path / "stream.json"), summary_csv_out=None, chunk_rows=128)
+    streamed = evaluate_models_streaming([model_path], data_path, streamed_cfg)["models"][0]["metrics"]
+
+    assert streamed["n_rows"] == 900
+    _assert_report_equal(streamed["classification_report"], in_memory["classification_report"])
+    assert streamed["roc_auc_ovr_macro"] == pytest.approx(in_memory["roc_auc_ovr_macro"], abs=1e-3)
+
+
+@pytest.mark.parametrize("chunk_rows", [None, 128], ids=["in_memory", "streaming"])
+def test_predict_proba_failure_is_recorded(saved_model, tmp_path: Path, chunk_rows) -> None:
+    model_path, data_path = saved_model
+    broken_path = _save(BrokenProba(max_iter=500), _eval_frame(), tmp_path / "models" / "broken.joblib")
+    cfg = EvalConfig(
+        metrics_out=str(tmp_path / "eval.json"),
+        summary_csv_out=None,
+        prediction_cache_dir=None,
+        chunk_rows=chunk_rows,
+    )
+
+    if chunk_rows:
+        results = evaluate_models_streaming([broken_path, model_path], data_path, cfg)
+    else:
+        results = evaluate_models([broken_path, model_path], load_dataset(data_path), cfg)
+    broken, ok = (m["metrics"] for m in results["models"])
+
+    assert broken["roc_auc_error"] == "no probabilities"
+    assert "roc_auc_ovr_macro" not in broken
+    assert broken["accuracy"] == pytest.approx(ok["accuracy"])  # labels from predict()
+    assert "roc_auc_ovr_macro" in ok and "roc_auc_error" not in ok
@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from incident_intelligence.data.generator import (
+    DEFAULT_ROOT_CAUSE_PROBS,
+    SplitAssigner,
+    generate_dataset,
+    iter_shards,
+)
+from incident_intelligence.data.mixtures import load_compiled_class_config
+
+
+@pytest.fixture(scope="module")
+def class_config():
+    return load_compiled_class_config()
+
+
+def test_shards_identical_for_any_worker_count(class_config) -> None:
+    kwargs = dict(seed=7, shard_rows=250)
+    serial = list(iter_shards(1000, DEFAULT_ROOT_CAUSE_PROBS, class_config, workers=1, **kwargs))
+    parallel = list(iter_shards(1000, DEFAULT_ROOT_CAUSE_PROBS, class_config, workers=3, **kwargs))
+
+    assert len(serial) == len(parallel) == 4
+    for a, b in zip(serial, parallel):
+        pd.testing.assert_frame_equal(a, b)
+
+
+def test_generate_dataset_independent_of_workers(class_config) -> None:
+    serial = generate_dataset(900, DEFAULT_ROOT_CAUSE_PROBS, class_config, seed=3, shard_rows=200)
+    parallel = generate_dataset(900, DEFAULT_ROOT_CAUSE_PROBS, class_config, seed=3, shard_rows=200, workers=2)
+
+    assert len(serial) == 900
+    pd.testing.assert_frame_equal(serial, parallel)
+
+
+def test_generate_dataset_zero_rows_keeps_schema(class_config) -> None:
+    df = generate_dataset(0, DEFAULT_ROOT_CAUSE_PROBS, class_config)
+    legacy = generate_dataset(0, DEFAULT_ROOT_CAUSE_PROBS, class_config, engine="legacy")
+
+    assert df.shape == (0, 10)
+    pd.testing.assert_frame_equal(df, legacy)
+
+
+def _labels(n: int, seed: int = 0) -> np.ndarray:
+    return np.random.default_rng(seed).choice(np.array(["a", "b", "c"], dtype=object), size=n, p=[0.5, 0.3, 0.2])
+
+
+def test_split_assigner_tracks_fractions_per_class() -> None:
+    labels = _labels(6000)
+    codes = SplitAssigner(0.7, 0.15, seed=1).assign(labels)
+
+    for label in ("a", "b", "c"):
+        counts = np.bincount(codes[labels == label], minlength=3)
+        assert np.abs(counts / counts.sum() - [0.7, 0.15, 0.15]).max() < 0.005
+
+
+def test_split_assigner_is_stable_across_chunking_and_runs() -> None:
+    labels = _labels(3000, seed=2)
+    whole = SplitAssigner(0.7, 0.15, seed=5).assign(labels)
+
+    streamed = SplitAssigner(0.7, 0.15, seed=5)
+    chunked = np.concatenate([streamed.assign(part) for part in np.array_split(labels, 7)])
+
+    np.testing.assert_array_equal(whole, chunked)
+    np.testing.assert_array_equal(whole, SplitAssigner(0.7, 0.15, seed=5).assign(labels))
+    assert not np.array_equal(whole, SplitAssigner(0.7, 0.15, seed=6).assign(labels))
+
+
+def test_split_assigner_assigns_missing_labels() -> None:
+    labels = _labels(2000, seed=3)
+    labels[::4] = None
+    labels[1::8] = np.nan
+    codes = SplitAssigner(0.7, 0.15, seed=1).assign(labels)
+
+    assert set(np.unique(codes)) == {0, 1, 2}
+    missing = pd.isna(labels)
+    counts = np.bincount(codes[missing], minlength=3)
+    assert np.abs(counts / counts.sum() - [0.7, 0.15, 0.15]).max() < 0.01
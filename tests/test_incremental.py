@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from incident_intelligence import settings
+from incident_intelligence.data import mixtures
+from incident_intelligence.data.generator import DEFAULT_ROOT_CAUSE_PROBS, generate_dataset
+from incident_intelligence.data.mixtures import CompiledClassConfig, load_compiled_class_config
+from incident_intelligence.modeling.artifacts import load_artifact
+from incident_intelligence.modeling.incremental import IncrementalConfig, default_classes, update_model
+
+
+def _cfg(tmp_path: Path, **kwargs) -> IncrementalConfig:
+    return IncrementalConfig(
+        model_out=str(tmp_path / "incremental.joblib"),
+        checkpoint_dir=str(tmp_path / "checkpoints"),
+        **kwargs,
+    )
+
+
+def test_default_classes_come_from_compiled_config(monkeypatch) -> None:
+    compiled = CompiledClassConfig(mixtures={"network": {}, "cpu": {}, "disk": {}})
+
+    def no_raw_config(*args, **kwargs):
+        raise AssertionError("class_config.json should be read through load_compiled_class_config")
+
+    monkeypatch.setattr(mixtures, "load_compiled_class_config", lambda *args, **kwargs: compiled)
+    monkeypatch.setattr(settings, "load_class_config", no_raw_config)
+
+    assert default_classes() == ["cpu", "disk", "network"]
+
+
+@pytest.mark.parametrize("model", ["sgd", "nb"])
+def test_partial_fit_classes_cover_compiled_config(tmp_path: Path, model: str) -> None:
+    config = load_compiled_class_config()
+    df = generate_dataset(400, DEFAULT_ROOT_CAUSE_PROBS, config, seed=0)
+    first = df[df["root_cause_label"].isin(["normal", "memory_leak"])]
+    cfg = _cfg(tmp_path, model=model)
+
+    state = update_model([first.iloc[:100], first.iloc[100:]], cfg)
+    update_model([df], cfg)
+
+    expected = sorted(config.mixtures)
+    assert state["classes"] == expected
+    clf = load_artifact(cfg.model_out).named_steps["clf"]
+    np.testing.assert_array_equal(clf.classes_, expected)
+
+
+def test_unknown_label_is_rejected(tmp_path: Path) -> None:
+    df = generate_dataset(50, DEFAULT_ROOT_CAUSE_PROBS, load_compiled_class_config(), seed=0)
+    df.loc[0, "root_cause_label"] = "solar_flare"
+
+    with pytest.raises(ValueError, match="solar_flare"):
+        update_model([df], _cfg(tmp_path))
@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from incident_intelligence.data.columnar import read_columnar, write_columnar
+from incident_intelligence.data.generator import DEFAULT_ROOT_CAUSE_PROBS, generate_dataset
+from incident_intelligence.data.loader import CACHE_DIRNAME, iter_chunks, load_dataset
+from incident_intelligence.data.mixtures import load_compiled_class_config
+
+
+@pytest.fixture(scope="module")
+def frame() -> pd.DataFrame:
+    df = generate_dataset(300, DEFAULT_ROOT_CAUSE_PROBS, load_compiled_class_config(), seed=1)
+    df["service"] = np.array(["api", "db", "cache"], dtype=object)[np.arange(len(df)) % 3]
+    df.loc[::7, "root_cause_label"] = None
+    df.loc[3::11, "service"] = None
+    return df
+
+
+def _csv(df: pd.DataFrame, tmp_path: Path) -> Path:
+    path = tmp_path / "incidents.csv"
+    df.to_csv(path, index=False)
+    return path
+
+
+def test_cached_load_equals_read_csv(frame: pd.DataFrame, tmp_path: Path) -> None:
+    path = _csv(frame, tmp_path)
+    expected = pd.read_csv(path)
+
+    first = load_dataset(path)  # parses and writes the sidecar
+    assert any((tmp_path / CACHE_DIRNAME).glob("*.cols"))
+    second = load_dataset(path)  # memory-mapped from the sidecar
+
+    for df in (first, second, load_dataset(path, cache=False)):
+        pd.testing.assert_frame_equal(df, expected)
+    assert second["root_cause_label"].isna().sum() == frame["root_cause_label"].isna().sum()
+
+
+def test_cached_load_prunes_columns(frame: pd.DataFrame, tmp_path: Path) -> None:
+    path = _csv(frame, tmp_path)
+    load_dataset(path)
+
+    df = load_dataset(path, label_col="root_cause_label")
+
+    pd.testing.assert_frame_equal(df, pd.read_csv(path)[list(df.columns)])
+    assert "service" not in df.columns
+
+
+def test_columnar_round_trip_keeps_missing_strings(frame: pd.DataFrame, tmp_path: Path) -> None:
+    path = write_columnar(frame, tmp_path / "incidents.cols", downcast=False)
+
+    restored = read_columnar(path, restore_dtypes=True)
+    categorical = read_columnar(path)
+
+    pd.testing.assert_frame_equal(restored, frame)
+    assert isinstance(categorical["service"].dtype, pd.CategoricalDtype)
+    assert categorical["service"].isna().equals(frame["service"].isna())
+    assert categorical["root_cause_label"].isna().equals(frame["root_cause_label"].isna())
+
+
+def test_iter_chunks_columnar_matches_full_read(frame: pd.DataFrame, tmp_path: Path) -> None:
+    path = write_columnar(frame, tmp_path / "incidents.cols", downcast=False)
+
+    chunks = list(iter_chunks(path, 64, label_col="root_cause_label"))
+
+    assert [len(c) for c in chunks] == [64, 64, 64, 64, 44]
+    assert all(c["root_cause_label"].dtype == frame["root_cause_label"].dtype for c in chunks)
+    expected = frame.drop(columns="service")
+    pd.testing.assert_frame_equal(pd.concat(chunks), expected)
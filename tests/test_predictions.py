@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.datasets import make_classification
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.pipeline import Pipeline
+
+from incident_intelligence.data.schema import FEATURE_COLUMNS
+from incident_intelligence.modeling.artifacts import load_artifact, save_artifact
+from incident_intelligence.modeling.predictions import PredictionStore, predict_once
+
+
+@pytest.fixture()
+def saved(tmp_path: Path) -> tuple[Path, pd.DataFrame]:
+    X, y = make_classification(
+        n_samples=300, n_features=len(FEATURE_COLUMNS), n_informative=5, n_classes=3, random_state=0
+    )
+    X = pd.DataFrame(X, columns=FEATURE_COLUMNS)
+    labels = np.array(["cpu", "disk", "network"], dtype=object)[y]
+    pipe = Pipeline([("clf", RandomForestClassifier(n_estimators=10, random_state=0))]).fit(X, labels)
+    return save_artifact(pipe, tmp_path / "rf.joblib"), X
+
+
+def test_store_hit_returns_identical_predictions(saved, tmp_path: Path) -> None:
+    model_path, X = saved
+    store = PredictionStore(tmp_path / "predictions")
+    loads = []
+
+    def loader(path: Path):
+        loads.append(path)
+        return load_artifact(path)
+
+    first = store.predict_file(model_path, X, loader)
+    second = store.predict_file(model_path, X, loader)
+
+    assert len(loads) == 1  # the hit never loads or runs the model
+    assert isinstance(second.proba, np.memmap)
+    np.testing.assert_array_equal(second.classes, first.classes)
+    np.testing.assert_array_equal(second.codes, first.codes)
+    np.testing.assert_array_equal(second.proba, first.proba)
+    np.testing.assert_array_equal(second.labels, load_artifact(model_path).predict(X))
+
+
+def test_store_misses_on_other_data_or_model(saved, tmp_path: Path) -> None:
+    model_path, X = saved
+    store = PredictionStore(tmp_path / "predictions")
+    store.predict_file(model_path, X, load_artifact)
+
+    other = X.iloc[:100]
+    preds = store.predict_file(model_path, other, load_artifact)
+    assert len(preds) == 100
+
+    refit = Pipeline([("clf", RandomForestClassifier(n_estimators=10, random_state=1))])
+    refit.fit(X, load_artifact(model_path).predict(X))
+    save_artifact(refit, model_path)
+    preds = store.predict_file(model_path, X, load_artifact)
+    np.testing.assert_array_equal(preds.proba, predict_once(refit, X).proba)
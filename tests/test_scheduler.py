@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+from typing import Any, Dict, List
+
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.ensemble import GradientBoostingClassifier, HistGradientBoostingClassifier, RandomForestClassifier
+from sklearn.linear_model import LogisticRegression
+from sklearn.model_selection import GridSearchCV
+
+from incident_intelligence.data.generator import DEFAULT_ROOT_CAUSE_PROBS, generate_dataset
+from incident_intelligence.data.mixtures import load_compiled_class_config
+from incident_intelligence.modeling.baseline import BaselineTrainConfig, make_pipeline
+from incident_intelligence.modeling.scheduler import path_groups, run_search
+
+
+@pytest.fixture(scope="module")
+def data() -> tuple[pd.DataFrame, pd.Series]:
+    df = generate_dataset(300, DEFAULT_ROOT_CAUSE_PROBS, load_compiled_class_config(), seed=0)
+    return df.drop(columns="root_cause_label"), df["root_cause_label"]
+
+
+def _families(*names: str) -> List[Dict[str, Any]]:
+    registry = {
+        "logreg": (LogisticRegression(max_iter=1000), {"clf__C": [0.01, 0.1, 1, 10]}),
+        "rf": (
+            RandomForestClassifier(random_state=0),
+            {"clf__n_estimators": [5, 10], "clf__max_depth": [None, 4]},
+        ),
+        "gb": (
+            GradientBoostingClassifier(random_state=0),
+            {"clf__n_estimators": [5, 10], "clf__learning_rate": [0.1, 0.3]},
+        ),
+        "hgb": (
+            HistGradientBoostingClassifier(early_stopping=False, random_state=0),
+            {"clf__max_iter": [5, 10], "clf__learning_rate": [0.1]},
+        ),
+    }
+    return [
+        {"name": name, "pipeline": make_pipeline(registry[name][0]), "param_grid": registry[name][1]}
+        for name in names
+    ]
+
+
+@pytest.fixture(scope="module")
+def grids(data) -> Dict[str, GridSearchCV]:
+    X, y = data
+    families = _families("logreg", "rf", "gb", "hgb")
+    return {f["name"]: GridSearchCV(f["pipeline"], f["param_grid"], cv=5, n_jobs=1).fit(X, y) for f in families}
+
+
+def _assert_matches_grid_search(result, grid: GridSearchCV, X: pd.DataFrame) -> None:
+    assert result.best_params_ == grid.best_params_
+    assert result.best_score_ == pytest.approx(grid.best_score_, abs=1e-12)
+    assert result.cv_results_["params"] == grid.cv_results_["params"]
+    for key in ("mean_test_score", "rank_test_score", *(f"split{k}_test_score" for k in range(5))):
+        np.testing.assert_allclose(result.cv_results_[key], grid.cv_results_[key], atol=1e-12, err_msg=key)
+    np.testing.assert_array_equal(result.predict(X), grid.predict(X))
+
+
+@pytest.mark.parametrize("n_jobs", [1, 2])
+def test_shared_scheduler_matches_grid_search(data, grids, n_jobs: int) -> None:
+    X, y = data
+    families = _families("logreg", "rf", "gb")
+    cfg = BaselineTrainConfig(n_jobs=n_jobs, verbose=0, warm_start_paths=False)
+
+    results = run_search(families, X, y, cfg)
+
+    assert list(results) == ["logreg", "rf", "gb"]
+    for family in families:
+        _assert_matches_grid_search(results[family["name"]], grids[family["name"]], X)
+
+
+def test_exact_warm_start_paths_match_grid_search(data, grids) -> None:
+    X, y = data
+    families = _families("rf", "gb", "hgb")
+    cfg = BaselineTrainConfig(n_jobs=1, verbose=0, warm_start_paths=True)
+
+    results = run_search(families, X, y, cfg)
+
+    for family in families:
+        _assert_matches_grid_search(results[family["name"]], grids[family["name"]], X)
+
+
+def test_logreg_path_is_opt_in(data) -> None:
+    family = _families("logreg")[0]
+    pipe = family["pipeline"]
+    candidates = [{"clf__C": c} for c in family["param_grid"]["clf__C"]]
+    alive = list(range(len(candidates)))
+
+    assert path_groups(pipe, candidates, alive) == [((i,), None) for i in alive]
+    assert path_groups(pipe, candidates, alive, approximate=True) == [((0, 1, 2, 3), "warm_start")]
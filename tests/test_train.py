@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any, Dict, List
+
+import pytest
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.linear_model import LogisticRegression
+
+from incident_intelligence.data.generator import DEFAULT_ROOT_CAUSE_PROBS, generate_dataset
+from incident_intelligence.data.mixtures import load_compiled_class_config
+from incident_intelligence.modeling import train
+from incident_intelligence.modeling.baseline import BaselineTrainConfig
+from incident_intelligence.modeling.train import TrainValidateConfig, resume_training, run_training
+
+
+def _small_models(random_state: int = 42, families=("logreg", "rf")) -> List[Dict[str, Any]]:
+    registry = {
+        "logreg": {
+            "name": "Logistic Regression",
+            "estimator": LogisticRegression(max_iter=1000),
+            "param_grid": {"clf__C": [0.1, 1]},
+        },
+        "rf": {
+            "name": "Random Forest",
+            "estimator": RandomForestClassifier(random_state=random_state),
+            "param_grid": {"clf__n_estimators": [5, 10]},
+        },
+    }
+    return [registry[key] for key in families]
+
+
+@pytest.fixture()
+def data_paths(tmp_path: Path, monkeypatch) -> tuple[Path, Path]:
+    monkeypatch.setattr(train, "get_models_to_run", _small_models)
+    config = load_compiled_class_config()
+    paths = []
+    for name, seed in (("train", 0), ("val", 1)):
+        path = tmp_path / "data" / f"{name}.csv"
+        path.parent.mkdir(exist_ok=True)
+        generate_dataset(240, DEFAULT_ROOT_CAUSE_PROBS, config, seed=seed).to_csv(path, index=False)
+        paths.append(path)
+    return paths[0], paths[1]
+
+
+def _cfg(tmp_path: Path, out: str, **kwargs) -> TrainValidateConfig:
+    return TrainValidateConfig(
+        models_out_dir=str(tmp_path / out / "models"),
+        metrics_out_json=str(tmp_path / out / "metrics.json"),
+        leaderboard_out_csv=str(tmp_path / out / "leaderboard.csv"),
+        best_model_out=str(tmp_path / out / "models" / "best_model.joblib"),
+        **kwargs,
+    )
+
+
+def _summary(payload: Dict[str, Any]) -> List[tuple]:
+    return [(r["model_name"], r["best_params"], r["cv_best_score"], r["val_metrics"]) for r in payload["all_models"]]
+
+
+@pytest.mark.parametrize("scheduler", ["shared", "sequential"])
+def test_second_run_hits_training_cache(data_paths, tmp_path: Path, monkeypatch, capsys, scheduler: str) -> None:
+    train_path, val_path = data_paths
+    base_cfg = BaselineTrainConfig(n_jobs=1, verbose=0, scheduler=scheduler, families=("logreg", "rf"))
+    cache_dir = str(tmp_path / "cache")
+
+    first = run_training(train_path, val_path, cfg=_cfg(tmp_path, "first", cache_dir=cache_dir), base_cfg=base_cfg)
+    capsys.readouterr()
+
+    def no_search(*args, **kwargs):
+        raise AssertionError("cached families must not be searched again")
+
+    monkeypatch.setattr(train, "run_search", no_search)
+    monkeypatch.setattr(train, "fit_grid", no_search)
+    second = run_training(train_path, val_path, cfg=_cfg(tmp_path, "second", cache_dir=cache_dir), base_cfg=base_cfg)
+
+    assert capsys.readouterr().out.count("cache/journal hit") == 2
+    assert _summary(second) == _summary(first)
+    assert Path(second["best_model"]["model_path"]).exists()
+
+
+def test_resume_skips_finished_families(data_paths, tmp_path: Path, monkeypatch) -> None:
+    train_path, val_path = data_paths
+    base_cfg = BaselineTrainConfig(n_jobs=1, verbose=0, scheduler="sequential", families=("logreg", "rf"))
+    run_dir = tmp_path / "runs" / "run-1"
+    cfg = _cfg(tmp_path, "out", cache_dir=None, run_dir=str(run_dir))
+    fit_grid = train.fit_grid
+    fitted: List[str] = []
+
+    def interrupted(*args, model_name: str, **kwargs):
+        if model_name == "Random Forest":
+            raise KeyboardInterrupt
+        fitted.append(model_name)
+        return fit_grid(*args, model_name=model_name, **kwargs)
+
+    monkeypatch.setattr(train, "fit_grid", interrupted)
+    with pytest.raises(KeyboardInterrupt):
+        run_training(train_path, val_path, cfg=cfg, base_cfg=base_cfg)
+    assert fitted == ["Logistic Regression"]
+
+    def recording(*args, model_name: str, **kwargs):
+        fitted.append(model_name)
+        return fit_grid(*args, model_name=model_name, **kwargs)
+
+    monkeypatch.setattr(train, "fit_grid", recording)
+    resumed = resume_training(run_dir)
+
+    assert fitted == ["Logistic Regression", "Random Forest"]
+    uninterrupted = run_training(train_path, val_path, cfg=_cfg(tmp_path, "fresh", cache_dir=None), base_cfg=base_cfg)
+    assert _summary(resumed) == _summary(uninterrupted)